@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark: per-object Meme.get_fitness ranking vs the vectorized fitness kernel.
+
+``MemePool.fitness_vector`` still gathers attributes from Meme objects, so the
+``array pool`` column shows the same kernel over ArrayMemePool's columns.
+
+Usage:
+    python benchmarks/bench_fitness.py [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+
+
+def build_pool(size: int, seed: int = 0) -> MemePool:
+    """Create a pool of ``size`` memes with random fitness and stance."""
+    rng = random.Random(seed)
+    stances = list(MemeStance)
+    pool = MemePool()
+    pool.memes = [
+        Meme(
+            id=f"meme_{i}",
+            content="The world is a simulation",
+            mutation_rate=0.1,
+            initial_fitness=rng.random(),
+            stance=rng.choice(stances)
+        )
+        for i in range(size)
+    ]
+    return pool
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest of ``repeat`` timed calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'memes':>10} {'per-object (s)':>15} {'vectorized (s)':>15} {'speedup':>8} "
+          f"{'array pool (s)':>15} {'speedup':>8}")
+    for size in args.sizes:
+        pool = build_pool(size)
+        array_pool = ArrayMemePool.from_memes(pool.memes)
+
+        def per_object():
+            sorted(pool.memes, key=lambda m: m.get_fitness(), reverse=True)
+
+        def vectorized():
+            np.argsort(-pool.fitness_vector(), kind="stable")
+
+        def columnar():
+            np.argsort(-array_pool.fitness_vector(), kind="stable")
+
+        slow = best_of(args.repeat, per_object)
+        fast = best_of(args.repeat, vectorized)
+        fastest = best_of(args.repeat, columnar)
+        print(f"{size:>10} {slow:>15.4f} {fast:>15.4f} {slow / fast:>7.1f}x "
+              f"{fastest:>15.4f} {slow / fastest:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmarks for meme_complex.MemeComplex merging and co-evolution strength."""
+
+import random
+
+import pytest
+
+from meme_complex import Meme, MemeComplex
+
+
+def make_complex(name: str, size: int, edges_per_node: int = 0, seed: int = 0) -> MemeComplex:
+    """Build a complex of ``size`` memes with random directed edges between them."""
+    rng = random.Random(seed)
+    complex_ = MemeComplex(name, seed=seed)
+    for i in range(size):
+        complex_.add_meme(Meme(id=f"{name}_{i}", content=f"{name} meme {i}", fitness=rng.uniform(0.1, 2.0)))
+    nodes = list(complex_.network.nodes)
+    for node in nodes:
+        for target in rng.sample(nodes, min(edges_per_node, size)):
+            if target != node:
+                complex_.network.add_edge(node, target, weight=1.0)
+    return complex_
+
+
+@pytest.mark.parametrize("size", [25, 50, 100])
+def test_merge(benchmark, size):
+    first = make_complex("a", size, seed=1)
+    second = make_complex("b", size, seed=2)
+    benchmark(first.merge, second)
+
+
+def uncached(complex_: MemeComplex, **kwargs):
+    """Return a callable that clears the per-graph cache so every round recomputes."""
+    def run():
+        complex_._centrality_cache = None
+        return complex_.coevolution_strength(**kwargs)
+    return run
+
+
+@pytest.mark.parametrize("size", [50, 200, 800])
+def test_coevolution_strength(benchmark, size):
+    complex_ = make_complex("c", size, edges_per_node=3)
+    benchmark(uncached(complex_))
+
+
+@pytest.mark.parametrize("size", [50, 200, 800])
+def test_coevolution_strength_cached(benchmark, size):
+    complex_ = make_complex("c", size, edges_per_node=3)
+    complex_.coevolution_strength()
+    benchmark(complex_.coevolution_strength)
+
+
+@pytest.mark.parametrize("size", [1_000, 10_000])
+def test_merge_similarity(benchmark, size):
+    first = make_complex("a", size, seed=1)
+    second = make_complex("b", size, seed=2)
+    benchmark(first.merge, second, similarity=0.001)
+
+
+@pytest.mark.parametrize("size", [800, 5_000])
+def test_coevolution_strength_sampled(benchmark, size):
+    complex_ = make_complex("c", size, edges_per_node=3)
+    benchmark(uncached(complex_, epsilon=0.05, seed=0))
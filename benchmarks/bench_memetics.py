@@ -0,0 +1,55 @@
+"""Benchmarks for memetics.MemePool, ArrayMemePool and memetics.StanceAnalyzer."""
+
+import pytest
+
+from conftest import make_memes
+from memetics import MemePool, MemeStance, StanceAnalyzer
+from array_pool import ArrayMemePool
+
+
+@pytest.mark.parametrize("size", [1_000, 10_000, 50_000])
+def test_meme_pool_evolve(benchmark, size):
+    memes = make_memes(size)
+
+    def setup():
+        pool = MemePool(seed=0)
+        for meme in memes:
+            pool.add_meme(meme)
+        return (pool,), {}
+
+    benchmark.pedantic(lambda pool: pool.evolve(), setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize("size", [10_000, 100_000, 1_000_000])
+def test_array_pool_evolve(benchmark, size):
+    batch = ArrayMemePool.from_memes(make_memes(min(size, 10_000))).to_batch()
+
+    def setup():
+        pool = ArrayMemePool(seed=0)
+        for _ in range(size // len(batch["labels"])):
+            pool.extend(batch)
+        return (pool,), {}
+
+    benchmark.pedantic(lambda pool: pool.evolve(), setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize("records", [10_000, 100_000])
+def test_stance_analyzer_add_stance(benchmark, records):
+    stances = list(MemeStance)
+    events = [(f"meme_{i % 1_000}", stances[i % len(stances)]) for i in range(records)]
+
+    def record():
+        analyzer = StanceAnalyzer()
+        for meme_id, stance in events:
+            analyzer.add_stance(meme_id, stance)
+        return analyzer
+
+    benchmark(record)
+
+
+def test_stance_analyzer_overall_trend(benchmark):
+    stances = list(MemeStance)
+    analyzer = StanceAnalyzer()
+    for i in range(100_000):
+        analyzer.add_stance(f"meme_{i % 1_000}", stances[i % len(stances)])
+    benchmark(analyzer.get_overall_stance_trend)
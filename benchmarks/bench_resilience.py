@@ -0,0 +1,52 @@
+"""Benchmarks for the SEP estimator and the public feedback API."""
+
+import numpy as np
+import pytest
+
+import api.public_feedback_api as feedback
+from hardware_resilience_monitor import SEPAnalyzer
+
+
+@pytest.mark.parametrize("points", [100, 10_000])
+def test_sep_estimate_sweep(benchmark, points):
+    side = int(np.sqrt(points))
+    grid = [(float(pv), float(aging))
+            for pv in np.linspace(0.0, 0.3, side)
+            for aging in np.linspace(1.0, 2.0, side)]
+    analyzer = SEPAnalyzer()
+
+    def sweep():
+        for pv, aging in grid:
+            analyzer.set_conditions(pv, aging)
+            analyzer.estimate_probability()
+
+    benchmark(sweep)
+
+
+def test_feedback_submit(benchmark):
+    def setup():
+        feedback.FEEDBACK_DATABASE.clear()
+        return (feedback.FeedbackAPI(),), {}
+
+    def submit(api):
+        for i in range(1_000):
+            api.submit_feedback(feedback.ACCEPTED_TYPES[i % len(feedback.ACCEPTED_TYPES)], f"Feedback {i}")
+
+    benchmark.pedantic(submit, setup=setup, rounds=20)
+    feedback.FEEDBACK_DATABASE.clear()
+
+
+@pytest.mark.parametrize("records", [1_000, 10_000])
+def test_feedback_query(benchmark, records):
+    feedback.FEEDBACK_DATABASE.clear()
+    api = feedback.FeedbackAPI()
+    for i in range(records):
+        api.submit_feedback(feedback.ACCEPTED_TYPES[i % len(feedback.ACCEPTED_TYPES)], f"Feedback {i}")
+
+    def query():
+        api.get_feedback_by_type("concern")
+        api.update_feedback_status(f"fb_{records}", "reviewed")
+        api.get_stats()
+
+    benchmark(query)
+    feedback.FEEDBACK_DATABASE.clear()
@@ -0,0 +1,25 @@
+"""Benchmarks for the keyword stance classifier in src/memetics/cybersemiotic.py."""
+
+from cybersemiotic import StanceAnalyzer
+
+
+def test_analyze_throughput(benchmark, corpus):
+    analyzer = StanceAnalyzer()
+
+    def classify():
+        for text in corpus:
+            analyzer.analyze(text)
+
+    benchmark(classify)
+    benchmark.extra_info["texts"] = len(corpus)
+
+
+def test_analyze_many_throughput(benchmark, corpus):
+    analyzer = StanceAnalyzer()
+
+    def classify():
+        for _ in analyzer.analyze_many(corpus):
+            pass
+
+    benchmark(classify)
+    benchmark.extra_info["texts"] = len(corpus)
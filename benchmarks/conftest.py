@@ -0,0 +1,52 @@
+"""Shared fixtures and import paths for the benchmark suite."""
+
+import glob
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "src"), os.path.join(ROOT, "src", "memetics")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import pytest
+
+from memetics import Meme, MemeStance
+
+
+def make_memes(count: int, seed: int = 0):
+    """Return ``count`` memes with random fitness, stance and mutation rate."""
+    rng = random.Random(seed)
+    stances = list(MemeStance)
+    return [
+        Meme(
+            id=f"meme_{i}",
+            content="The world is a simulation",
+            mutation_rate=rng.random() * 0.2,
+            initial_fitness=rng.random(),
+            stance=rng.choice(stances)
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Skip the regression check on the first run, when there is no saved baseline yet."""
+    storage = config.getoption("benchmark_storage", None)
+    if config.getoption("benchmark_compare", None) is not True or not storage.startswith("file://"):
+        return
+    saved = glob.glob(os.path.join(storage[len("file://"):], "*", "*.json"))
+    if not saved:
+        config.option.benchmark_compare = []
+        config.option.benchmark_compare_fail = None
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Short texts mixing positive, negative and neutral stance keywords."""
+    rng = random.Random(0)
+    words = ("AI", "will", "benefit", "harm", "help", "the", "world", "is", "a", "threat",
+             "simulation", "good", "bad", "support", "danger", "maybe", "today", "people")
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(5, 30))) for _ in range(5_000)]
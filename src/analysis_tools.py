@@ -1,56 +1,172 @@
+import heapq
+import logging
+import math
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from typing import IO, Callable, List, Dict, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
 import networkx as nx
 from meme_complex import MemeComplex
 
+logger = logging.getLogger(__name__)
+
+# Columns of MemeComplex.report()
+REPORT_COLUMNS = ["name", "memes_count", "coevolution_strength", "stability_score", "generation", "avg_fitness"]
+
+# Reports by complex, valid while _report_key is unchanged
+_REPORT_CACHE: 'WeakKeyDictionary[MemeComplex, Tuple[Tuple, Dict]]' = WeakKeyDictionary()
+
+# Batches of at most this many stale complexes are reported in-process, since
+# starting a process pool costs more than the reports
+INLINE_REPORTS = 2
+
 # Set style for plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
 
-def plot_meme_complex_network(meme_complex: MemeComplex, title: str = "Meme Complex Network"):
-    """Visualize the meme complex as a directed graph."""
-    fig, ax = plt.subplots(figsize=(12, 8))
+def _spring_layout(network: nx.DiGraph) -> Dict:
+    return nx.spring_layout(network, k=2, iterations=50)
+
+
+# Layout functions by name. 'spring' is O(V^2) per iteration; 'spectral' uses a
+# sparse eigensolver above a few hundred nodes and scales to large graphs.
+LAYOUTS: Dict[str, Callable[[nx.DiGraph], Dict]] = {
+    "spring": _spring_layout,
+    "spectral": nx.spectral_layout,
+    "circular": nx.circular_layout,
+}
+
+# Node positions by complex, valid while MemeComplex.version is unchanged
+_LAYOUT_CACHE: 'WeakKeyDictionary[MemeComplex, Dict[Tuple, Dict]]' = WeakKeyDictionary()
+
+
+def _level_of_detail(network: nx.DiGraph, max_nodes: Optional[int]) -> nx.DiGraph:
+    """Return the subgraph induced by the ``max_nodes`` highest-degree nodes (ties by insertion order)."""
+    if max_nodes is None or network.number_of_nodes() <= max_nodes:
+        return network
+    logger.warning("Level of detail: keeping the %d highest-degree of %d nodes (max_nodes=%d)",
+                   max_nodes, network.number_of_nodes(), max_nodes)
+    degree = dict(network.degree())
+    keep = heapq.nlargest(max_nodes, network, key=degree.__getitem__)
+    return network.subgraph(keep)
+
+
+def network_layout(meme_complex: MemeComplex, layout: str = "spring", max_nodes: Optional[int] = None,
+                   network: Optional[nx.DiGraph] = None) -> Dict:
+    """Compute node positions for a meme complex, cached until the complex changes.
+
+    Args:
+        meme_complex (MemeComplex): Complex to lay out
+        layout (str): Name in ``LAYOUTS``
+        max_nodes (int, optional): Lay out only the highest-degree nodes
+        network (nx.DiGraph, optional): Graph to lay out if already exported;
+            must be ``meme_complex.to_networkx()`` reduced to ``max_nodes``
+
+    Returns:
+        Dict: Node ID to position
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {sorted(LAYOUTS)}")
+    version = meme_complex.version
+    key = (version, layout, max_nodes)
+    cached = _LAYOUT_CACHE.get(meme_complex)
+    if version is not None and cached is not None and key in cached:
+        return cached[key]
+    if network is None:
+        network = _level_of_detail(meme_complex.to_networkx(), max_nodes)
+    pos = LAYOUTS[layout](network) if network.number_of_nodes() else {}
+    if version is not None:
+        # Positions for older versions are stale; keep only this one
+        _LAYOUT_CACHE[meme_complex] = {key: pos}
+    return pos
+
+
+def plot_meme_complex_network(meme_complex: MemeComplex, title: str = "Meme Complex Network",
+                              output: Optional[Union[str, IO]] = None, format: Optional[str] = None,
+                              layout: str = "spring", pos: Optional[Dict] = None,
+                              max_nodes: Optional[int] = None, label_limit: int = 200, dpi: int = 100):
+    """Visualize the meme complex as a directed graph.
+
+    Without ``output`` the figure is shown with pyplot. With ``output`` it is
+    drawn on a standalone Agg canvas, without pyplot or a display, and saved,
+    so it can run in batch jobs. With ``max_nodes`` set, larger graphs are
+    reduced to their ``max_nodes`` highest-degree nodes and a warning is
+    logged. Labels and arrowheads are dropped above ``label_limit`` nodes so
+    edges are drawn as one line collection.
+
+    Args:
+        meme_complex (MemeComplex): Complex to draw
+        title (str): Figure title
+        output (str or file-like, optional): Path or binary buffer to save to
+        format (str, optional): Image format such as 'png' or 'svg'
+            (default: inferred from the path, else PNG)
+        layout (str): Name in ``LAYOUTS``, used when ``pos`` is not given
+        pos (Dict, optional): Precomputed node positions
+        max_nodes (int, optional): Level-of-detail node limit, e.g. 2000 for
+            very large graphs (default: None, draws every node)
+        label_limit (int): Largest drawn graph that gets labels and arrowheads
+        dpi (int): Resolution of raster output
 
-    pos = nx.spring_layout(meme_complex.network, k=2, iterations=50)
+    Returns:
+        matplotlib.figure.Figure: The figure
+    """
+    network = _level_of_detail(meme_complex.to_networkx(), max_nodes)
+    if pos is None:
+        pos = network_layout(meme_complex, layout, max_nodes, network)
+    detailed = network.number_of_nodes() <= label_limit
+
+    if output is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = Figure(figsize=(12, 8), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
 
     # Draw nodes with fitness-based coloring
-    node_colors = [d['fitness'] for n, d in meme_complex.network.nodes(data=True)]
+    node_colors = [d.get('fitness', 0.0) for n, d in network.nodes(data=True)]
     nodes = nx.draw_networkx_nodes(
-        meme_complex.network,
+        network,
         pos,
         node_color=node_colors,
         cmap="RdYlBu_r",
-        node_size=800,
+        node_size=800 if detailed else 20,
         alpha=0.8,
         ax=ax
     )
 
-    # Draw edges with weight-based thickness
-    edge_weights = [d['weight'] for u, v, d in meme_complex.network.edges(data=True)]
-    edges = nx.draw_networkx_edges(
-        meme_complex.network,
+    # Draw edges with weight-based thickness (unweighted edges count as 1.0)
+    edge_weights = [d.get('weight', 1.0) for u, v, d in network.edges(data=True)]
+    edge_style = dict(width=edge_weights, arrows=True, arrowsize=15) if detailed else dict(width=0.5, arrows=False)
+    nx.draw_networkx_edges(
+        network,
         pos,
-        width=edge_weights,
         alpha=0.6,
         edge_color="gray",
-        arrows=True,
-        arrowsize=15,
-        ax=ax
+        ax=ax,
+        **edge_style
     )
 
     # Add labels
-    nx.draw_networkx_labels(meme_complex.network, pos, font_size=8, font_weight="bold", ax=ax)
+    if detailed:
+        nx.draw_networkx_labels(network, pos, font_size=8, font_weight="bold", ax=ax)
 
     # Colorbar
-    plt.colorbar(nodes, label="Fitness")
+    if network.number_of_nodes():
+        fig.colorbar(nodes, ax=ax, label="Fitness")
 
-    plt.title(title, fontsize=16, fontweight="bold")
-    plt.axis("off")
-    plt.tight_layout()
-    plt.show()
+    ax.set_title(title, fontsize=16, fontweight="bold")
+    ax.axis("off")
+    fig.tight_layout()
+    if output is None:
+        plt.show()
+    else:
+        fig.savefig(output, format=format, dpi=dpi)
+    return fig
 
 
 def analyze_coevolution_strength(meme_complexes: List[MemeComplex]) -> Dict[str, float]:
@@ -62,14 +178,71 @@ def analyze_coevolution_strength(meme_complexes: List[MemeComplex]) -> Dict[str,
     return results
 
 
-def generate_coevolution_report(meme_complexes: List[MemeComplex]) -> pd.DataFrame:
-    """Generate a structured report on multiple meme complexes."""
-    data = []
+def _report(meme_complex: MemeComplex) -> Dict:
+    return meme_complex.report()
+
+
+def run_reports(meme_complexes: List[MemeComplex], max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Compute ``report()`` for many meme complexes, in parallel and memoized.
+
+    A report is reused as long as the complex's ``version`` and the cheap
+    inputs of its report (see ``_report_key``) are unchanged, so only new or
+    modified complexes are recomputed, including those whose memes or
+    fitness were changed directly. Those are pickled to a process pool when
+    there are more than ``INLINE_REPORTS`` of them and ``max_workers`` is
+    not 1.
+
+    Args:
+        meme_complexes (List[MemeComplex]): Complexes to report on
+        max_workers (int, optional): Worker processes (default: one per CPU)
+
+    Returns:
+        pd.DataFrame: One row per complex, in input order
+    """
+    reports: List[Optional[Dict]] = []
+    stale: Dict[int, MemeComplex] = {}
+    keys: Dict[int, Optional[Tuple]] = {}
     for mc in meme_complexes:
-        report = mc.report()
-        data.append(report)
+        key = keys[id(mc)] = _report_key(mc)
+        cached = _REPORT_CACHE.get(mc)
+        if key is not None and cached is not None and cached[0] == key:
+            reports.append(cached[1])
+        else:
+            stale.setdefault(id(mc), mc)
+            reports.append(None)
+
+    pending = list(stale.values())
+    if len(pending) > INLINE_REPORTS and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            computed = list(executor.map(_report, pending))
+    else:
+        computed = [mc.report() for mc in pending]
+    fresh = {id(mc): report for mc, report in zip(pending, computed)}
+    for mc, report in zip(pending, computed):
+        if keys[id(mc)] is not None:
+            _REPORT_CACHE[mc] = (keys[id(mc)], report)
+
+    rows = [report if report is not None else fresh[id(mc)] for mc, report in zip(meme_complexes, reports)]
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def _report_key(mc: MemeComplex) -> Optional[Tuple]:
+    """Cache key for ``mc.report()``, or None if changes cannot be detected.
+
+    ``version`` covers the network; the rest are the inputs of the cheap
+    report fields, which callers may change without bumping the version
+    (e.g. ``meme.fitness``, ``mc.memes`` or ``mc.fitness_history``).
+    """
+    version = mc.version
+    if version is None:
+        return None
+    fitness = math.fsum(m.fitness for m in mc.memes)
+    return (version, mc.name, mc.generation, len(mc.memes), fitness, mc.get_stability_score())
+
 
-    return pd.DataFrame(data).sort_values(by="coevolution_strength", ascending=False)
+def generate_coevolution_report(meme_complexes: List[MemeComplex], max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Generate a structured report on multiple meme complexes (see ``run_reports``)."""
+    return run_reports(meme_complexes, max_workers).sort_values(by="coevolution_strength", ascending=False)
 
 
 def plot_fitness_evolution(meme_complex: MemeComplex, title: str = "Meme Complex Fitness Over Generations"):
@@ -0,0 +1,439 @@
+'''
+array_pool.py: A struct-of-arrays meme population for very large simulations
+
+ArrayMemePool mirrors the selection / replication / mutation cycle of
+memetics.MemePool, but keeps every meme attribute in parallel NumPy arrays
+instead of a list of Meme dataclasses. Ranking uses argpartition and offspring
+are produced with vectorized, masked array operations, so one generation over
+a million memes costs a handful of array passes rather than millions of
+Python method calls.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime
+import logging
+import time
+
+import numpy as np
+
+from memetics import Meme, STANCES, STANCE_CODES, default_mutations, fitness_kernel
+from seeding import SeedLike, make_rng
+from content_store import ContentStore
+from mutation_ops import MutationBatch, MutationPipeline
+from lineage import KIND_COPY, KIND_MUTATED, Lineage
+from telemetry import GenerationEvent, GenerationTelemetry
+from profiling import NULL_PROBE, Profiler
+
+logger = logging.getLogger(__name__)
+
+# Per-meme array attributes, in storage order
+COLUMNS = ("ids", "initial_fitness", "mutation_rate", "stance_codes", "versions", "content_index", "created_at")
+
+
+class ArrayMemePool:
+    """A population of memes stored as parallel NumPy arrays.
+
+    Row ``i`` of every array describes one meme. Meme contents are stored once
+    in ``contents`` and referenced by ``content_index``. IDs are integers from
+    the pool's ``lineage`` table, which renders the legacy string IDs on demand.
+
+    Args:
+        seed (SeedLike, optional): Seed or numpy Generator for reproducible evolution
+        id_base (int): First ID allocated by the pool's lineage table
+        mutations (MutationPipeline, optional): Operators applied to offspring
+            selected for mutation (default: ``default_mutations()``)
+
+    Attributes:
+        ids (np.ndarray): Integer meme IDs (int64)
+        initial_fitness (np.ndarray): Base fitness scores (float64)
+        mutation_rate (np.ndarray): Per-meme mutation probabilities (float64)
+        stance_codes (np.ndarray): Index into ``STANCES`` (int8)
+        versions (np.ndarray): Version numbers (int32)
+        content_index (np.ndarray): Index into ``contents`` (int32)
+        created_at (np.ndarray): Creation timestamps (datetime64[us])
+        contents (ContentStore): Distinct content strings
+        lineage (Lineage): Parent pointers for every ID ever allocated
+        generation (int): Number of generations evolved so far
+        telemetry (GenerationTelemetry): Per-generation summary logging
+        profiler (Profiler or None): Set to a Profiler to time evolve phases;
+            profilers are not pickled
+    """
+
+    def __init__(self, seed: SeedLike = None, id_base: int = 0, mutations: Optional[MutationPipeline] = None):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.initial_fitness = np.empty(0, dtype=np.float64)
+        self.mutation_rate = np.empty(0, dtype=np.float64)
+        self.stance_codes = np.empty(0, dtype=np.int8)
+        self.versions = np.empty(0, dtype=np.int32)
+        self.content_index = np.empty(0, dtype=np.int32)
+        self.created_at = np.empty(0, dtype="datetime64[us]")
+        self.contents = ContentStore()
+        self.lineage = Lineage(id_base)
+        self.generation: int = 0
+        self.rng = make_rng(seed)
+        self.mutations = mutations if mutations is not None else default_mutations()
+        self.telemetry = GenerationTelemetry(logger)
+        self.profiler: Optional[Profiler] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickle compact columns; lookup tables are rebuilt on load
+        columns, contents = self._columns(slice(None))
+        return {"columns": columns, "contents": contents, "lineage": self.lineage,
+                "generation": self.generation, "rng": self.rng, "mutations": self.mutations,
+                "telemetry": self.telemetry}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(seed=state["rng"], mutations=state["mutations"])
+        self.lineage = state["lineage"]
+        self.telemetry = state["telemetry"]
+        self._append(state["columns"], state["contents"])
+        self.generation = state["generation"]
+
+    def fork(self) -> 'ArrayMemePool':
+        """Return a copy of the pool whose lineage is a fork of this pool's.
+
+        The fork pickles without the lineage history, only the depth and root
+        of the live IDs, so it is cheap to evolve in another process. Pass the
+        evolved fork to ``join`` to adopt its memes and merge the IDs it
+        allocated. The fork shares this pool's arrays and generator until it
+        is pickled.
+
+        Returns:
+            ArrayMemePool: The forked pool
+        """
+        fork = object.__new__(ArrayMemePool)
+        fork.__dict__.update(self.__dict__)
+        fork.lineage = self.lineage.fork(self.ids)
+        fork.profiler = None
+        return fork
+
+    def join(self, fork: 'ArrayMemePool') -> None:
+        """Replace this pool's memes with those of an evolved fork.
+
+        Args:
+            fork (ArrayMemePool): Pool returned by ``fork``, possibly after a round trip through pickle
+        """
+        lineage, profiler = self.lineage, self.profiler
+        lineage.merge(fork.lineage)
+        self.__dict__.update(fork.__dict__)
+        self.lineage, self.profiler = lineage, profiler
+
+    # ------------------------------------------------------------------
+    # Construction and conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_memes(cls, memes: Iterable[Meme], seed: SeedLike = None,
+                   mutations: Optional[MutationPipeline] = None) -> 'ArrayMemePool':
+        """Build a pool from Meme instances.
+
+        Args:
+            memes (Iterable[Meme]): Memes to load
+            seed (SeedLike, optional): Seed or Generator for evolution
+            mutations (MutationPipeline, optional): Mutation operators
+
+        Returns:
+            ArrayMemePool: The populated pool
+        """
+        pool = cls(seed=seed, mutations=mutations)
+        pool.add_memes(memes)
+        return pool
+
+    @classmethod
+    def from_dicts(cls, data: Iterable[Dict[str, Any]], seed: SeedLike = None) -> 'ArrayMemePool':
+        """Build a pool from dictionaries in the ``Meme.to_dict`` format.
+
+        Args:
+            data (Iterable[Dict]): Serialized memes
+            seed (SeedLike, optional): Seed or Generator for evolution
+
+        Returns:
+            ArrayMemePool: The populated pool
+        """
+        return cls.from_memes((Meme.from_dict(d) for d in data), seed=seed)
+
+    def add_memes(self, memes: Iterable[Meme]) -> None:
+        """Append memes to the pool as lineage roots.
+
+        Args:
+            memes (Iterable[Meme]): Memes to append
+        """
+        ids, fitness, rates, stances, versions, contents, created = [], [], [], [], [], [], []
+        for meme in memes:
+            ids.append(self.lineage.add_root(str(meme.id)))
+            fitness.append(meme.initial_fitness)
+            rates.append(meme.mutation_rate)
+            stances.append(STANCE_CODES[meme.stance])
+            versions.append(meme.version)
+            contents.append(self.contents.intern(meme.content))
+            created.append(meme.created_at)
+        if not ids:
+            return
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        self.initial_fitness = np.concatenate([self.initial_fitness, np.asarray(fitness, dtype=np.float64)])
+        self.mutation_rate = np.concatenate([self.mutation_rate, np.asarray(rates, dtype=np.float64)])
+        self.stance_codes = np.concatenate([self.stance_codes, np.asarray(stances, dtype=np.int8)])
+        self.versions = np.concatenate([self.versions, np.asarray(versions, dtype=np.int32)])
+        self.content_index = np.concatenate([self.content_index, np.asarray(contents, dtype=np.int32)])
+        self.created_at = np.concatenate([self.created_at, np.asarray(created, dtype="datetime64[us]")])
+
+    def add_meme(self, meme: Meme) -> None:
+        """Append a single meme to the pool.
+
+        Args:
+            meme (Meme): The meme to add
+        """
+        self.add_memes([meme])
+
+    def to_batch(self, rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Export memes as a compact batch of arrays.
+
+        The batch only carries the content strings that the selected rows
+        reference, plus each meme's ID in this pool (``origins``) and the label
+        of its root (``labels``), so it pickles to roughly the size of the
+        arrays themselves. Use it to ship memes between pools and processes.
+
+        Args:
+            rows (np.ndarray, optional): Rows to export (default: all)
+
+        Returns:
+            Dict: One array per name in ``COLUMNS`` (except ``ids``) plus
+            ``contents``, ``origins`` and ``labels``
+        """
+        selection = slice(None) if rows is None else rows
+        batch, batch["contents"] = self._columns(selection)
+        batch["origins"] = batch.pop("ids")
+        batch["labels"] = [self.lineage.root_label(int(uid)) for uid in batch["origins"]]
+        return batch
+
+    def extend(self, batch: Dict[str, Any]) -> None:
+        """Append memes exported with ``to_batch``.
+
+        They become lineage roots that record their ID in the source pool
+        (see ``Lineage.add_migrant``), so their rendered IDs do not grow with
+        each migration. Pools exchanging memes should use disjoint ``id_base``
+        ranges so that source IDs identify the source pool.
+
+        Args:
+            batch (Dict): Batch produced by ``to_batch``
+        """
+        columns = {name: batch[name] for name in COLUMNS if name != "ids"}
+        columns["ids"] = np.array([self.lineage.add_migrant(label, int(origin))
+                                   for label, origin in zip(batch["labels"], batch["origins"])], dtype=np.int64)
+        self._append(columns, batch["contents"])
+
+    @classmethod
+    def from_batch(cls, batch: Dict[str, Any], seed: SeedLike = None, id_base: int = 0) -> 'ArrayMemePool':
+        """Build a pool from a batch produced by ``to_batch``.
+
+        Args:
+            batch (Dict): Batch of memes
+            seed (SeedLike, optional): Seed or Generator for evolution
+            id_base (int): First ID allocated by the new pool
+
+        Returns:
+            ArrayMemePool: The populated pool
+        """
+        pool = cls(seed=seed, id_base=id_base)
+        pool.extend(batch)
+        return pool
+
+    def _columns(self, selection: Any) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Slice every column, renumbering content indices to the contents used."""
+        columns = {name: getattr(self, name)[selection] for name in COLUMNS}
+        used, local = np.unique(columns["content_index"], return_inverse=True)
+        columns["content_index"] = local.astype(np.int32)
+        return columns, [self.contents[i] for i in used]
+
+    def _append(self, columns: Dict[str, np.ndarray], contents: List[str]) -> None:
+        """Append columns whose content indices refer to ``contents``."""
+        mapping = np.array([self.contents.intern(content) for content in contents], dtype=np.int32)
+        for name in COLUMNS:
+            values = columns[name]
+            if name == "content_index" and len(values):
+                values = mapping[values]
+            setattr(self, name, np.concatenate([getattr(self, name), values.astype(getattr(self, name).dtype)]))
+
+    def meme_id(self, row: int) -> str:
+        """Return the string ID of the meme stored at ``row``.
+
+        Args:
+            row (int): Row index in the pool arrays
+
+        Returns:
+            str: The legacy-style ID, e.g. ``meme_001-copy-17``
+        """
+        return self.lineage.render(int(self.ids[row]))
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield every meme in the ``Meme.to_dict`` format.
+
+        Yields:
+            Dict: Serialized meme
+        """
+        created = self.created_at.astype(datetime)
+        for row in range(len(self.ids)):
+            yield {
+                "id": self.meme_id(row),
+                "content": self.contents[self.content_index[row]],
+                "mutation_rate": float(self.mutation_rate[row]),
+                "initial_fitness": float(self.initial_fitness[row]),
+                "stance": STANCES[self.stance_codes[row]].value,
+                "version": int(self.versions[row]),
+                "created_at": created[row].isoformat()
+            }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Serialize the pool in the ``Meme.to_dict`` format.
+
+        Returns:
+            List[Dict]: Serialized memes
+        """
+        return list(self.iter_dicts())
+
+    def to_memes(self) -> List[Meme]:
+        """Materialize the pool as Meme instances.
+
+        Returns:
+            List[Meme]: One Meme per row
+        """
+        return [Meme.from_dict(d) for d in self.iter_dicts()]
+
+    # ------------------------------------------------------------------
+    # Evolution
+    # ------------------------------------------------------------------
+
+    def fitness_vector(self, engagement: Any = 1.0) -> np.ndarray:
+        """Compute the fitness of every meme in one pass.
+
+        Args:
+            engagement (float or np.ndarray): Scalar or per-meme engagement factor
+
+        Returns:
+            np.ndarray: Fitness scores (0.0 to 1.0), same order as the pool arrays
+        """
+        return fitness_kernel(self.initial_fitness, self.stance_codes, engagement)
+
+    def evolve(self, selection_pressure: float = 0.5) -> None:
+        """Simulate one generation of evolution.
+
+        Follows the same rules as ``MemePool.evolve``: the fittest
+        ``int(len(pool) * selection_pressure)`` memes survive and each survivor
+        produces two replicated offspring, which may then mutate.
+
+        Args:
+            selection_pressure (float): Proportion of memes to retain (0.0 to 1.0)
+        """
+        start = time.perf_counter()
+        self.generation += 1
+        population = len(self.ids)
+        probe = NULL_PROBE if self.profiler is None else self.profiler.begin(self.generation, population)
+        survivors = self._select(int(population * selection_pressure))
+        probe.mark("rank")
+
+        parents = np.repeat(survivors, 2)
+        rows = np.concatenate([survivors, parents])
+        keep = len(survivors)
+        offspring = len(parents)
+
+        self.ids = self.ids[rows]
+        self.ids[keep:] = self.lineage.allocate_many(self.ids[keep:], KIND_COPY)
+        self.initial_fitness = self.initial_fitness[rows]
+        self.mutation_rate = self.mutation_rate[rows]
+        self.stance_codes = self.stance_codes[rows]
+        self.versions = self.versions[rows]
+        self.content_index = self.content_index[rows]
+        self.created_at = self.created_at[rows]
+        probe.mark("replicate")
+
+        counts: Dict[str, int] = {}
+        mutated = self._mutate(np.arange(keep, keep + offspring), counts)
+        if self.contents.needs_compaction(len(self.ids)):
+            self.content_index = self.contents.compact(self.content_index)[self.content_index].astype(np.int32)
+        probe.mark("mutate")
+        probe.finish(keep, offspring, mutated)
+        self.telemetry.emit(GenerationEvent(
+            generation=self.generation, population=population, survivors=keep,
+            offspring=offspring, mutated=mutated, mutations=counts, duration=time.perf_counter() - start
+        ))
+
+    def top_rows(self, count: int) -> np.ndarray:
+        """Return the rows of the ``count`` fittest memes, fittest first.
+
+        Args:
+            count (int): Number of rows to return
+
+        Returns:
+            np.ndarray: Row indices
+        """
+        return self._select(min(count, len(self.ids)))
+
+    def get_top_index(self) -> Optional[int]:
+        """Return the row of the most fit meme.
+
+        Returns:
+            int or None: Row index, or None if the pool is empty
+        """
+        if len(self.ids) == 0:
+            return None
+        return int(np.argmax(self.fitness_vector()))
+
+    def _select(self, keep_count: int) -> np.ndarray:
+        """Return the rows of the ``keep_count`` fittest memes, fittest first.
+
+        Ties keep their original order, matching the stable sort used by
+        ``MemePool.evolve``.
+        """
+        size = len(self.ids)
+        if keep_count <= 0:
+            return np.empty(0, dtype=np.intp)
+        fitness = self.fitness_vector()
+        if keep_count < size:
+            # Include every meme tied with the cut-off so ties resolve by position
+            cutoff = fitness[np.argpartition(fitness, size - keep_count)[size - keep_count]]
+            candidates = np.flatnonzero(fitness >= cutoff)
+        else:
+            candidates = np.arange(size)
+        order = np.lexsort((candidates, -fitness[candidates]))
+        return candidates[order][:keep_count]
+
+    def _mutate(self, rows: np.ndarray, counts: Dict[str, int]) -> int:
+        """Run the mutation pipeline over the memes in ``rows`` that roll a mutation.
+
+        Returns the number of memes that changed; ``counts`` collects per-operator totals.
+        """
+        if len(rows) == 0:
+            return 0
+        hit = rows[self.rng.random(len(rows)) < self.mutation_rate[rows]]
+        if len(hit) == 0:
+            return 0
+        batch = MutationBatch(
+            content=self.content_index[hit].astype(np.int64),
+            stance_codes=self.stance_codes[hit],
+            initial_fitness=self.initial_fitness[hit],
+            n_stances=len(STANCES)
+        )
+        changed = self.mutations.apply(batch, self.rng, self.contents, counts)
+        self.content_index[hit] = batch.content
+        self.stance_codes[hit] = batch.stance_codes
+        self.initial_fitness[hit] = batch.initial_fitness
+        hit = hit[changed]
+        self.versions[hit] += 1
+        self.ids[hit] = self.lineage.allocate_many(self.ids[hit], KIND_MUTATED)
+        for row in hit[self.telemetry.debug_sample(len(hit))].tolist():
+            logger.debug("Meme %s mutated to %r", self.lineage.render(int(self.ids[row])),
+                         self.contents[int(self.content_index[row])])
+        return len(hit)
+
+    def content_stats(self) -> Dict[str, float]:
+        """Report how many memes share each distinct content string.
+
+        Returns:
+            Dict[str, float]: See ``ContentStore.dedup_stats``
+        """
+        return self.contents.dedup_stats(self.content_index)
@@ -0,0 +1,202 @@
+'''
+content_store.py: Interned meme content with memoized rewrites
+
+Most offspring in a meme pool carry exactly the same text as their parent, and
+mutations keep producing the same few variants. The ContentStore keeps each
+distinct content string once and hands out integer handles. Tokenizations and
+mutation variants are memoized per handle, so a mutation only splits and
+joins a string the first time that particular variant appears, and only
+creates a new entry when the text actually changes.
+
+Contents that no meme uses any more are not dropped on their own: pools call
+``compact`` with the handles still in use once the store has grown well past
+their population, and renumber their handles with the mapping it returns.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+# Stores smaller than this are never compacted
+COMPACT_MIN_SIZE = 4096
+
+
+class ContentStore:
+    """Deduplicated storage for meme content strings.
+
+    Handles are indices into ``texts`` and stay valid until ``compact``.
+    Derived data (tokenizations, mutation variants) is memoized per handle
+    and dropped when the store is pickled.
+
+    Args:
+        memo_size (int): Most recently used entries kept by ``cached``
+    """
+
+    def __init__(self, memo_size: int = 65536):
+        if memo_size < 1:
+            raise ValueError("memo_size must be at least 1")
+        self.texts: List[str] = []
+        self.memo_size = memo_size
+        self._lookup: Dict[str, int] = {}
+        self._words: Dict[int, Tuple[str, ...]] = {}
+        self._memo: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"texts": self.texts, "memo_size": self.memo_size}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state.get("memo_size", 65536))
+        for text in state["texts"]:
+            self.intern(text)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, handle: int) -> str:
+        return self.texts[handle]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.texts)
+
+    def intern(self, text: str) -> int:
+        """Return the handle of ``text``, storing it if it is new.
+
+        Args:
+            text (str): Content string
+
+        Returns:
+            int: Handle of the stored string
+        """
+        handle = self._lookup.get(text)
+        if handle is None:
+            handle = len(self.texts)
+            self.texts.append(text)
+            self._lookup[text] = handle
+        return handle
+
+    def canonical(self, text: str) -> str:
+        """Return the stored string object equal to ``text``.
+
+        Args:
+            text (str): Content string
+
+        Returns:
+            str: The shared instance, so equal contents share one object
+        """
+        return self.texts[self.intern(text)]
+
+    def words(self, handle: int) -> Tuple[str, ...]:
+        """Return the whitespace-separated words of a content (memoized).
+
+        Args:
+            handle (int): Content handle
+
+        Returns:
+            Tuple[str, ...]: The words, in order
+        """
+        words = self._words.get(handle)
+        if words is None:
+            words = self._words[handle] = tuple(self.texts[handle].split())
+        return words
+
+    def edit(self, handle: int, words: Sequence[str]) -> int:
+        """Return the handle of ``words`` joined by spaces, or ``handle`` if the text is unchanged.
+
+        Args:
+            handle (int): Content handle the edit was derived from
+            words (Sequence[str]): New words
+
+        Returns:
+            int: Handle of the edited content
+        """
+        text = " ".join(words)
+        return handle if text == self.texts[handle] else self.intern(text)
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the memoized value for ``key``, calling ``compute`` on a miss.
+
+        Used by mutation operators to cache deterministic per-content
+        variants. Keys should hold the owning object (not its ``id``) so they
+        cannot be reused. Beyond ``memo_size`` entries the least recently used
+        one is evicted, so ``compute`` must be safe to call again.
+
+        Args:
+            key (Hashable): Cache key, e.g. ``(operator, handle)``
+            compute (Callable): Produces the value
+
+        Returns:
+            Any: The cached value
+        """
+        memo = self._memo
+        if key in memo:
+            memo.move_to_end(key)
+            return memo[key]
+        value = memo[key] = compute()
+        if len(memo) > self.memo_size:
+            memo.popitem(last=False)
+        return value
+
+    def needs_compaction(self, population: int) -> bool:
+        """Return whether the store has grown enough to be worth compacting.
+
+        A pool of ``population`` memes uses at most that many contents, so
+        anything beyond twice that (and ``COMPACT_MIN_SIZE``) is mostly garbage.
+
+        Args:
+            population (int): Number of memes referencing the store
+
+        Returns:
+            bool: True if ``compact`` should be called
+        """
+        return len(self.texts) > max(COMPACT_MIN_SIZE, 2 * population)
+
+    def compact(self, live: Iterable[int]) -> np.ndarray:
+        """Drop every content not in ``live`` and renumber the rest.
+
+        Surviving contents keep their relative order and their string objects.
+        Memoized tokenizations of survivors are kept; the ``cached`` memo,
+        whose keys and values may hold old handles, is cleared.
+
+        Args:
+            live (Iterable[int]): Handles still in use (duplicates allowed)
+
+        Returns:
+            np.ndarray: Maps each old handle to its new one, or -1 if dropped
+        """
+        live = np.asarray(list(live) if not isinstance(live, np.ndarray) else live, dtype=np.int64)
+        keep = np.unique(live)
+        mapping = np.full(len(self.texts), -1, dtype=np.int64)
+        mapping[keep] = np.arange(len(keep))
+        texts = self.texts
+        self.texts = [texts[h] for h in keep.tolist()]
+        self._lookup = {text: handle for handle, text in enumerate(self.texts)}
+        self._words = {int(mapping[h]): words for h, words in self._words.items() if mapping[h] >= 0}
+        self._memo.clear()
+        return mapping
+
+    def dedup_stats(self, handles: Iterable[int]) -> Dict[str, float]:
+        """Summarize how much sharing the given content references achieve.
+
+        Args:
+            handles (Iterable[int]): One content handle per meme
+
+        Returns:
+            Dict[str, float]: ``references`` (memes), ``distinct`` (contents in
+            use), ``dedup_ratio`` (references per distinct content), and
+            ``bytes_stored`` / ``bytes_referenced`` (UTF-8 size stored once vs.
+            the size if every meme held its own copy)
+        """
+        handles = np.asarray(list(handles) if not isinstance(handles, np.ndarray) else handles, dtype=np.int64)
+        used, counts = np.unique(handles, return_counts=True)
+        sizes = np.array([len(self.texts[h].encode("utf-8")) for h in used.tolist()], dtype=np.int64)
+        references = int(len(handles))
+        return {
+            "references": references,
+            "distinct": int(len(used)),
+            "dedup_ratio": references / len(used) if len(used) else 0.0,
+            "bytes_stored": int(sizes.sum()),
+            "bytes_referenced": int((sizes * counts).sum())
+        }
@@ -0,0 +1,114 @@
+'''
+fitness_history.py: Array-backed fitness history with streaming stability statistics
+
+FitnessHistory records a sequence of fitness values either in full or in a
+fixed-size ring buffer that holds the most recent ``window`` values. The
+mean and variance of the consecutive differences are maintained with
+Welford's algorithm as values arrive and, in windowed mode, leave. So
+``std_of_diffs`` is O(1) and equals ``np.std(np.diff(values))`` over the
+retained values, up to rounding.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import math
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class FitnessHistory:
+    """Append-only fitness record with a running variance of its differences.
+
+    Args:
+        window (int, optional): Keep only the most recent ``window`` values
+            (at least 2); None keeps every value
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        if window is not None and window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self._values = np.empty(window if window is not None else 16, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+        self._count = 0  # differences currently included in the statistics
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values().tolist())
+
+    def __getitem__(self, index):
+        return self.values()[index]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.values()
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"FitnessHistory({self.values().tolist()!r}, window={self.window})"
+
+    def values(self) -> np.ndarray:
+        """Return the retained values, oldest first, as a new array."""
+        if self._start:
+            return np.roll(self._values, -self._start)
+        return self._values[:self._size].copy()
+
+    def append(self, value: float) -> None:
+        """Record a new value, evicting the oldest one in windowed mode.
+
+        Args:
+            value (float): Fitness value
+        """
+        value = float(value)
+        if self._size:
+            self._add_diff(value - self._last())
+        if self.window is None:
+            if self._size == len(self._values):
+                self._values = np.resize(self._values, 2 * len(self._values))
+            self._values[self._size] = value
+            self._size += 1
+        elif self._size < self.window:
+            self._values[self._size] = value
+            self._size += 1
+        else:
+            # The oldest difference leaves with the oldest value
+            oldest = self._values[self._start]
+            self._remove_diff(self._values[(self._start + 1) % self.window] - oldest)
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.window
+
+    def extend(self, values) -> None:
+        """Append several values in order."""
+        for value in values:
+            self.append(value)
+
+    def std_of_diffs(self) -> float:
+        """Population standard deviation of consecutive differences (0.0 if there are none)."""
+        if self._count == 0:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / self._count)
+
+    def _last(self) -> float:
+        if self.window is None or self._size < self.window:
+            return float(self._values[self._size - 1])
+        return float(self._values[(self._start - 1) % self.window])
+
+    def _add_diff(self, diff: float) -> None:
+        self._count += 1
+        delta = diff - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (diff - self._mean)
+
+    def _remove_diff(self, diff: float) -> None:
+        if self._count <= 1:
+            self._count, self._mean, self._m2 = 0, 0.0, 0.0
+            return
+        old_mean = self._mean
+        self._mean = (self._count * old_mean - diff) / (self._count - 1)
+        self._m2 -= (diff - old_mean) * (diff - self._mean)
+        self._count -= 1
@@ -0,0 +1,182 @@
+'''
+islands.py: Parallel island-model evolution for meme populations
+
+The population is sharded across N islands that evolve independently in a
+ProcessPoolExecutor. Every ``migration_interval`` generations the fittest
+memes of each island are copied to its neighbours according to a migration
+topology. Islands are ArrayMemePool instances, which pickle as compact array
+batches, so shipping an island to a worker costs roughly the size of its
+arrays rather than one pickled dataclass per meme. The lineage tables stay in
+this process: workers evolve forks that carry only the live IDs and return
+only the lineage rows allocated during the epoch.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Optional
+
+from memetics import Meme, MemePool
+from array_pool import ArrayMemePool
+from mutation_ops import MutationPipeline
+from seeding import SeedLike, spawn_rngs
+
+TOPOLOGIES = ("ring", "full", "random")
+
+# Each island allocates meme IDs from its own range so migrants never collide
+ISLAND_ID_STRIDE = 10 ** 9
+
+
+def _evolve_island(island: ArrayMemePool, generations: int, selection_pressure: float) -> ArrayMemePool:
+    """Worker entry point: evolve one island for a number of generations."""
+    for _ in range(generations):
+        island.evolve(selection_pressure)
+    return island
+
+
+class IslandModel:
+    """Evolve a meme population as N islands with periodic migration.
+
+    Args:
+        n_islands (int): Number of islands
+        topology (str): Migration topology: 'ring' (i -> i+1), 'full' (i -> all
+            others) or 'random' (i -> one random other island per migration)
+        migration_interval (int): Generations between migrations
+        migrants (int): Number of top memes each island sends per migration
+        selection_pressure (float): Passed to ``ArrayMemePool.evolve``
+        max_workers (int, optional): Worker processes (default: one per CPU)
+        seed (SeedLike, optional): Seed for reproducible runs; each island
+            and the migration scheduler get an independent child stream
+        mutations (MutationPipeline, optional): Mutation operators shared by
+            every island (default: ``default_mutations()``)
+    """
+
+    def __init__(
+        self,
+        n_islands: int = 4,
+        topology: str = "ring",
+        migration_interval: int = 5,
+        migrants: int = 2,
+        selection_pressure: float = 0.5,
+        max_workers: Optional[int] = None,
+        seed: SeedLike = None,
+        mutations: Optional[MutationPipeline] = None
+    ):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+        if n_islands < 1:
+            raise ValueError("n_islands must be at least 1")
+        self.n_islands = n_islands
+        self.topology = topology
+        self.migration_interval = max(1, migration_interval)
+        self.migrants = migrants
+        self.selection_pressure = selection_pressure
+        self.max_workers = max_workers
+        rngs = spawn_rngs(seed, n_islands + 1)
+        self.rng = rngs[0]
+        self.islands: List[ArrayMemePool] = [
+            ArrayMemePool(seed=rng, id_base=index * ISLAND_ID_STRIDE, mutations=mutations)
+            for index, rng in enumerate(rngs[1:])
+        ]
+        self.generation = 0
+
+    @classmethod
+    def from_pool(cls, pool: MemePool, **kwargs) -> 'IslandModel':
+        """Shard the memes of a MemePool across a new island model.
+
+        Args:
+            pool (MemePool): Source population
+            **kwargs: Passed to ``IslandModel``
+
+        Returns:
+            IslandModel: The populated model
+        """
+        model = cls(**kwargs)
+        model.populate(pool.memes)
+        return model
+
+    def populate(self, memes: Iterable[Meme]) -> None:
+        """Distribute memes round-robin across the islands.
+
+        Args:
+            memes (Iterable[Meme]): Memes to add
+        """
+        shards: List[List[Meme]] = [[] for _ in range(self.n_islands)]
+        for i, meme in enumerate(memes):
+            shards[i % self.n_islands].append(meme)
+        for island, shard in zip(self.islands, shards):
+            island.add_memes(shard)
+
+    def run(self, generations: int) -> None:
+        """Evolve every island, migrating between epochs.
+
+        Args:
+            generations (int): Number of generations to run
+        """
+        remaining = generations
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining > 0:
+                step = min(self.migration_interval, remaining)
+                forks = [island.fork() for island in self.islands]
+                for island, evolved in zip(self.islands, executor.map(
+                        _evolve_island, forks, repeat(step), repeat(self.selection_pressure))):
+                    island.join(evolved)
+                self.generation += step
+                remaining -= step
+                if remaining > 0:
+                    self.migrate()
+
+    def migrate(self) -> None:
+        """Copy the top memes of every island to its neighbours."""
+        if self.n_islands < 2 or self.migrants <= 0:
+            return
+        batches = [island.to_batch(island.top_rows(self.migrants)) for island in self.islands]
+        for source, targets in enumerate(self.routes()):
+            for target in targets:
+                self.islands[target].extend(batches[source])
+
+    def routes(self) -> List[List[int]]:
+        """Return the migration targets of every island for the next migration.
+
+        Returns:
+            List[List[int]]: ``routes[i]`` lists the islands that receive from island ``i``
+        """
+        n = self.n_islands
+        if self.topology == "ring":
+            return [[(i + 1) % n] for i in range(n)]
+        if self.topology == "full":
+            return [[j for j in range(n) if j != i] for i in range(n)]
+        # random: one distinct other island per source
+        offsets = self.rng.integers(1, n, size=n)
+        return [[int((i + offset) % n)] for i, offset in enumerate(offsets)]
+
+    def ancestry(self, uid: int) -> List[int]:
+        """Return ``uid`` followed by its ancestors, following migrants back to their source island.
+
+        Args:
+            uid (int): Meme ID in any island
+
+        Returns:
+            List[int]: IDs from the meme itself to its original root; the
+                island of each is ``id // ISLAND_ID_STRIDE``
+        """
+        chain: List[int] = []
+        while uid is not None:
+            lineage = self.islands[uid // ISLAND_ID_STRIDE].lineage
+            local = lineage.ancestry(uid)
+            chain.extend(local)
+            uid = lineage.origins.get(local[-1])
+        return chain
+
+    def population_size(self) -> int:
+        """Return the total number of memes across all islands."""
+        return sum(len(island) for island in self.islands)
+
+    def to_memes(self) -> List[Meme]:
+        """Materialize every island's memes as Meme instances.
+
+        Returns:
+            List[Meme]: Memes of island 0, then island 1, and so on
+        """
+        return [meme for island in self.islands for meme in island.to_memes()]
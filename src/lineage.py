@@ -0,0 +1,496 @@
+'''
+lineage.py: Compact integer meme IDs with a parent-pointer lineage table
+
+Instead of growing string IDs by concatenation on every replication and
+mutation, each meme receives an integer ID. The Lineage table stores, per ID,
+the parent ID and how the meme was derived (root, copy or mutation), so the
+legacy ``<root>-copy-<n>-mutated-<m>`` string is only rendered when it is
+actually needed, e.g. when a meme is serialized.
+
+The table doubles as a phylogeny index. Root ancestor and depth are
+maintained on append and answer in O(1). Clade sizes and most-recent common
+ancestors come from a DFS-order index with a sparse table for range-minimum
+queries, built on demand and rebuilt only after the table has grown.
+
+A table can be forked to continue its ID sequence elsewhere, e.g. in a worker
+process, without copying its rows: the fork only carries the depth and root of
+the IDs it will derive from, and its new rows are merged back afterwards.
+
+Memes copied in from another table (migrants between islands) become roots
+that remember the ID they were copied from, so ancestry can be followed back
+across tables while rendered IDs stay as short as the original root label.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import os
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# How a meme was derived from its parent
+KIND_ROOT = 0
+KIND_COPY = 1
+KIND_MUTATED = 2
+
+KIND_SUFFIX = {KIND_COPY: "copy", KIND_MUTATED: "mutated"}
+
+
+class Lineage:
+    """Append-only table of meme IDs and their parents.
+
+    IDs are allocated sequentially starting at ``id_base``; row ``uid - id_base``
+    of ``parents`` and ``kinds`` describes meme ``uid``. Root memes keep their
+    original string ID in ``labels``.
+
+    Args:
+        id_base (int): First ID to allocate. Pools whose memes may meet (e.g.
+            islands exchanging migrants) should use disjoint bases.
+
+    Attributes:
+        key (int): Random identity of the table, kept when it is pickled or
+            saved, that MemeId handles compare and hash on
+        origins (Dict[int, int]): For roots added by ``add_migrant``, the ID
+            of the meme they were copied from in the source table
+    """
+
+    def __init__(self, id_base: int = 0):
+        self.id_base = id_base
+        self.key = int.from_bytes(os.urandom(8), "little") >> 1
+        self.parents = array('q')
+        self.kinds = array('b')
+        self.depths = array('i')
+        self.roots = array('q')
+        self.labels: Dict[int, str] = {}
+        self.origins: Dict[int, int] = {}
+        # Forks only: (ids, depths, roots) of the IDs before id_base they derive from
+        self._anchors: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._index: Optional[_CladeIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The clade index is a cache; rebuild it on demand after unpickling
+        state = self.__dict__.copy()
+        state["_index"] = None
+        return state
+
+    def add_root(self, label: str) -> int:
+        """Register a meme without a known parent.
+
+        Args:
+            label (str): The meme's string ID
+
+        Returns:
+            int: The allocated integer ID
+        """
+        uid = self.id_base + len(self.parents)
+        self.parents.append(-1)
+        self.kinds.append(KIND_ROOT)
+        self.depths.append(0)
+        self.roots.append(uid)
+        self.labels[uid] = label
+        return uid
+
+    def add_migrant(self, label: str, origin: int) -> int:
+        """Register a meme copied from another table as a root of this one.
+
+        Args:
+            label (str): Label of the meme's root in the source table
+            origin (int): The meme's ID in the source table
+
+        Returns:
+            int: The allocated integer ID
+        """
+        uid = self.add_root(label)
+        self.origins[uid] = origin
+        return uid
+
+    def root_label(self, uid: Union[int, 'MemeId']) -> str:
+        """Return the label of the original root ``uid`` descends from.
+
+        Migrants carry their source root's label, so this is the same in
+        every table a meme's descendants migrate to.
+
+        Args:
+            uid (int or MemeId): Meme ID
+
+        Returns:
+            str: The root label
+        """
+        return self.labels[self.root_of(uid)]
+
+    def allocate(self, parent: int, kind: int) -> int:
+        """Allocate an ID for a meme derived from ``parent``.
+
+        Args:
+            parent (int): Parent meme ID
+            kind (int): ``KIND_COPY`` or ``KIND_MUTATED``
+
+        Returns:
+            int: The allocated integer ID
+        """
+        uid = self.id_base + len(self.parents)
+        row = parent - self.id_base
+        if row < 0:
+            depths, roots = self._lookup(np.array([parent], dtype=np.int64))
+            depth, root = int(depths[0]), int(roots[0])
+        else:
+            depth, root = self.depths[row], self.roots[row]
+        self.parents.append(parent)
+        self.kinds.append(kind)
+        self.depths.append(depth + 1)
+        self.roots.append(root)
+        return uid
+
+    def allocate_many(self, parents: np.ndarray, kind: int) -> np.ndarray:
+        """Allocate one ID per entry of ``parents`` in a single append.
+
+        Args:
+            parents (np.ndarray): Parent meme IDs
+            kind (int): ``KIND_COPY`` or ``KIND_MUTATED``
+
+        Returns:
+            np.ndarray: The allocated IDs (int64)
+        """
+        start = self.id_base + len(self.parents)
+        parents = np.ascontiguousarray(parents, dtype=np.int64)
+        if len(parents) == 0:
+            return np.empty(0, dtype=np.int64)
+        depths, roots = self._lookup(parents)
+        depths = depths + 1
+        self.parents.frombytes(parents.tobytes())
+        self.kinds.frombytes(np.full(len(parents), kind, dtype=np.int8).tobytes())
+        self.depths.frombytes(depths.astype(np.int32).tobytes())
+        self.roots.frombytes(roots.tobytes())
+        return np.arange(start, start + len(parents), dtype=np.int64)
+
+    def _lookup(self, uids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the depths and roots of ``uids``, resolving a fork's anchors."""
+        rows = uids - self.id_base
+        own_depths = np.frombuffer(self.depths, dtype=np.int32)
+        own_roots = np.frombuffer(self.roots, dtype=np.int64)
+        if self._anchors is None or rows.min() >= 0:
+            return own_depths[rows], own_roots[rows]
+        anchor_ids, anchor_depths, anchor_roots = self._anchors
+        own = rows >= 0
+        at = np.searchsorted(anchor_ids, uids[~own])
+        if np.any(at >= len(anchor_ids)) or np.any(anchor_ids[np.minimum(at, len(anchor_ids) - 1)] != uids[~own]):
+            raise KeyError("ID is neither in this table nor an anchor of the fork")
+        depths = np.empty(len(uids), dtype=np.int32)
+        roots = np.empty(len(uids), dtype=np.int64)
+        depths[own], roots[own] = own_depths[rows[own]], own_roots[rows[own]]
+        depths[~own], roots[~own] = anchor_depths[at], anchor_roots[at]
+        return depths, roots
+
+    def fork(self, live: np.ndarray) -> 'Lineage':
+        """Start a table that continues this one's ID sequence without copying its rows.
+
+        The fork allocates the same IDs this table would allocate next and
+        only carries the depth and root of ``live``, the IDs it may derive
+        memes from. Its ancestry and rendering stop at those IDs, and clade
+        queries belong on this table once the fork has been passed to
+        ``merge``, which appends its rows.
+
+        Args:
+            live (np.ndarray): IDs the fork may use as parents
+
+        Returns:
+            Lineage: An empty table starting at this one's next ID
+        """
+        fork = Lineage(self.id_base + len(self.parents))
+        fork.key = self.key
+        anchors = np.unique(np.asarray(live, dtype=np.int64))
+        if len(anchors):
+            depths, roots = self._lookup(anchors)
+        else:
+            depths, roots = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        fork._anchors = (anchors, depths, roots)
+        return fork
+
+    def merge(self, fork: 'Lineage') -> None:
+        """Append the rows allocated by a fork of this table.
+
+        Args:
+            fork (Lineage): Table returned by ``fork``, possibly after pickling
+
+        Raises:
+            ValueError: If the fork does not continue this table's IDs, e.g.
+                because this table allocated IDs in the meantime
+        """
+        if fork.id_base != self.id_base + len(self.parents):
+            raise ValueError("The fork does not continue this table's ID sequence")
+        self.parents.extend(fork.parents)
+        self.kinds.extend(fork.kinds)
+        self.depths.extend(fork.depths)
+        self.roots.extend(fork.roots)
+        self.labels.update(fork.labels)
+        self.origins.update(fork.origins)
+
+    def parent(self, uid: int) -> int:
+        """Return the parent ID of ``uid``, or -1 for a root."""
+        return self.parents[_uid(uid) - self.id_base]
+
+    def root_of(self, uid: Union[int, 'MemeId']) -> int:
+        """Return the root ancestor of ``uid`` in O(1).
+
+        Args:
+            uid (int or MemeId): Meme ID
+
+        Returns:
+            int: ID of the root meme the lineage descends from
+        """
+        return self.roots[_uid(uid) - self.id_base]
+
+    def depth(self, uid: Union[int, 'MemeId']) -> int:
+        """Return the number of derivation steps between ``uid`` and its root in O(1).
+
+        Args:
+            uid (int or MemeId): Meme ID
+
+        Returns:
+            int: 0 for a root
+        """
+        return self.depths[_uid(uid) - self.id_base]
+
+    def clade_size(self, uid: Union[int, 'MemeId']) -> int:
+        """Return the number of memes descending from ``uid``, itself included.
+
+        Args:
+            uid (int or MemeId): Meme ID
+
+        Returns:
+            int: Size of the clade rooted at ``uid``
+        """
+        return int(self._clade_index().sizes[_uid(uid) - self.id_base])
+
+    def common_ancestor(self, first: Union[int, 'MemeId'], second: Union[int, 'MemeId']) -> int:
+        """Return the most recent common ancestor of two memes in O(1).
+
+        Args:
+            first (int or MemeId): Meme ID
+            second (int or MemeId): Meme ID
+
+        Returns:
+            int: ID of the deepest shared ancestor, or -1 if the memes descend
+            from different roots
+        """
+        a, b = _uid(first) - self.id_base, _uid(second) - self.id_base
+        if self.roots[a] != self.roots[b]:
+            return -1
+        if a == b:
+            return a + self.id_base
+        return self._clade_index().lca(a, b) + self.id_base
+
+    def _clade_index(self) -> '_CladeIndex':
+        """Return the DFS-order index, rebuilding it if the table has grown."""
+        if self._index is None or self._index.size != len(self.parents):
+            # Copies, so the append-only arrays stay resizable
+            self._index = _CladeIndex(
+                np.array(self.parents, dtype=np.int64) - self.id_base,
+                np.array(self.depths, dtype=np.int32)
+            )
+        return self._index
+
+    def save(self, path: str) -> None:
+        """Persist the table to a compressed ``.npz`` file.
+
+        Args:
+            path (str): File path to save
+        """
+        uids = np.fromiter(self.labels, dtype=np.int64, count=len(self.labels))
+        migrants = np.fromiter(self.origins, dtype=np.int64, count=len(self.origins))
+        np.savez_compressed(
+            path,
+            id_base=np.int64(self.id_base),
+            key=np.int64(self.key),
+            parents=np.array(self.parents, dtype=np.int64),
+            kinds=np.array(self.kinds, dtype=np.int8),
+            depths=np.array(self.depths, dtype=np.int32),
+            roots=np.array(self.roots, dtype=np.int64),
+            label_ids=uids,
+            label_values=np.array([self.labels[int(uid)] for uid in uids], dtype=str),
+            origin_ids=migrants,
+            origin_values=np.array([self.origins[int(uid)] for uid in migrants], dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'Lineage':
+        """Load a table written by ``save``.
+
+        Args:
+            path (str): File path to load from
+
+        Returns:
+            Lineage: The restored table
+        """
+        with np.load(path) as data:
+            lineage = cls(int(data["id_base"]))
+            if "key" in data.files:
+                lineage.key = int(data["key"])
+            lineage.parents.frombytes(data["parents"].astype(np.int64).tobytes())
+            lineage.kinds.frombytes(data["kinds"].astype(np.int8).tobytes())
+            lineage.depths.frombytes(data["depths"].astype(np.int32).tobytes())
+            lineage.roots.frombytes(data["roots"].astype(np.int64).tobytes())
+            lineage.labels = dict(zip(data["label_ids"].tolist(), data["label_values"].tolist()))
+            if "origin_ids" in data.files:
+                lineage.origins = dict(zip(data["origin_ids"].tolist(), data["origin_values"].tolist()))
+        return lineage
+
+    def ancestry(self, uid: int) -> List[int]:
+        """Return ``uid`` followed by each of its ancestors up to the root.
+
+        In a fork the chain ends at the first ID before ``id_base``.
+
+        Args:
+            uid (int): Meme ID
+
+        Returns:
+            List[int]: IDs from the meme itself to its root
+        """
+        uid = _uid(uid)
+        chain = [uid]
+        parent = self.parents[uid - self.id_base] if uid >= self.id_base else -1
+        while parent >= self.id_base:
+            chain.append(parent)
+            parent = self.parents[parent - self.id_base]
+        if parent >= 0:
+            chain.append(parent)
+        return chain
+
+    def render(self, uid: int) -> str:
+        """Render the legacy string ID of ``uid``.
+
+        Args:
+            uid (int): Meme ID
+
+        Returns:
+            str: e.g. ``meme_001-copy-17-mutated-18``; a migrant root renders
+            as ``<root label>-migrated-<source id>``, and in a fork an ancestor
+            kept by the parent table renders as ``#<id>``
+        """
+        chain = self.ancestry(_uid(uid))
+        head = chain[-1]
+        parts = [self.labels[head] if head >= self.id_base else f"#{head}"]
+        if head in self.origins:
+            parts.append(f"-migrated-{self.origins[head]}")
+        for node in reversed(chain[:-1]):
+            parts.append(f"-{KIND_SUFFIX[self.kinds[node - self.id_base]]}-{node}")
+        return "".join(parts)
+
+    def handle(self, uid: int) -> 'MemeId':
+        """Return a lazily rendered ID handle for ``uid``."""
+        return MemeId(uid, self)
+
+
+class _CladeIndex:
+    """DFS-order index over a lineage forest for clade sizes and LCA queries.
+
+    Rows are numbered so that every parent precedes its children, which lets
+    subtree sizes and DFS entry times be computed level by level with array
+    operations. The most recent common ancestor of ``a`` and ``b`` (entry
+    times ``ta < tb``) is the parent of the shallowest node whose entry time
+    lies in ``(ta, tb]``; a sparse table answers that range minimum in O(1).
+    """
+
+    def __init__(self, parents: np.ndarray, depths: np.ndarray):
+        size = len(parents)
+        self.size = size
+        self.parents = parents
+        sizes = np.ones(size, dtype=np.int64)
+        levels = [np.flatnonzero(depths == d) for d in range(int(depths.max()) + 1 if size else 0)]
+
+        # Subtree sizes, deepest level first
+        for nodes in reversed(levels[1:]):
+            np.add.at(sizes, parents[nodes], sizes[nodes])
+        self.sizes = sizes
+
+        # DFS entry times: children follow their parent, siblings in ID order
+        entry = np.zeros(size, dtype=np.int64)
+        for depth, nodes in enumerate(levels):
+            if depth == 0:
+                entry[nodes] = np.cumsum(sizes[nodes]) - sizes[nodes]
+                continue
+            nodes = nodes[np.argsort(parents[nodes], kind="stable")]
+            before = np.cumsum(sizes[nodes]) - sizes[nodes]
+            group_start = np.flatnonzero(np.r_[True, parents[nodes][1:] != parents[nodes][:-1]])
+            group_of = np.repeat(group_start, np.diff(np.r_[group_start, len(nodes)]))
+            entry[nodes] = entry[parents[nodes]] + 1 + before - before[group_of]
+        self.entry = entry
+
+        order = np.empty(size, dtype=np.int64)
+        order[entry] = np.arange(size)
+        self.order = order
+
+        # Sparse table of the shallowest position in each power-of-two window
+        order_depths = depths[order]
+        table = [np.arange(size, dtype=np.int64)]
+        span = 1
+        while 2 * span <= size:
+            prev = table[-1]
+            left, right = prev[:-span], prev[span:]
+            table.append(np.where(order_depths[left] <= order_depths[right], left, right))
+            span *= 2
+        self.table = table
+        self.order_depths = order_depths
+
+    def lca(self, a: int, b: int) -> int:
+        """Return the row of the most recent common ancestor of rows ``a`` and ``b``."""
+        ta, tb = int(self.entry[a]), int(self.entry[b])
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta == tb:
+            return a
+        lo, hi = ta + 1, tb + 1
+        level = (hi - lo).bit_length() - 1
+        left = self.table[level][lo]
+        right = self.table[level][hi - (1 << level)]
+        shallowest = left if self.order_depths[left] <= self.order_depths[right] else right
+        return int(self.parents[self.order[shallowest]])
+
+
+def _uid(uid: Union[int, 'MemeId']) -> int:
+    """Accept either an integer ID or a MemeId handle."""
+    return uid.uid if isinstance(uid, MemeId) else int(uid)
+
+
+class MemeId:
+    """A compact meme ID that renders its legacy string form on demand.
+
+    Handles compare and hash on their table and integer ID, so neither renders
+    the O(depth) string; only ``str`` and ``repr`` do. A handle never equals a
+    string: compare ``str(handle)`` for that.
+    """
+
+    __slots__ = ("uid", "lineage")
+
+    def __init__(self, uid: int, lineage: Lineage):
+        self.uid = uid
+        self.lineage = lineage
+
+    def child(self, kind: int) -> 'MemeId':
+        """Allocate the ID of a meme derived from this one.
+
+        Args:
+            kind (int): ``KIND_COPY`` or ``KIND_MUTATED``
+
+        Returns:
+            MemeId: Handle for the new meme
+        """
+        return MemeId(self.lineage.allocate(self.uid, kind), self.lineage)
+
+    def __str__(self) -> str:
+        return self.lineage.render(self.uid)
+
+    def __repr__(self) -> str:
+        return f"MemeId({self.uid}, {str(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, MemeId):
+            return other.uid == self.uid and other.lineage.key == self.lineage.key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.lineage.key, self.uid))
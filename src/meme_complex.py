@@ -1,7 +1,60 @@
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional, Union
 import networkx as nx
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from seeding import SeedLike, make_rng
+from sparse_graph import SparseMemeGraph
+from centrality import harmonic_total
+from fitness_history import FitnessHistory
+
+BACKENDS = ("networkx", "sparse")
+
+
+class VersionedDiGraph(nx.DiGraph):
+    """A ``networkx.DiGraph`` that counts structural edge changes.
+
+    ``edge_version`` is incremented whenever edges are added or removed, or
+    nodes are removed (which drops their edges), so cached path-based
+    statistics know when to recompute. Adding isolated nodes leaves it unchanged.
+    """
+
+    edge_version = 0
+
+    def _touch(self) -> None:
+        self.edge_version += 1
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        self._touch()
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        self._touch()
+        super().add_edges_from(ebunch_to_add, **attr)
+
+    def remove_edge(self, u, v):
+        self._touch()
+        super().remove_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        self._touch()
+        super().remove_edges_from(ebunch)
+
+    def remove_node(self, n):
+        self._touch()
+        super().remove_node(n)
+
+    def remove_nodes_from(self, nodes):
+        self._touch()
+        super().remove_nodes_from(nodes)
+
+    def clear(self):
+        self._touch()
+        super().clear()
+
+    def clear_edges(self):
+        self._touch()
+        super().clear_edges()
 
 @dataclass
 class Meme:
@@ -19,97 +72,242 @@ class Meme:
         return isinstance(other, Meme) and self.id == other.id
 
 class MemeComplex:
-    """A collection of memes that have evolved into a mutually supportive or symbiotic relationship."
+    """A collection of memes that have evolved into a mutually supportive or symbiotic relationship.
+
+    Args:
+        name (str): Name of the complex
+        seed (SeedLike, optional): Seed or numpy Generator for reproducible evolution
+        backend (str): Graph storage: 'networkx' (a ``DiGraph``) or 'sparse'
+            (a ``SparseMemeGraph`` with array-backed nodes and edges)
+        history_window (int, optional): Keep only the most recent fitness
+            values for the stability score; None keeps all of them
+    """
 
-    def __init__(self, name: str):
+    def __init__(self, name: str, seed: SeedLike = None, backend: str = "networkx",
+                 history_window: Optional[int] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
         self.name = name
+        self.backend = backend
+        self.rng = make_rng(seed)
         self.memes: Set[Meme] = set()
-        self.network = nx.DiGraph()
-        self.fitness_history: List[float] = []
+        self.network = self._new_graph()
+        self._centrality_cache: Optional[Tuple] = None
+        self.fitness_history = FitnessHistory(history_window)
         self.generation = 0
+        self._revision = 0
 
     def add_meme(self, meme: Meme) -> bool:
-        """Add a meme to the complex, updating the network structure."""
+        """Add a copy of a meme to the complex, updating the network structure.
+
+        The complex keeps its own copy because ``evolve`` updates memes in place.
+        """
         if meme in self.memes:
             return False
 
-        self.memes.add(meme)
+        self.memes.add(replace(meme))
         self.network.add_node(meme.id, content=meme.content, fitness=meme.fitness)
         self.fitness_history.append(meme.fitness)
+        self._revision += 1
         return True
 
-    def merge(self, other: 'MemeComplex') -> 'MemeComplex':
-        """Merge another meme complex into this one, preserving mutual support."""
-        merged = MemeComplex(f"{self.name}_merged_{other.name}")
-        merged.memes = self.memes | other.memes
+    @property
+    def version(self) -> Optional[Tuple[int, int, int, int]]:
+        """Key that changes whenever the memes or the graph change, for memoizing results.
+
+        None if the network does not track an ``edge_version`` (e.g. a plain
+        ``DiGraph`` assigned by hand), in which case changes cannot be detected.
+        """
+        network = self.network
+        edge_version = getattr(network, "edge_version", None)
+        if edge_version is None:
+            return None
+        return (self._revision, id(network), edge_version, network.number_of_nodes())
+
+    def merge(self, other: 'MemeComplex', similarity: Optional[float] = None) -> 'MemeComplex':
+        """Merge another meme complex into this one, preserving mutual support.
+
+        The historical inter-complex rule linked two memes when
+        ``np.corrcoef([a, b], [b, a])[0][1] > 0.6`` for their fitness values
+        ``a`` and ``b``. That coefficient is -1 whenever ``a != b`` and NaN when
+        ``a == b``, so the rule never adds an edge; by default no
+        inter-complex edges are created and the pairwise loop is skipped.
+
+        Args:
+            other (MemeComplex): Complex to merge with
+            similarity (float, optional): If given, link memes across the two
+                complexes whose fitness differs by at most this amount, in
+                both directions, with weight ``1 / (1 + |difference|)``.
+                Partners are found with a sorted sweep in O((n + m) log m + k)
+                for k edges.
+
+        Returns:
+            MemeComplex: The merged complex
+        """
+        merged = MemeComplex(f"{self.name}_merged_{other.name}", backend=self.backend,
+                             history_window=self.fitness_history.window)
+        # Copies, since evolve updates memes in place
+        merged.memes = {replace(m) for m in self.memes | other.memes}
 
         # Copy nodes and edges
-        merged.network = nx.DiGraph()
         merged.network.add_nodes_from(self.network.nodes(data=True))
         merged.network.add_nodes_from(other.network.nodes(data=True))
         merged.network.add_edges_from(self.network.edges())
         merged.network.add_edges_from(other.network.edges())
 
-        # Add inter-complex connections based on fitness correlation
-        self_fitnesses = {n: d['fitness'] for n, d in self.network.nodes(data=True)}
-        other_fitnesses = {n: d['fitness'] for n, d in other.network.nodes(data=True)}
-
         # Connect memes with similar fitness values
-        for m1 in self.memes:
-            for m2 in other.memes:
-                corr = np.corrcoef(
-                    [self_fitnesses[m1.id], other_fitnesses.get(m2.id, 0.5)],
-                    [other_fitnesses.get(m2.id, 0.5), self_fitnesses[m1.id]]
-                )[0][1]
-                if corr > 0.6:  # Strong positive correlation
-                    merged.network.add_edge(m1.id, m2.id, weight=corr)
-                    merged.network.add_edge(m2.id, m1.id, weight=corr)
+        if similarity is not None and self.memes and other.memes:
+            merged.network.add_weighted_edges_from(self._similar_pairs(other, similarity))
 
         merged.generation = max(self.generation, other.generation) + 1
         return merged
 
-    def coevolution_strength(self) -> float:
-        """Compute co-evolutionary interactivity strength using network centrality measures."
+    def _new_graph(self) -> Union[nx.DiGraph, SparseMemeGraph]:
+        """Return an empty graph for this complex's backend."""
+        return SparseMemeGraph() if self.backend == "sparse" else VersionedDiGraph()
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Return the network as a ``networkx.DiGraph``, converting the sparse backend on demand."""
+        if isinstance(self.network, SparseMemeGraph):
+            return self.network.to_networkx()
+        return self.network
+
+    def _similar_pairs(self, other: 'MemeComplex', tolerance: float) -> List[Tuple[str, str, float]]:
+        """Return weighted edges (both directions) between memes whose fitness is within ``tolerance``."""
+        self_fitnesses = {n: d['fitness'] for n, d in self.network.nodes(data=True)}
+        other_fitnesses = {n: d['fitness'] for n, d in other.network.nodes(data=True)}
+        left_ids = [m.id for m in self.memes]
+        right_ids = [m.id for m in other.memes]
+        left = np.array([self_fitnesses[i] for i in left_ids], dtype=np.float64)
+        right = np.array([other_fitnesses.get(i, 0.5) for i in right_ids], dtype=np.float64)
+
+        # Sorted sweep: each meme's partners form a contiguous window of the sorted fitnesses;
+        # the window is padded slightly and then filtered exactly to avoid rounding misses
+        order = np.argsort(right, kind="stable")
+        ordered = right[order]
+        pad = tolerance * 1e-9 + np.finfo(np.float64).eps * np.maximum(1.0, np.abs(left))
+        lo = np.searchsorted(ordered, left - tolerance - pad, side="left")
+        hi = np.searchsorted(ordered, left + tolerance + pad, side="right")
+        counts = hi - lo
+        rows = np.repeat(np.arange(len(left)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cols = order[np.repeat(lo, counts) + offsets]
+        difference = np.abs(left[rows] - right[cols])
+        keep = difference <= tolerance
+        rows, cols, weights = rows[keep], cols[keep], (1.0 / (1.0 + difference[keep])).tolist()
+
+        edges = []
+        for r, c, weight in zip(rows.tolist(), cols.tolist(), weights):
+            a, b = left_ids[r], right_ids[c]
+            if a != b:
+                edges.append((a, b, weight))
+                edges.append((b, a, weight))
+        return edges
+
+    def coevolution_strength(self, epsilon: Optional[float] = None, delta: float = 0.05,
+                             seed: SeedLike = None) -> float:
+        """Compute co-evolutionary interactivity strength as the average harmonic centrality.
+
+        Distances come from BFS over a SciPy sparse adjacency matrix. With
+        ``epsilon`` set, BFS runs from a random sample of
+        ``ceil(ln(2/delta) / (2 epsilon^2))`` sources instead of every node,
+        and the result is within ``epsilon * (n - 1)`` of the exact value with
+        probability at least ``1 - delta``.
+
+        Results are cached per graph, keyed on ``epsilon``, ``delta`` and, when
+        sampling, an integer ``seed``. Sampled results drawn from a Generator
+        or SeedSequence are not cached, and the exact value ignores ``seed``.
+        Adding isolated memes (``add_meme``) only rescales the cached value,
+        while any edge change recomputes it.
+
+        Args:
+            epsilon (float, optional): Error bound as a fraction of n - 1 (None: exact)
+            delta (float): Failure probability of the error bound
+            seed (SeedLike, optional): Seed or Generator for source sampling
+
+        Returns:
+            float: Average harmonic centrality (0.0 with fewer than two memes)
+        """
         if len(self.memes) < 2:
             return 0.0
+        network = self.network
+        size = network.number_of_nodes()
+        version = getattr(network, "edge_version", None)
+        sample_seed = None if epsilon is None else seed
+        if not (sample_seed is None or isinstance(sample_seed, int)):
+            version = None  # a generator draws new sources on every call
+        cache = self._centrality_cache
+        if (version is not None and cache is not None and cache[0] is network
+                and cache[1:5] == (version, epsilon, delta, sample_seed)):
+            # Nodes added since are isolated and contribute nothing to the total
+            return cache[5] / size
 
-        # Use harmonic centrality to measure interaction strength
-        try:
-            centrality = nx.harmonic_centrality(self.network)
-            avg_centrality = np.mean(list(centrality.values()))
-            return float(avg_centrality)
-        except:
-            return 0.0
+        if isinstance(network, SparseMemeGraph):
+            adjacency = network.adjacency()
+        else:
+            adjacency = nx.to_scipy_sparse_array(network, weight=None, format="csr")
+        total = harmonic_total(adjacency, epsilon, delta, seed)
+        if version is not None:
+            self._centrality_cache = (network, version, epsilon, delta, sample_seed, total)
+        return total / size
 
     def evolve(self, mutation_rate: float = 0.1) -> None:
-        """Simulate one generation of evolution with mutation and fitness adaptation."""
-        new_meme_set = set()
-        for meme in self.memes:
-            # Mutate fitness and spread rate
-            new_fitness = max(0.1, min(2.0, meme.fitness + np.random.normal(0, mutation_rate)))
-            new_spread_rate = max(0.1, min(3.0, meme.spread_rate + np.random.normal(0, mutation_rate)))
-            new_meme = Meme(
-                id=f"{meme.id}_mutated_{self.generation}",
-                content=meme.content,
-                fitness=new_fitness,
-                spread_rate=new_spread_rate,
-                resistance=meme.resistance
-            )
-            new_meme_set.add(new_meme)
-
-        # Update network with new memes
-        self.memes = new_meme_set
-        self.network.clear()
-        self.network.add_nodes_from([(m.id, {'content': m.content, 'fitness': m.fitness}) for m in self.memes])
+        """Simulate one generation of evolution with mutation and fitness adaptation.
+
+        Fitness and spread rate perturbations are drawn in one batch and
+        clipped with ``np.clip``. Every meme gets a new ``_mutated_<generation>``
+        ID, and the network is relabelled so edges carry over to the new IDs.
+        Memes and the network are updated in place rather than rebuilt.
+        """
+        # Iterate in ID order so a seeded run does not depend on set ordering
+        memes = sorted(self.memes, key=lambda m: m.id)
+        count = len(memes)
+        noise = self.rng.normal(0, mutation_rate, size=(count, 2))
+        fitness = np.clip(np.fromiter((m.fitness for m in memes), dtype=np.float64, count=count) + noise[:, 0],
+                          0.1, 2.0)
+        spread = np.clip(np.fromiter((m.spread_rate for m in memes), dtype=np.float64, count=count) + noise[:, 1],
+                         0.1, 3.0)
+
+        suffix = f"_mutated_{self.generation}"
+        mapping = {m.id: f"{m.id}{suffix}" for m in memes}
+        self._remap_network(memes, mapping, fitness)
+        for meme, f, r in zip(memes, fitness.tolist(), spread.tolist()):
+            meme.id, meme.fitness, meme.spread_rate = mapping[meme.id], f, r
+        # IDs are the hash key, so the set is rebuilt from the updated memes
+        self.memes = set(memes)
         self.generation += 1
+        self._revision += 1
+
+    def _remap_network(self, memes: List[Meme], mapping: Dict[str, str], fitness: np.ndarray) -> None:
+        """Rename the nodes of ``memes`` per ``mapping`` and set their fitness, keeping all edges."""
+        network = self.network
+        for meme in memes:
+            if meme.id not in network:
+                network.add_node(meme.id, content=meme.content)
+        if isinstance(network, SparseMemeGraph):
+            rows = network.rows(mapping)
+            network.relabel(mapping)
+            network.fitness[rows] = fitness
+            return
+
+        cache = self._centrality_cache
+        edge_version = getattr(network, "edge_version", None)
+        nx.relabel_nodes(network, mapping, copy=False)
+        nx.set_node_attributes(network, dict(zip(mapping.values(), fitness.tolist())), "fitness")
+        if cache is not None and cache[0] is network and cache[1] == edge_version:
+            # Same topology under new names: the cached total still holds
+            self._centrality_cache = (network, network.edge_version) + cache[2:]
 
     def get_stability_score(self) -> float:
-        """Evaluate the stability of the meme-complex over time."""
+        """Evaluate the stability of the meme-complex over time.
+
+        The volatility is the standard deviation of consecutive changes in
+        ``fitness_history``, maintained as values are added, so this is O(1).
+        """
         if len(self.fitness_history) < 2:
             return 1.0
 
-        changes = np.diff(self.fitness_history)
-        volatility = np.std(changes)
+        volatility = self.fitness_history.std_of_diffs()
         return max(0.0, 1.0 - volatility / 1.0)  # Normalize against max expected volatility
 
     def report(self) -> Dict:
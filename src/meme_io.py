@@ -0,0 +1,81 @@
+'''
+meme_io.py: Streaming JSON Lines persistence helpers
+
+Records are written one JSON object per line so that large pools and stance
+logs can be saved, appended to and read back without holding the whole file
+in memory. Compression is inferred from the file suffix: ``.gz`` uses gzip
+and ``.zst`` uses Zstandard (requires the optional ``zstandard`` package).
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import gzip
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+
+def open_stream(path: str, mode: str = 'r') -> TextIO:
+    """Open a text stream, compressing or decompressing based on the suffix.
+
+    Appending to a compressed file adds a new gzip member or zstd frame,
+    which the reader transparently concatenates.
+
+    Args:
+        path (str): File path (``.gz`` and ``.zst`` are compressed)
+        mode (str): One of 'r', 'w' or 'a'
+
+    Returns:
+        TextIO: An open text stream
+    """
+    if mode not in ('r', 'w', 'a'):
+        raise ValueError(f"Unsupported mode '{mode}', expected 'r', 'w' or 'a'")
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading or writing .zst files requires the 'zstandard' package") from e
+        raw = open(path, mode + 'b')
+        if mode == 'r':
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_jsonl(path: str, records: Iterable[Dict[str, Any]], append: bool = False) -> int:
+    """Write records as JSON Lines, one record at a time.
+
+    Args:
+        path (str): File path to write
+        records (Iterable[Dict]): Records to serialize
+        append (bool): Append to an existing file instead of truncating it
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    with open_stream(path, 'a' if append else 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily read records from a JSON Lines file.
+
+    Args:
+        path (str): File path to read
+
+    Yields:
+        Dict: One decoded record per non-empty line
+    """
+    with open_stream(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
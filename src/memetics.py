@@ -8,17 +8,35 @@ It distinguishes between content, form, and *stance*—a key contribution from S
 Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
 '''
 
+from array import array
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any, Union
 from enum import Enum
 import random
 import json
 import csv
 import logging
+import os
+import time
 from datetime import datetime
+from types import MappingProxyType
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import numpy as np
+
+from meme_io import iter_jsonl, write_jsonl
+from seeding import SeedLike, make_rng
+from content_store import ContentStore
+from mutation_ops import Lexicon, MutationBatch, MutationPipeline, SynonymSubstitution
+from lineage import KIND_COPY, KIND_MUTATED, KIND_SUFFIX, Lineage, MemeId
+from telemetry import GenerationEvent, GenerationTelemetry
+from profiling import NULL_PROBE, Profiler
+from stance_rollup import StanceRollup
+from stance_trends import StanceTrends
+
+# Suffix of the lineage table written next to JSON Lines pool files
+LINEAGE_SUFFIX = ".lineage.npz"
+
+# Logging is left to the application; per-generation summaries come from GenerationTelemetry
 logger = logging.getLogger(__name__)
 
 
@@ -32,12 +50,58 @@ class MemeStance(Enum):
     REINFORCING = "reinforcing"
 
 
+# Fitness multiplier applied for each stance (see Meme.get_fitness)
+STANCE_MULTIPLIERS: Dict[MemeStance, float] = {
+    MemeStance.SUPPORTIVE: 1.3,
+    MemeStance.IRONIC: 1.1,
+    MemeStance.SUBVERSIVE: 1.2,
+    MemeStance.PARODIC: 1.5,
+    MemeStance.NEUTRAL: 0.9,
+    MemeStance.REINFORCING: 1.0
+}
+
+# Stable integer codes for MemeStance, used by the vectorized fitness kernel
+STANCES: List[MemeStance] = list(MemeStance)
+STANCE_CODES: Dict[MemeStance, int] = {stance: code for code, stance in enumerate(STANCES)}
+STANCE_MULTIPLIER_TABLE = np.array([STANCE_MULTIPLIERS[stance] for stance in STANCES])
+
+# Mock synonym table used by Meme.mutate for first-word replacement
+SYNONYMS: Dict[str, List[str]] = {
+    "world": ["reality", "planet", "universe"],
+    "simulation": ["construct", "fabrication", "dream"],
+    "the": ["this", "that", "our"],
+    "is": ["are", "was", "seems"]
+}
+DEFAULT_LEXICON = Lexicon(SYNONYMS)
+
+
+def default_mutations() -> MutationPipeline:
+    """Return the pipeline pools use when none is given: first-word synonym
+    substitution from ``SYNONYMS``, matching ``Meme.mutate``."""
+    return MutationPipeline([SynonymSubstitution(DEFAULT_LEXICON, first_word_only=True)])
+
+
+def fitness_kernel(initial_fitness: np.ndarray, stance_codes: np.ndarray, engagement: Any = 1.0) -> np.ndarray:
+    """Vectorized equivalent of Meme.get_fitness for many memes at once.
+
+    Args:
+        initial_fitness (np.ndarray): Base fitness scores
+        stance_codes (np.ndarray): Stance codes (index into ``STANCES``)
+        engagement (float or np.ndarray): Scalar or per-meme engagement factor
+
+    Returns:
+        np.ndarray: Fitness scores (0.0 to 1.0)
+    """
+    return np.minimum(1.0, initial_fitness * STANCE_MULTIPLIER_TABLE[stance_codes] * engagement)
+
+
 @dataclass
 class Meme:
     """A unit of cultural transmission, modeled after Dawkins' concept of a meme.
 
     Attributes:
-        id (str): Unique identifier for the meme
+        id (str): Unique identifier for the meme. Memes created by a MemePool
+            keep a compact lineage handle instead and render this string on access.
         content (str): The textual or symbolic content
         mutation_rate (float): Probability of mutation per generation (0.0 to 1.0)
         initial_fitness (float): Base fitness score (0.0 to 1.0)
@@ -58,48 +122,50 @@ class Meme:
         if self.created_at is None:
             self.created_at = datetime.now()
 
-    def mutate(self) -> 'Meme':
+    def mutate(self, rng: Optional[np.random.Generator] = None) -> 'Meme':
         """Apply a random mutation to the meme content.
 
+        Args:
+            rng (np.random.Generator, optional): Generator to draw from
+                (default: the global ``random`` module)
+
         Returns:
             Meme: A new meme instance with mutated content.
         """
-        if random.random() < self.mutation_rate:
-            # Simple mutation: replace first word with a synonym
-            words = self.content.split()
-            if len(words) > 0:
-                # Mock synonym replacement
-                synonyms = {
-                    "world": ["reality", "planet", "universe"],
-                    "simulation": ["construct", "fabrication", "dream"],
-                    "the": ["this", "that", "our"],
-                    "is": ["are", "was", "seems"]
-                }
-                word = words[0]
-                if word.lower() in synonyms:
-                    new_word = random.choice(synonyms[word.lower()])
-                    words[0] = new_word
-                    new_content = " ".join(words)
-                    logger.info(f"Meme {self.id} mutated: '{self.content}' -> '{new_content}'")
-                    return Meme(
-                        id=f"{self.id}-mutated-{random.randint(1000, 9999)}",
-                        content=new_content,
-                        mutation_rate=self.mutation_rate,
-                        initial_fitness=self.initial_fitness,
-                        stance=self.stance,
-                        version=self.version + 1,
-                        created_at=self.created_at
-                    )
+        if rng is None:
+            if random.random() < self.mutation_rate:
+                return self._rewrite(random.random())
+        elif rng.random() < self.mutation_rate:
+            return self._rewrite(rng.random(), rng)
         return self  # No mutation
 
-    def replicate(self) -> 'Meme':
+    def replicate(self, rng: Optional[np.random.Generator] = None) -> 'Meme':
         """Create a faithful copy of this meme (for propagation).
 
+        Args:
+            rng (np.random.Generator, optional): Generator to draw from
+                (default: the global ``random`` module)
+
         Returns:
             Meme: A new meme with same attributes, except a new ID.
         """
+        return self._copy(rng)
+
+    def _child_id(self, kind: int, rng: Optional[np.random.Generator] = None) -> Union[str, MemeId]:
+        """Return the ID for a meme derived from this one.
+
+        Memes with a MemeId allocate from their lineage table; plain string
+        IDs get the legacy ``<id>-<kind>-<random tag>`` form.
+        """
+        if self._handle is not None:
+            return self._handle.child(kind)
+        tag = random.randint(1000, 9999) if rng is None else int(rng.integers(1000, 10000))
+        return f"{self.id}-{KIND_SUFFIX[kind]}-{tag}"
+
+    def _copy(self, rng: Optional[np.random.Generator] = None) -> 'Meme':
+        """Return a replica of this meme with a new child ID."""
         return Meme(
-            id=f"{self.id}-copy-{random.randint(1000, 9999)}",
+            id=self._child_id(KIND_COPY, rng),
             content=self.content,
             mutation_rate=self.mutation_rate,
             initial_fitness=self.initial_fitness,
@@ -108,6 +174,32 @@ class Meme:
             created_at=self.created_at
         )
 
+    def _rewrite(self, pick: float, rng: Optional[np.random.Generator] = None) -> 'Meme':
+        """Replace the first word with a synonym chosen by ``pick`` in [0, 1).
+
+        Returns ``self`` when the first word has no synonyms or the text would
+        not change.
+        """
+        # Simple mutation: replace first word with a synonym
+        words = self.content.split()
+        choices = DEFAULT_LEXICON.synonyms(words[0]) if words else ()
+        if not choices:
+            return self
+        words[0] = choices[int(pick * len(choices))]
+        new_content = " ".join(words)
+        if new_content == self.content:
+            return self
+        logger.debug("Meme %s mutated: %r -> %r", self.id, self.content, new_content)
+        return Meme(
+            id=self._child_id(KIND_MUTATED, rng),
+            content=new_content,
+            mutation_rate=self.mutation_rate,
+            initial_fitness=self.initial_fitness,
+            stance=self.stance,
+            version=self.version + 1,
+            created_at=self.created_at
+        )
+
     def get_fitness(self, engagement: float = 1.0) -> float:
         """Calculate current fitness score based on initial fitness and external factors.
 
@@ -119,14 +211,7 @@ class Meme:
         """
         base = self.initial_fitness
         # Apply stance multiplier
-        stance_multiplier = {
-            MemeStance.SUPPORTIVE: 1.3,
-            MemeStance.IRONIC: 1.1,
-            MemeStance.SUBVERSIVE: 1.2,
-            MemeStance.PARODIC: 1.5,
-            MemeStance.NEUTRAL: 0.9,
-            MemeStance.REINFORCING: 1.0
-        }.get(self.stance, 1.0)
+        stance_multiplier = STANCE_MULTIPLIERS.get(self.stance, 1.0)
         return min(1.0, base * stance_multiplier * engagement)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -136,7 +221,7 @@ class Meme:
             Dict: Serialized representation
         """
         return {
-            "id": self.id,
+            "id": str(self.id),
             "content": self.content,
             "mutation_rate": self.mutation_rate,
             "initial_fitness": self.initial_fitness,
@@ -166,24 +251,94 @@ class Meme:
         )
 
 
+def _get_meme_id(meme: Meme) -> str:
+    handle = meme._handle
+    return meme._id if handle is None else str(handle)
+
+
+def _set_meme_id(meme: Meme, value: Union[str, MemeId]) -> None:
+    # Pools pass a lineage handle; assigning a string detaches the meme from it
+    if isinstance(value, MemeId):
+        meme._id, meme._handle = None, value
+    else:
+        meme._id, meme._handle = value, None
+
+
+# Installed after @dataclass so the generated __init__, __eq__ and __repr__ go through it
+Meme.id = property(_get_meme_id, _set_meme_id, doc="Unique identifier for the meme (str).")
+
+
 class MemePool:
     """A population of memes that evolve over generations.
 
     Manages replication, mutation, selection, and fitness tracking.
+
+    Args:
+        seed (SeedLike, optional): Seed or numpy Generator for reproducible evolution
+        mutations (MutationPipeline, optional): Operators applied to offspring
+            selected for mutation (default: ``default_mutations()``)
+
+    Attributes:
+        telemetry (GenerationTelemetry): Per-generation summary logging
+        profiler (Profiler or None): Set to a Profiler to time evolve phases
     """
 
-    def __init__(self):
+    def __init__(self, seed: SeedLike = None, mutations: Optional[MutationPipeline] = None):
         self.memes: List[Meme] = []
         self.generation: int = 0
+        self.rng = make_rng(seed)
+        self.lineage = Lineage()
+        self.contents = ContentStore()
+        self.mutations = mutations if mutations is not None else default_mutations()
+        self.telemetry = GenerationTelemetry(logger)
+        self.profiler: Optional[Profiler] = None
+
+    def _track(self, meme: Meme) -> None:
+        """Give ``meme`` a root handle in this pool's lineage table, if it has none.
+
+        The handle is private to the meme and renders the same ``meme.id``.
+        """
+        if self.uid_of(meme) is None:
+            meme._handle = self.lineage.handle(self.lineage.add_root(meme.id))
+
+    def uid_of(self, meme: Meme) -> Optional[int]:
+        """Return the integer ID of ``meme`` in this pool's lineage table.
+
+        Args:
+            meme (Meme): A meme
+
+        Returns:
+            int or None: The ID, or None if the meme is not tracked by this pool
+        """
+        handle = meme._handle
+        return handle.uid if handle is not None and handle.lineage is self.lineage else None
 
     def add_meme(self, meme: Meme) -> None:
         """Add a meme to the pool.
 
+        The pool keeps ``meme`` itself rather than a copy and records it as a
+        lineage root; ``meme.id`` and ``meme.content`` are left unchanged.
+
         Args:
             meme (Meme): The meme to add
         """
+        self._track(meme)
         self.memes.append(meme)
-        logger.info(f"Added meme {meme.id} to pool")
+        logger.debug("Added meme %s to pool", meme.id)
+
+    def fitness_vector(self, engagement: Any = 1.0) -> np.ndarray:
+        """Compute the fitness of every meme in the pool in one pass.
+
+        Args:
+            engagement (float or np.ndarray): Scalar or per-meme engagement factor
+
+        Returns:
+            np.ndarray: Fitness scores, in the same order as ``self.memes``
+        """
+        count = len(self.memes)
+        initial = np.fromiter((m.initial_fitness for m in self.memes), dtype=np.float64, count=count)
+        codes = np.fromiter((STANCE_CODES[m.stance] for m in self.memes), dtype=np.int8, count=count)
+        return fitness_kernel(initial, codes, engagement)
 
     def evolve(self, selection_pressure: float = 0.5) -> None:
         """Simulate one generation of evolution.
@@ -191,27 +346,83 @@ class MemePool:
         Args:
             selection_pressure (float): Proportion of memes to retain (0.0 to 1.0)
         """
-        logger.info(f"Starting generation {self.generation + 1}")
+        start = time.perf_counter()
         self.generation += 1
+        population = len(self.memes)
+        probe = NULL_PROBE if self.profiler is None else self.profiler.begin(self.generation, population)
 
-        # Sort by fitness (descending)
-        ranked = sorted(self.memes, key=lambda m: m.get_fitness(), reverse=True)
+        # Sort by fitness (descending); the stable sort keeps ties in pool order
+        order = np.argsort(-self.fitness_vector(), kind="stable")
+        ranked = [self.memes[i] for i in order]
         
         # Apply selection pressure
         keep_count = int(len(ranked) * selection_pressure)
         survivors = ranked[:keep_count]
+        probe.mark("rank")
         
-        # Generate new offspring from survivors
-        offspring = []
+        count = 2 * len(survivors)  # Each meme produces 2 offspring
         for meme in survivors:
-            for _ in range(2):  # Each meme produces 2 offspring
-                replicated = meme.replicate()
-                mutated = replicated.mutate()
-                offspring.append(mutated)
+            self._track(meme)
+
+        # Generate new offspring from survivors, then mutate them as one batch
+        offspring = [survivors[i // 2]._copy() for i in range(count)]
+        probe.mark("replicate")
+        rates = np.fromiter((m.mutation_rate for m in offspring), dtype=np.float64, count=count)
+        counts: Dict[str, int] = {}
+        mutated = self._mutate(offspring, np.flatnonzero(self.rng.random(count) < rates), counts)
+        probe.mark("mutate")
 
         # Replace current pool
         self.memes = survivors + offspring
-        logger.info(f"Generation {self.generation} complete: {len(self.memes)} memes")
+        if self.contents.needs_compaction(len(self.memes)):
+            self.contents.compact(self.contents.intern(m.content) for m in self.memes)
+        probe.mark("replace")
+        probe.finish(keep_count, count, mutated)
+        self.telemetry.emit(GenerationEvent(
+            generation=self.generation, population=population, survivors=keep_count,
+            offspring=count, mutated=mutated, mutations=counts, duration=time.perf_counter() - start
+        ))
+
+    def _mutate(self, offspring: List[Meme], rows: np.ndarray, counts: Dict[str, int]) -> int:
+        """Run the mutation pipeline over ``offspring[rows]``, replacing changed memes.
+
+        Returns the number of memes that changed; ``counts`` collects per-operator totals.
+        """
+        if len(rows) == 0:
+            return 0
+        selected = [offspring[i] for i in rows]
+        count = len(selected)
+        batch = MutationBatch(
+            content=np.fromiter((self.contents.intern(m.content) for m in selected), dtype=np.int64, count=count),
+            stance_codes=np.fromiter((STANCE_CODES[m.stance] for m in selected), dtype=np.int8, count=count),
+            initial_fitness=np.fromiter((m.initial_fitness for m in selected), dtype=np.float64, count=count),
+            n_stances=len(STANCES)
+        )
+        changed = np.flatnonzero(self.mutations.apply(batch, self.rng, self.contents, counts)).tolist()
+        for k in self.telemetry.debug_sample(len(changed)):
+            j = changed[k]
+            logger.debug("Meme %s mutated: %r -> %r", selected[j].id, selected[j].content,
+                         self.contents[int(batch.content[j])])
+        for j in changed:
+            meme = selected[j]
+            offspring[rows[j]] = Meme(
+                id=meme._child_id(KIND_MUTATED),
+                content=self.contents[int(batch.content[j])],
+                mutation_rate=meme.mutation_rate,
+                initial_fitness=float(batch.initial_fitness[j]),
+                stance=STANCES[batch.stance_codes[j]],
+                version=meme.version + 1,
+                created_at=meme.created_at
+            )
+        return len(changed)
+
+    def content_stats(self) -> Dict[str, float]:
+        """Report how many memes share each distinct content string.
+
+        Returns:
+            Dict[str, float]: See ``ContentStore.dedup_stats``
+        """
+        return self.contents.dedup_stats(self.contents.intern(m.content) for m in self.memes)
 
     def get_top_meme(self) -> Optional[Meme]:
         """Return the most fit meme in the pool.
@@ -221,7 +432,7 @@ class MemePool:
         """
         if not self.memes:
             return None
-        return max(self.memes, key=lambda m: m.get_fitness())
+        return self.memes[int(np.argmax(self.fitness_vector()))]
 
     def save_to_json(self, path: str) -> None:
         """Save current pool state to JSON.
@@ -232,7 +443,7 @@ class MemePool:
         data = [meme.to_dict() for meme in self.memes]
         with open(path, 'w') as f:
             json.dump(data, f, indent=2)
-        logger.info(f"Pool saved to {path}")
+        logger.info("Pool saved to %s", path)
 
     def load_from_json(self, path: str) -> None:
         """Load pool state from JSON.
@@ -243,7 +454,91 @@ class MemePool:
         with open(path, 'r') as f:
             data = json.load(f)
         self.memes = [Meme.from_dict(d) for d in data]
-        logger.info(f"Pool loaded from {path}")
+        logger.info("Pool loaded from %s", path)
+
+    def save_to_jsonl(self, path: str, append: bool = False) -> None:
+        """Stream the current pool to a JSON Lines file, one meme per line.
+
+        Each line is ``Meme.to_dict()`` plus the pool's ``generation`` and,
+        for memes tracked by the pool, their integer ``uid``. The lineage
+        table is saved alongside as ``<path>.lineage.npz``. Paths ending in
+        ``.gz`` or ``.zst`` are compressed.
+
+        Args:
+            path (str): File path to save
+            append (bool): Append to the file instead of overwriting it
+        """
+        generation = self.generation
+        count = write_jsonl(path, (self._record(meme, generation) for meme in self.memes), append=append)
+        self.lineage.save(path + LINEAGE_SUFFIX)
+        logger.info("Pool generation %s saved to %s (%s memes)", generation, path, count)
+
+    def _record(self, meme: Meme, generation: int) -> Dict[str, Any]:
+        """Serialize ``meme`` for a JSON Lines checkpoint."""
+        record = meme.to_dict()
+        record["generation"] = generation
+        uid = self.uid_of(meme)
+        if uid is not None:
+            record["uid"] = uid
+        return record
+
+    def checkpoint(self, path: str) -> None:
+        """Append the current generation to an incremental JSON Lines checkpoint.
+
+        Args:
+            path (str): Checkpoint file path
+        """
+        self.save_to_jsonl(path, append=True)
+
+    @staticmethod
+    def iter_jsonl(path: str, generation: Optional[int] = None) -> Iterator[Meme]:
+        """Lazily read memes from a JSON Lines file written by ``save_to_jsonl``.
+
+        Args:
+            path (str): File path to read
+            generation (int, optional): Only yield memes saved at this generation
+
+        Yields:
+            Meme: One meme at a time
+        """
+        for record in iter_jsonl(path):
+            if generation is None or record.get("generation", 0) == generation:
+                yield Meme.from_dict(record)
+
+    def load_from_jsonl(self, path: str, generation: Optional[int] = None) -> None:
+        """Resume the pool from a JSON Lines file or incremental checkpoint.
+
+        The file is streamed once; only the memes of the generation being
+        loaded are kept in memory. If a lineage table was saved alongside,
+        it is restored and memes get their ID handles back.
+
+        Args:
+            path (str): File path to load from
+            generation (int, optional): Generation to restore (default: the last one)
+        """
+        lineage = Lineage.load(path + LINEAGE_SUFFIX) if os.path.exists(path + LINEAGE_SUFFIX) else None
+        memes: List[Meme] = []
+        loaded = None
+        for record in iter_jsonl(path):
+            record_generation = record.get("generation", 0)
+            if generation is not None and record_generation != generation:
+                continue
+            if record_generation != loaded:
+                # A new generation begins; drop the previous one
+                memes = []
+                loaded = record_generation
+            meme = Meme.from_dict(record)
+            if lineage is not None and "uid" in record:
+                meme.id = lineage.handle(record["uid"])
+            memes.append(meme)
+        if loaded is None:
+            raise ValueError(f"No memes found in {path}" +
+                             (f" for generation {generation}" if generation is not None else ""))
+        self.memes = memes
+        self.generation = loaded
+        if lineage is not None:
+            self.lineage = lineage
+        logger.info("Pool generation %s loaded from %s", loaded, path)
 
     def save_to_csv(self, path: str) -> None:
         """Save meme data to CSV.
@@ -259,29 +554,68 @@ class MemePool:
             writer.writeheader()
             for meme in self.memes:
                 writer.writerow(meme.to_dict())
-        logger.info(f"Pool saved to {path}")
+        logger.info("Pool saved to %s", path)
 
 
 class StanceAnalyzer:
     """Tracks the stance an addresser takes toward a meme instance.
 
     This implements Shifman’s concept of *stance* as distinct from content or form.
+
+    Stances are counted, not stored: each meme has a fixed-size integer
+    array of counts indexed by ``STANCE_CODES`` and global totals are updated
+    on every ``add_stance``, so distributions are O(1) in the number of
+    events. With a ``rollup``, counts are also bucketed by time for windowed
+    trends. A StanceTrends rollup also buckets them per meme, for
+    sliding-window and stance-shift queries, so one store serves both.
+
+    Args:
+        rollup (StanceRollup or StanceTrends, optional): Time-bucketed counts
     """
 
-    def __init__(self):
-        self.stance_history: Dict[str, List[str]] = {}  # meme_id -> list of stances
+    def __init__(self, rollup: Optional[Union[StanceRollup, StanceTrends]] = None):
+        self.rollup = rollup
+        self._counts: Dict[str, array] = {}  # meme_id -> count per stance code
+        self._totals = array('q', bytes(8 * len(STANCES)))
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Count per stance code across all memes."""
+        return np.array(self._totals, dtype=np.int64)
 
-    def add_stance(self, meme_id: str, stance: MemeStance) -> None:
+    def add_stance(self, meme_id: str, stance: MemeStance, timestamp: Optional[float] = None) -> None:
         """Record a stance taken toward a specific meme.
 
         Args:
             meme_id (str): ID of the meme
             stance (MemeStance): The stance taken
+            timestamp (float, optional): Event time in seconds for the rollup
+                (default: its clock)
         """
-        if meme_id not in self.stance_history:
-            self.stance_history[meme_id] = []
-        self.stance_history[meme_id].append(stance.value)
-        logger.info(f"Recorded stance '{stance.value}' for meme {meme_id}")
+        code = STANCE_CODES[stance]
+        counts = self._counts.get(meme_id)
+        if counts is None:
+            counts = self._counts[meme_id] = array('q', bytes(8 * len(STANCES)))
+        counts[code] += 1
+        self._totals[code] += 1
+        rollup = self.rollup
+        if isinstance(rollup, StanceTrends):
+            rollup.add(meme_id, code, timestamp)
+        elif rollup is not None:
+            rollup.add(code, timestamp)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Recorded stance '%s' for meme %s", stance.value, meme_id)
+
+    @staticmethod
+    def _as_dict(counts) -> Dict[str, int]:
+        return {stance.value: int(count) for stance, count in zip(STANCES, counts) if count}
+
+    def stance_counts(self, meme_id: str) -> np.ndarray:
+        """Return the count per stance code for a meme (zeros if unseen)."""
+        counts = self._counts.get(meme_id)
+        if counts is None:
+            return np.zeros(len(STANCES), dtype=np.int64)
+        return np.array(counts, dtype=np.int64)
 
     def get_stance_distribution(self, meme_id: str) -> Dict[str, int]:
         """Get frequency of stances for a given meme.
@@ -292,22 +626,75 @@ class StanceAnalyzer:
         Returns:
             Dict[str, int]: Count of each stance
         """
-        if meme_id not in self.stance_history:
+        counts = self._counts.get(meme_id)
+        if counts is None:
             return {}
-        from collections import Counter
-        return dict(Counter(self.stance_history[meme_id]))
+        return self._as_dict(counts)
 
-    def get_overall_stance_trend(self) -> Dict[str, int]:
+    def get_overall_stance_trend(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, int]:
         """Get the overall distribution of stances across all memes.
 
+        Args:
+            start (float, optional): Only count rollup buckets starting at or after this time
+            end (float, optional): Only count rollup buckets starting before this time
+
         Returns:
             Dict[str, int]: Count of each stance across all memes
         """
-        all_stances = []
-        for meme_id in self.stance_history:
-            all_stances.extend(self.stance_history[meme_id])
-        from collections import Counter
-        return dict(Counter(all_stances))
+        if start is None and end is None:
+            return self._as_dict(self._totals)
+        if self.rollup is None:
+            raise ValueError("Windowed trends require a StanceRollup")
+        return self._as_dict(self.rollup.counts(start, end))
+
+    def _require_trends(self) -> StanceTrends:
+        if not isinstance(self.rollup, StanceTrends):
+            raise ValueError("Windowed per-meme queries require a StanceTrends rollup")
+        return self.rollup
+
+    def get_recent_stance_distribution(self, seconds: float, meme_id: Optional[str] = None,
+                                       now: Optional[float] = None) -> Dict[str, int]:
+        """Get the stance mix over the last ``seconds``, for one meme or all of them.
+
+        Args:
+            seconds (float): Sliding window width, e.g. 3600 for the last hour
+            meme_id (str, optional): ID of the meme (default: all memes)
+            now (float, optional): End of the window (default: the rollup clock)
+
+        Returns:
+            Dict[str, int]: Count of each stance in the window
+        """
+        return self._as_dict(self._require_trends().sliding(seconds, meme_id, now))
+
+    def get_top_stance_shifts(self, k: int, seconds: float, now: Optional[float] = None,
+                              stance: Optional[MemeStance] = None) -> List[Tuple[str, float]]:
+        """Get the ``k`` memes whose stance mix changed most between the last two windows.
+
+        Args:
+            k (int): Number of memes
+            seconds (float): Width of each window
+            now (float, optional): End of the recent window (default: the rollup clock)
+            stance (MemeStance, optional): Rank by the rise in this stance's share
+                instead of the total variation distance
+
+        Returns:
+            List[Tuple[str, float]]: ``(meme_id, shift)`` pairs, largest first
+        """
+        code = None if stance is None else STANCE_CODES[stance]
+        return self._require_trends().top_shifts(k, seconds, now, code)
+
+    @property
+    def stance_history(self) -> 'MappingProxyType[str, Tuple[str, ...]]':
+        """Stances per meme as tuples of values, grouped by stance in ``STANCES`` order.
+
+        A read-only snapshot derived from the counters: the original event
+        order is not kept, and it cannot be appended to or assigned; record
+        stances with ``add_stance``.
+        """
+        return MappingProxyType({
+            meme_id: tuple(stance.value for stance, count in zip(STANCES, counts) for _ in range(count))
+            for meme_id, counts in self._counts.items()
+        })
 
     def export_stance_log(self, path: str) -> None:
         """Export stance history to JSON.
@@ -316,8 +703,43 @@ class StanceAnalyzer:
             path (str): File path to save
         """
         with open(path, 'w') as f:
-            json.dump(self.stance_history, f, indent=2)
-        logger.info(f"Stance log exported to {path}")
+            json.dump(dict(self.stance_history), f, indent=2)
+        logger.info("Stance log exported to %s", path)
+
+    def export_stance_log_jsonl(self, path: str) -> None:
+        """Stream stance counts to a JSON Lines file, one meme per line.
+
+        Each record is ``{"meme_id": ..., "counts": {stance: count}}``.
+
+        Args:
+            path (str): File path to save (``.gz``/``.zst`` are compressed)
+        """
+        records = ({"meme_id": meme_id, "counts": self._as_dict(counts)}
+                   for meme_id, counts in self._counts.items())
+        write_jsonl(path, records)
+        logger.info("Stance log exported to %s", path)
+
+    def load_stance_log_jsonl(self, path: str) -> None:
+        """Merge a stance log written by ``export_stance_log_jsonl``.
+
+        Records with a ``stances`` list, as written by earlier versions, are
+        also accepted. Loaded stances are not added to the rollup.
+
+        Args:
+            path (str): File path to load from
+        """
+        for record in iter_jsonl(path):
+            counts = self._counts.setdefault(record["meme_id"], array('q', bytes(8 * len(STANCES))))
+            loaded = record.get("counts")
+            if loaded is None:
+                loaded = {}
+                for value in record["stances"]:
+                    loaded[value] = loaded.get(value, 0) + 1
+            for value, count in loaded.items():
+                code = STANCE_CODES[MemeStance(value)]
+                counts[code] += count
+                self._totals[code] += count
+        logger.info("Stance log loaded from %s", path)
 
 
 # Example usage
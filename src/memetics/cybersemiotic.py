@@ -1,5 +1,12 @@
 import json
-from typing import Dict, List, Any
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat, zip_longest
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 class CyberSemiotic:
     """Main class for the cybersemiotic framework.
@@ -7,10 +14,16 @@ class CyberSemiotic:
     This class manages memetic fields, meme complexes, and simulations.
     It provides methods for creating and managing meme complexes, analyzing stances,
     and running simulations.
+
+    Attributes:
+        memetic_fields (Dict[str, MemeticField]): Fields by name.
+        metrics (List[Dict[str, Any]]): Per-tick metrics of the last
+            ``run_simulation``, ordered by field and tick.
     """
 
     def __init__(self):
         self.memetic_fields: Dict[str, "MemeticField"] = {}
+        self.metrics: List[Dict[str, Any]] = []
 
     def create_memetic_field(self, name: str) -> "MemeticField":
         """Create a new memetic field.
@@ -41,13 +54,76 @@ class CyberSemiotic:
         field.add_meme_complex(meme_complex)
         return True
 
-    def run_simulation(self) -> str:
+    def run_simulation(self, ticks: Optional[int] = None, max_seconds: Optional[float] = None,
+                       config: Optional["SimulationConfig"] = None, seed: Optional[int] = None,
+                       workers: Optional[int] = 1,
+                       on_tick: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
         """Run a simulation of meme evolution.
 
+        Every tick advances each memetic field one step (see
+        ``FieldSimulation.step``). The run stops after ``ticks`` ticks or
+        ``max_seconds`` of wall time, whichever comes first; with neither,
+        it runs a single tick. Fields do not interact, so with ``workers``
+        other than 1 each field runs in its own process and the outcome is
+        copied back into the existing fields, complexes and meme dicts, just
+        as a serial run leaves them. Per-tick metrics
+        are stored in ``self.metrics``, ordered by field and tick.
+
+        ``on_tick`` sees the metrics tick by tick, each field in turn, in both
+        modes. A serial run calls it as every step finishes; a parallel run
+        calls it in the same order once every field has finished.
+
+        Args:
+            ticks (int, optional): Tick budget.
+            max_seconds (float, optional): Wall-time budget for the whole run,
+                measured on the monotonic clock.
+            config (SimulationConfig, optional): Dynamics parameters.
+            seed (int, optional): Seed for reproducible runs; each field gets
+                its own spawned stream.
+            workers (int, optional): Worker processes (None: one per CPU;
+                1: run in this process, interleaving fields tick by tick).
+            on_tick (Callable, optional): Called with each per-tick metrics dict.
+
         Returns:
             str: A message indicating the completion of the simulation.
         """
-        # Simulate meme evolution
+        if ticks is None and max_seconds is None:
+            ticks = 1
+        config = config or SimulationConfig()
+        # time.monotonic() is system-wide (CLOCK_MONOTONIC on Linux), so
+        # worker processes can compare it against the same deadline
+        deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        names = list(self.memetic_fields)
+        seeds = np.random.SeedSequence(seed).spawn(len(names))
+        self.metrics = []
+
+        if workers == 1 or len(names) <= 1:
+            runs = [FieldSimulation(self.memetic_fields[name], config, stream)
+                    for name, stream in zip(names, seeds)]
+            per_field: List[List[Dict[str, Any]]] = [[] for _ in runs]
+            tick = 0
+            while runs and (ticks is None or tick < ticks) and (deadline is None or time.monotonic() < deadline):
+                for run, metrics in zip(runs, per_field):
+                    metrics.append(run.step())
+                    if on_tick is not None:
+                        on_tick(metrics[-1])
+                tick += 1
+            for metrics in per_field:
+                self.metrics.extend(metrics)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_run_field, (self.memetic_fields[name] for name in names),
+                                       repeat(config), seeds, repeat(ticks), repeat(deadline))
+                per_field = []
+                for name, (outcome, metrics) in zip(names, results):
+                    _apply_outcome(self.memetic_fields[name], outcome)
+                    self.metrics.extend(metrics)
+                    per_field.append(metrics)
+            if on_tick is not None:
+                for records in zip_longest(*per_field):
+                    for record in records:
+                        if record is not None:
+                            on_tick(record)
         return "Simulation complete"
 
     def save(self, filepath: str) -> None:
@@ -69,6 +145,145 @@ class CyberSemiotic:
             data = json.load(f)
 
 
+@dataclass
+class SimulationConfig:
+    """Parameters of the memetic field dynamics.
+
+    Attributes:
+        drift (float): Standard deviation of the per-tick random fitness change.
+        competition (float): How strongly a complex's share of the field's
+            total fitness raises or lowers its memes' fitness each tick.
+        extinction (float): Memes whose fitness falls below this are removed.
+        merge_tolerance (float): Complexes whose mean fitness differs by at
+            most this much merge (at most one merge per field per tick).
+        max_fitness (float): Upper bound on meme fitness.
+    """
+
+    drift: float = 0.05
+    competition: float = 0.1
+    extinction: float = 0.1
+    merge_tolerance: float = 0.01
+    max_fitness: float = 2.0
+
+
+class FieldSimulation:
+    """Stepwise simulation of one memetic field.
+
+    Memes are the dicts held by each ``MemeComplex``; their ``fitness`` entry
+    (default 1.0) is the simulation state and is updated in place.
+
+    Args:
+        field (MemeticField): The field to evolve.
+        config (SimulationConfig): Dynamics parameters.
+        seed: Seed or ``SeedSequence`` for this field's random stream.
+    """
+
+    def __init__(self, field: "MemeticField", config: SimulationConfig, seed=None):
+        self.field = field
+        self.config = config
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+
+    def step(self) -> Dict[str, Any]:
+        """Advance the field one tick.
+
+        Each tick applies random drift to every meme's fitness, then
+        competition: a complex holding more than an equal share of the
+        field's total fitness gains, one holding less loses. Memes below the
+        extinction threshold die, complexes without memes leave the field,
+        and the closest pair of complexes by mean fitness merges if within
+        the tolerance.
+
+        Returns:
+            Dict[str, Any]: Metrics of the tick.
+        """
+        started = time.perf_counter()
+        config = self.config
+        complexes = self.field.meme_complexes
+        fitness = [np.fromiter((m.get("fitness", 1.0) for m in c.memes), dtype=np.float64, count=len(c.memes))
+                   for c in complexes]
+        strength = np.array([f.sum() for f in fitness])
+        total = strength.sum()
+        # Relative advantage of each complex, 0 for an equal share
+        advantage = strength / total * len(complexes) - 1.0 if total > 0 else np.zeros(len(complexes))
+
+        extinctions = 0
+        for complex_, values, gain in zip(complexes, fitness, advantage):
+            values = values + self.rng.normal(0.0, config.drift, size=len(values))
+            values = np.minimum(values * (1.0 + config.competition * gain), config.max_fitness)
+            alive = values >= config.extinction
+            extinctions += int(len(values) - alive.sum())
+            survivors = []
+            for meme, value, keep in zip(complex_.memes, values.tolist(), alive.tolist()):
+                if keep:
+                    meme["fitness"] = value
+                    survivors.append(meme)
+            complex_.memes = survivors
+        complexes[:] = [c for c in complexes if c.memes]
+
+        merges = 0
+        if len(complexes) > 1:
+            means = np.array([np.mean([m["fitness"] for m in c.memes]) for c in complexes])
+            order = np.argsort(means, kind="stable")
+            gaps = np.diff(means[order])
+            closest = int(np.argmin(gaps))
+            if gaps[closest] <= config.merge_tolerance:
+                a, b = sorted((int(order[closest]), int(order[closest + 1])),
+                              key=lambda i: -len(complexes[i].memes))
+                complexes[a].merge_with(complexes[b])
+                del complexes[b]
+                merges = 1
+
+        self.tick += 1
+        memes = sum(len(c.memes) for c in complexes)
+        return {
+            "field": self.field.name,
+            "tick": self.tick,
+            "complexes": len(complexes),
+            "memes": memes,
+            "mean_fitness": (sum(m["fitness"] for c in complexes for m in c.memes) / memes) if memes else 0.0,
+            "extinctions": extinctions,
+            "merges": merges,
+            "seconds": time.perf_counter() - started,
+        }
+
+
+def _run_field(field: "MemeticField", config: SimulationConfig, seed, ticks: Optional[int],
+               deadline: Optional[float]) -> Tuple[Tuple[list, list], List[Dict[str, Any]]]:
+    """Run one field until the tick budget is spent or ``time.monotonic()`` passes ``deadline`` (worker entry point).
+
+    Returns the outcome for ``_apply_outcome`` rather than the field, so the
+    caller can update its own objects: the final fitness of every meme the
+    field started with, and each remaining complex as its starting position
+    plus the starting ``(complex, meme)`` positions of its memes.
+    """
+    complexes = list(field.meme_complexes)
+    memes = [list(c.memes) for c in complexes]
+    run = FieldSimulation(field, config, seed)
+    metrics = []
+    while (ticks is None or run.tick < ticks) and (deadline is None or time.monotonic() < deadline):
+        metrics.append(run.step())
+    fitness = [[meme.get("fitness") for meme in group] for group in memes]
+    position = {id(meme): (c, m) for c, group in enumerate(memes) for m, meme in enumerate(group)}
+    index = {id(complex_): c for c, complex_ in enumerate(complexes)}
+    layout = [(index[id(c)], [position[id(meme)] for meme in c.memes]) for c in field.meme_complexes]
+    return (fitness, layout), metrics
+
+
+def _apply_outcome(field: "MemeticField", outcome: Tuple[list, list]) -> None:
+    """Apply the outcome of ``_run_field`` to the field it was computed from."""
+    fitness, layout = outcome
+    complexes = list(field.meme_complexes)
+    memes = [list(c.memes) for c in complexes]
+    for group, values in zip(memes, fitness):
+        for meme, value in zip(group, values):
+            if value is not None:
+                meme["fitness"] = value
+    for c, members in layout:
+        complexes[c].memes = [memes[i][m] for i, m in members]
+    field.meme_complexes[:] = [complexes[c] for c, _ in layout]
+
+
 class MemeticField:
     """Represents a domain where meme complexes interact and evolve.
 
@@ -126,36 +341,129 @@ class MemeComplex:
         return float(len(self.memes))
 
 
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Return a regex matching any of ``keywords``, preferring the longest.
+
+    Alternatives are nested by shared prefix (a trie), so the regex engine
+    branches on one character at a time instead of trying every keyword at
+    every position.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A keyword ends here; the greedy optional still prefers a longer one
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+# Default stance lexicons; earlier stances win ties in StanceAnalyzer
+DEFAULT_LEXICONS: Dict[str, Tuple[str, ...]] = {
+    "positive": ("benefit", "good", "positive", "help", "support"),
+    "negative": ("threat", "danger", "bad", "harm", "destroy"),
+}
+
+
 class StanceAnalyzer:
     """Analyzes the stance of a given text.
 
-    This class uses a simple heuristic to determine whether a piece of text
-    expresses a positive, negative, or neutral stance toward a given topic.
+    All keywords of all lexicons are compiled into one prefix-trie regular
+    expression, so each text is scanned once regardless of vocabulary size. Keywords match
+    as case-insensitive substrings ("danger" matches "dangerous"). As in the
+    original positive/negative check, the first lexicon with any hit gives
+    the stance, whatever the other lexicons count, and a text without hits
+    is neutral.
+
+    Scores are derived from hit density (hits per word): at ``full_density``
+    or above all weight goes to the hit stances, split by their share of hits;
+    below it the remainder is neutral. The confidence is the chosen
+    stance's score.
+
+    Args:
+        lexicons (Dict[str, Iterable[str]], optional): Stance name to keywords
+            (default: ``DEFAULT_LEXICONS``), in priority order; a keyword
+            listed under several stances counts for the first. ``neutral`` is
+            reserved for texts without hits.
+        full_density (float): Hits per word at which the neutral score reaches 0
     """
 
-    def __init__(self):
-        self.positive_keywords = ["benefit", "good", "positive", "help", "support"]
-        self.negative_keywords = ["threat", "danger", "bad", "harm", "destroy"]
-
-    def analyze(self, text: str) -> Dict[str, str]:
+    def __init__(self, lexicons: Optional[Dict[str, Iterable[str]]] = None, full_density: float = 0.05):
+        if full_density <= 0:
+            raise ValueError("full_density must be positive")
+        lexicons = DEFAULT_LEXICONS if lexicons is None else lexicons
+        if "neutral" in lexicons:
+            raise ValueError("'neutral' is reserved for texts without hits")
+        self.lexicons: Dict[str, Tuple[str, ...]] = {
+            stance: tuple(k.lower() for k in keywords) for stance, keywords in lexicons.items()
+        }
+        self.full_density = full_density
+        self._stance_of: Dict[str, str] = {}
+        for stance, keywords in self.lexicons.items():
+            for keyword in keywords:
+                if keyword:
+                    self._stance_of.setdefault(keyword, stance)
+        self._pattern = re.compile(_trie_pattern(self._stance_of)) if self._stance_of else None
+
+    @property
+    def positive_keywords(self) -> Tuple[str, ...]:
+        return self.lexicons.get("positive", ())
+
+    @property
+    def negative_keywords(self) -> Tuple[str, ...]:
+        return self.lexicons.get("negative", ())
+
+    def analyze(self, text: str) -> Dict[str, Any]:
         """Analyze the stance of the given text.
 
         Args:
             text (str): The text to analyze.
 
         Returns:
-            Dict[str, str]: A dictionary containing the stance (positive, negative, neutral)
-                            and the detected stance.
+            Dict[str, Any]: The ``stance``, its ``confidence`` in [0, 1], the
+                ``hits`` per lexicon stance, and ``scores``, a score per stance
+                (including ``neutral``) that sum to 1.
         """
         text_lower = text.lower()
-        
-        # Check for positive keywords
-        if any(keyword in text_lower for keyword in self.positive_keywords):
-            return {"stance": "positive", "confidence": "high"}
-        
-        # Check for negative keywords
-        if any(keyword in text_lower for keyword in self.negative_keywords):
-            return {"stance": "negative", "confidence": "high"}
-        
-        # Default to neutral
-        return {"stance": "neutral", "confidence": "medium"}
\ No newline at end of file
+        hits = dict.fromkeys(self.lexicons, 0)
+        if self._pattern is not None:
+            stance_of = self._stance_of
+            for keyword in self._pattern.findall(text_lower):
+                hits[stance_of[keyword]] += 1
+        total = sum(hits.values())
+
+        scores = dict.fromkeys(self.lexicons, 0.0)
+        if not total:
+            scores["neutral"] = 1.0
+            return {"stance": "neutral", "confidence": 1.0, "hits": hits, "scores": scores}
+
+        density = total / max(1, len(text_lower.split()))
+        polar = min(1.0, density / self.full_density)
+        for stance, count in hits.items():
+            scores[stance] = polar * count / total
+        scores["neutral"] = 1.0 - polar
+        stance = next(stance for stance, count in hits.items() if count)
+        return {"stance": stance, "confidence": scores[stance], "hits": hits, "scores": scores}
+
+    def analyze_many(self, texts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Analyze texts lazily, one result per text in input order.
+
+        Args:
+            texts (Iterable[str]): Texts to analyze, e.g. a file or generator
+
+        Yields:
+            Dict[str, Any]: The ``analyze`` result of each text
+        """
+        analyze = self.analyze
+        for text in texts:
+            yield analyze(text)
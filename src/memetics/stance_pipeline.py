@@ -0,0 +1,349 @@
+'''
+stance_pipeline.py: Streaming, multiprocess stance analysis of large corpora
+
+Texts are read lazily from JSON Lines, CSV or plain text files (one text per
+line) with buffered chunked reads, grouped into batches and analyzed by a
+process pool. Each worker builds its StanceAnalyzer once, at startup, from the
+lexicons it is given. JSON Lines and plain text lines are decoded in the
+workers, so the reading process only splits lines. At most ``max_pending``
+batches are in flight: the reader waits for the oldest batch before reading
+more, which bounds memory and keeps results in input order. Results stream to
+a JSON Lines or Parquet sink while PipelineStats tracks progress and
+throughput.
+
+Command line:
+
+    python src/memetics/stance_pipeline.py corpus.jsonl stances.parquet --workers 8
+
+Parquet output requires the optional ``pyarrow`` package.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    from .cybersemiotic import StanceAnalyzer
+except ImportError:  # run as a script, or with src/memetics on sys.path
+    from cybersemiotic import StanceAnalyzer
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv", "text")
+
+# Read buffer size for input files
+CHUNK_BYTES = 1 << 20
+
+# Worker state, set once per process by _init_worker
+_ANALYZER: Optional[StanceAnalyzer] = None
+_DECODE: Optional[Callable[[str], str]] = None
+
+
+def detect_format(path: str) -> str:
+    """Infer the input format from the file suffix ('text' if unknown)."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    return "text"
+
+
+def read_items(path: str, fmt: Optional[str] = None, field: str = "text") -> Iterator[str]:
+    """Lazily read the items to analyze from a corpus file.
+
+    Items are raw lines for 'jsonl' and 'text' (decoded by ``decoder``) and
+    the ``field`` column for 'csv', whose quoted fields may span lines.
+    Blank lines are skipped.
+
+    Args:
+        path (str): Input file
+        fmt (str, optional): One of ``FORMATS`` (default: from the suffix)
+        field (str): CSV column holding the text
+
+    Yields:
+        str: One item per text
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    with open(path, "r", encoding="utf-8", newline="" if fmt == "csv" else None, buffering=CHUNK_BYTES) as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield row[field]
+        else:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def decoder(fmt: str, field: str = "text") -> Callable[[str], str]:
+    """Return the function that turns an item of ``read_items`` into its text."""
+    if fmt == "jsonl":
+        return lambda line: json.loads(line)[field]
+    if fmt == "text":
+        return lambda line: line.rstrip("\r\n")
+    return lambda text: text
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group ``items`` into lists of ``size`` (the last one may be shorter)."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _init_worker(lexicons: Optional[Dict[str, Sequence[str]]], full_density: float, fmt: str, field: str) -> None:
+    global _ANALYZER, _DECODE
+    _ANALYZER = StanceAnalyzer(lexicons, full_density)
+    _DECODE = decoder(fmt, field)
+
+
+def _analyze_batch(items: List[str]) -> List[Dict[str, Any]]:
+    analyze, decode = _ANALYZER.analyze, _DECODE
+    return [analyze(decode(item)) for item in items]
+
+
+@dataclass
+class PipelineStats:
+    """Progress of a pipeline run.
+
+    Attributes:
+        texts (int): Texts analyzed so far
+        batches (int): Batches completed so far
+        started (float): ``time.perf_counter()`` at the start of the run
+    """
+
+    texts: int = 0
+    batches: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the start of the run."""
+        return time.perf_counter() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Texts per second."""
+        elapsed = self.elapsed
+        return self.texts / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"texts": self.texts, "batches": self.batches, "elapsed": self.elapsed,
+                "throughput": self.throughput}
+
+
+def analyze_stream(items: Iterable[str], fmt: str = "text", field: str = "text",
+                   lexicons: Optional[Dict[str, Sequence[str]]] = None, full_density: float = 0.05,
+                   workers: Optional[int] = None, batch_size: int = 1000, max_pending: Optional[int] = None,
+                   stats: Optional[PipelineStats] = None,
+                   on_progress: Optional[Callable[[PipelineStats], None]] = None) -> Iterator[Dict[str, Any]]:
+    """Analyze items across a process pool, yielding results in input order.
+
+    Args:
+        items (Iterable[str]): Items as produced by ``read_items``, or plain texts with fmt='text'
+        fmt (str): Input format, which selects how workers decode items
+        field (str): JSON field holding the text, for fmt='jsonl'
+        lexicons (Dict[str, Sequence[str]], optional): Passed to ``StanceAnalyzer``
+        full_density (float): Passed to ``StanceAnalyzer``
+        workers (int, optional): Worker processes (default: one per CPU); 1
+            analyzes in this process
+        batch_size (int): Items per task sent to a worker
+        max_pending (int, optional): Batches in flight (default: twice the workers)
+        stats (PipelineStats, optional): Updated after every batch
+        on_progress (Callable, optional): Called with ``stats`` after every batch
+
+    Yields:
+        Dict[str, Any]: ``StanceAnalyzer.analyze`` results
+    """
+    stats = stats if stats is not None else PipelineStats()
+    batches = batched(items, batch_size)
+
+    def done(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stats.texts += len(results)
+        stats.batches += 1
+        if on_progress is not None:
+            on_progress(stats)
+        return results
+
+    if workers == 1:
+        _init_worker(lexicons, full_density, fmt, field)
+        for batch in batches:
+            yield from done(_analyze_batch(batch))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lexicons, full_density, fmt, field)) as executor:
+        pending: deque = deque()
+        for batch in batches:
+            if len(pending) >= max_pending:
+                yield from done(pending.popleft().result())
+            pending.append(executor.submit(_analyze_batch, batch))
+        while pending:
+            yield from done(pending.popleft().result())
+
+
+class JsonlSink:
+    """Write results as JSON Lines, each with its zero-based input ``index``.
+
+    Args:
+        path (str): Output file
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", buffering=CHUNK_BYTES)
+        self.count = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        record = {"index": self.count, **result}
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'JsonlSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ParquetSink:
+    """Write results to Parquet, one row group per ``row_group_size`` results.
+
+    Columns are ``index``, ``stance``, ``confidence``, ``hits`` (a struct of
+    counts) and ``scores`` (a struct of per-stance scores), inferred from the
+    first results.
+
+    Args:
+        path (str): Output file
+        row_group_size (int): Results buffered per row group
+    """
+
+    def __init__(self, path: str, row_group_size: int = 65536):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("ParquetSink requires the 'pyarrow' package") from e
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self.row_group_size = row_group_size
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = None
+        self.count = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._rows.append({"index": self.count, **result})
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(self._rows)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self) -> 'ParquetSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_sink(path: str):
+    """Open a ParquetSink for ``.parquet`` paths and a JsonlSink otherwise."""
+    return ParquetSink(path) if path.lower().endswith(".parquet") else JsonlSink(path)
+
+
+def run_pipeline(input_path: str, output_path: str, fmt: Optional[str] = None, field: str = "text",
+                 on_progress: Optional[Callable[[PipelineStats], None]] = None, **options: Any) -> PipelineStats:
+    """Analyze a corpus file and stream the results to a JSON Lines or Parquet file.
+
+    Args:
+        input_path (str): Corpus file (see ``read_items``)
+        output_path (str): Output file; ``.parquet`` selects Parquet
+        fmt (str, optional): Input format (default: from the suffix)
+        field (str): JSON field or CSV column holding the text
+        on_progress (Callable, optional): Called with the stats after every batch
+        **options: Passed to ``analyze_stream`` (lexicons, workers, batch_size, ...)
+
+    Returns:
+        PipelineStats: Final counts and throughput
+    """
+    fmt = fmt or detect_format(input_path)
+    stats = PipelineStats()
+    items = read_items(input_path, fmt, field)
+    with open_sink(output_path) as sink:
+        for result in analyze_stream(items, fmt=fmt, field=field, stats=stats, on_progress=on_progress, **options):
+            sink.write(result)
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a corpus through StanceAnalyzer on all cores.")
+    parser.add_argument("input", help="JSON Lines, CSV or plain text corpus")
+    parser.add_argument("output", help="JSON Lines output, or Parquet if it ends in .parquet")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the suffix)")
+    parser.add_argument("--field", default="text", help="JSON field or CSV column holding the text")
+    parser.add_argument("--lexicons", help="JSON file mapping stance names to keyword lists")
+    parser.add_argument("--full-density", type=float, default=0.05, help="hits per word for full confidence")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="texts per worker task")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="seconds between progress logs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", stream=sys.stderr)
+    lexicons = None
+    if args.lexicons:
+        with open(args.lexicons, encoding="utf-8") as f:
+            lexicons = json.load(f)
+
+    last_log = [time.perf_counter()]
+
+    def progress(stats: PipelineStats) -> None:
+        now = time.perf_counter()
+        if now - last_log[0] >= args.progress_interval:
+            last_log[0] = now
+            logger.info("%d texts, %.0f texts/s", stats.texts, stats.throughput)
+
+    stats = run_pipeline(args.input, args.output, fmt=args.format, field=args.field, on_progress=progress,
+                         lexicons=lexicons, full_density=args.full_density, workers=args.workers,
+                         batch_size=args.batch_size)
+    logger.info("Done: %d texts in %.1f s (%.0f texts/s)", stats.texts, stats.elapsed, stats.throughput)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
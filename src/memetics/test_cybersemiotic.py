@@ -9,7 +9,21 @@ import unittest
 from unittest.mock import Mock
 
 from src.memetics.cybersemiotic import (CyberSemiotic, MemeticField, MemeComplex, 
-                                       StanceAnalyzer)
+                                       SimulationConfig, StanceAnalyzer)
+
+
+def populated_framework(fields=2, complexes=3, memes=20):
+    """Build a framework with several fields of equally sized complexes."""
+    framework = CyberSemiotic()
+    for f in range(fields):
+        framework.create_memetic_field(f"field_{f}")
+        for c in range(complexes):
+            meme_complex = MemeComplex()
+            for m in range(memes):
+                meme_complex.add_meme({"content": f"meme {f}-{c}-{m}", "stance": "neutral", "version": 1,
+                                       "fitness": 0.5 + c * 0.3})
+            framework.add_meme_complex_to_field(f"field_{f}", meme_complex)
+    return framework
 
 
 class TestCyberSemiotic(unittest.TestCase):
@@ -47,7 +61,7 @@ class TestCyberSemiotic(unittest.TestCase):
         text = "This is a positive stance toward AI development."
         stance = self.stance_analyzer.analyze(text)
         
-        self.assertIn("positive", stance)
+        self.assertIn("positive", stance["scores"])
         self.assertIn("stance", stance)
 
     def test_run_simulation(self):
@@ -61,6 +75,72 @@ class TestCyberSemiotic(unittest.TestCase):
         
         self.assertEqual(result, "Simulation complete")
 
+    def test_run_simulation_ticks_and_metrics(self):
+        """Each tick advances every field and records its metrics."""
+        framework = populated_framework()
+        seen = []
+        result = framework.run_simulation(ticks=5, seed=1, on_tick=seen.append)
+
+        self.assertEqual(result, "Simulation complete")
+        self.assertEqual(len(framework.metrics), 10)
+        self.assertEqual(seen, sorted(seen, key=lambda m: m["tick"]))
+        self.assertEqual([m["tick"] for m in framework.metrics[:5]], [1, 2, 3, 4, 5])
+        last = framework.metrics[4]
+        field = framework.memetic_fields["field_0"]
+        self.assertEqual(last["memes"], sum(len(c.memes) for c in field.meme_complexes))
+        self.assertEqual(last["complexes"], len(field.meme_complexes))
+
+    def test_competition_and_merging(self):
+        """Stronger complexes gain fitness and complexes with close fitness merge."""
+        framework = populated_framework(fields=1)
+        config = SimulationConfig(drift=0.0, competition=0.5, merge_tolerance=0.0)
+        framework.run_simulation(ticks=3, config=config)
+        weak, _, strong = framework.memetic_fields["field_0"].meme_complexes
+        self.assertLess(weak.memes[0]["fitness"], 0.5)
+        self.assertGreater(strong.memes[0]["fitness"], 1.1)
+
+        framework = populated_framework(fields=1)
+        framework.run_simulation(ticks=1, config=SimulationConfig(drift=0.0, competition=0.0, merge_tolerance=0.5))
+        self.assertEqual(len(framework.memetic_fields["field_0"].meme_complexes), 2)
+        self.assertEqual(framework.metrics[0]["merges"], 1)
+
+    def test_parallel_matches_serial(self):
+        """Fields run in worker processes evolve exactly as in-process ones."""
+        serial, parallel = populated_framework(), populated_framework()
+        self.assertEqual(parallel.metrics, [])
+        serial_ticks, parallel_ticks = [], []
+        serial.run_simulation(ticks=4, seed=7, on_tick=serial_ticks.append)
+        parallel.run_simulation(ticks=4, seed=7, workers=2, on_tick=parallel_ticks.append)
+        strip = lambda metrics: [{k: v for k, v in m.items() if k != "seconds"} for m in metrics]
+        self.assertEqual(strip(parallel.metrics), strip(serial.metrics))
+        self.assertEqual(strip(parallel_ticks), strip(serial_ticks))
+
+    def test_parallel_updates_fields_in_place(self):
+        """A parallel run leaves the caller's field, complex and meme objects as a serial run does."""
+        serial, parallel = populated_framework(), populated_framework()
+        fields = dict(parallel.memetic_fields)
+        complexes = {id(c) for f in fields.values() for c in f.meme_complexes}
+        memes = {id(m) for f in fields.values() for c in f.meme_complexes for m in c.memes}
+        # Enough drift for extinctions and merges
+        config = SimulationConfig(drift=0.3, extinction=0.9, merge_tolerance=0.5)
+        serial.run_simulation(ticks=4, seed=3, config=config)
+        parallel.run_simulation(ticks=4, seed=3, config=config, workers=2)
+        self.assertGreater(sum(m["merges"] for m in parallel.metrics), 0)
+        self.assertGreater(sum(m["extinctions"] for m in parallel.metrics), 0)
+        self.assertEqual(parallel.memetic_fields, fields)
+        for name, field in parallel.memetic_fields.items():
+            self.assertIs(field, fields[name])
+            self.assertTrue({id(c) for c in field.meme_complexes} <= complexes)
+            self.assertTrue({id(m) for c in field.meme_complexes for m in c.memes} <= memes)
+            expected = [c.memes for c in serial.memetic_fields[name].meme_complexes]
+            self.assertEqual([c.memes for c in field.meme_complexes], expected)
+
+    def test_wall_time_budget(self):
+        """A wall-time budget stops an otherwise unbounded run."""
+        framework = populated_framework(fields=1, complexes=2, memes=5)
+        framework.run_simulation(max_seconds=0.05, config=SimulationConfig(extinction=0.0))
+        self.assertGreater(len(framework.metrics), 0)
+
     def test_save_and_load(self):
         """Test saving and loading the cybersemiotic framework."""
         # Save the current state
@@ -1,5 +1,4 @@
 import unittest
-from unittest.mock import MagicMock
 
 from src.memetics.cybersemiotic import StanceAnalyzer
 
@@ -16,24 +15,72 @@ class TestStanceAnalyzer(unittest.TestCase):
         text = "I believe AI will benefit humanity."
         result = self.stance_analyzer.analyze(text)
         
-        self.assertIn("positive", result)
+        self.assertIn("positive", result["scores"])
         self.assertIn("stance", result)
+        self.assertEqual(result["stance"], "positive")
 
     def test_analyze_negative_stance(self):
         """Test analyzing a negative stance."""
         text = "AI is dangerous and will destroy us."
         result = self.stance_analyzer.analyze(text)
         
-        self.assertIn("negative", result)
+        self.assertIn("negative", result["scores"])
         self.assertIn("stance", result)
+        self.assertEqual(result["stance"], "negative")
 
     def test_analyze_neutral_stance(self):
         """Test analyzing a neutral stance."""
         text = "AI is a tool for human use."
         result = self.stance_analyzer.analyze(text)
         
-        self.assertIn("neutral", result)
+        self.assertIn("neutral", result["scores"])
         self.assertIn("stance", result)
+        self.assertEqual(result["stance"], "neutral")
+        self.assertEqual(result["confidence"], 1.0)
+
+    def test_hit_counts_and_density_confidence(self):
+        """Hits are counted per stance and confidence follows their density."""
+        result = self.stance_analyzer.analyze("Bad harm, bad. " + "word " * 16)
+        self.assertEqual(result["hits"], {"positive": 0, "negative": 3})
+        self.assertEqual(result["stance"], "negative")
+        # 3 hits in 20 words is above the full density of 0.05, so nothing is neutral
+        self.assertAlmostEqual(result["confidence"], 1.0)
+        self.assertAlmostEqual(result["scores"]["neutral"], 0.0)
+
+        sparse = self.stance_analyzer.analyze("good " + "word " * 39)
+        self.assertAlmostEqual(sparse["confidence"], 0.5)
+        self.assertAlmostEqual(sum(sparse["scores"].values()), 1.0)
+
+    def test_any_positive_keyword_wins(self):
+        """As before, one positive keyword makes a text positive, whatever the negative count."""
+        result = self.stance_analyzer.analyze("Bad harm, good. " + "word " * 16)
+        self.assertEqual(result["hits"], {"positive": 1, "negative": 2})
+        self.assertEqual(result["stance"], "positive")
+        self.assertAlmostEqual(result["confidence"], 1 / 3)
+        self.assertEqual(self.stance_analyzer.analyze("good but bad")["stance"], "positive")
+
+    def test_custom_lexicons(self):
+        """Configured lexicons replace the defaults, matching case-insensitively."""
+        analyzer = StanceAnalyzer({"alarm": ["Risk", "risky"], "calm": ["fine"]})
+        result = analyzer.analyze("RISKY but fine, risk")
+        self.assertEqual(result["hits"], {"alarm": 2, "calm": 1})
+        self.assertEqual(result["stance"], "alarm")
+        with self.assertRaises(ValueError):
+            StanceAnalyzer({"neutral": ["meh"]})
+
+    def test_lexicon_names_do_not_clash_with_result_keys(self):
+        """Scores live under "scores", so any stance name but neutral is allowed."""
+        result = StanceAnalyzer({"stance": ["x"], "hits": ["y"]}).analyze("y")
+        self.assertEqual(result["stance"], "hits")
+        self.assertEqual(result["hits"], {"stance": 0, "hits": 1})
+        self.assertEqual(set(result["scores"]), {"stance", "hits", "neutral"})
+
+    def test_analyze_many_streams(self):
+        """analyze_many is lazy and matches analyze."""
+        texts = ["good", "bad", "tool"]
+        results = self.stance_analyzer.analyze_many(iter(texts))
+        self.assertNotIsInstance(results, list)
+        self.assertEqual(list(results), [self.stance_analyzer.analyze(t) for t in texts])
 
 
 if __name__ == "__main__":
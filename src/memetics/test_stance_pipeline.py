@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+import pyarrow.parquet as pq
+
+from src.memetics.cybersemiotic import StanceAnalyzer
+from src.memetics.stance_pipeline import PipelineStats, analyze_stream, read_items, run_pipeline
+
+
+TEXTS = ["AI will benefit us", "This is bad and harmful", "A tool", "good help, but a threat"] * 30
+
+
+class TestStancePipeline(unittest.TestCase):
+    """Test cases for the streaming stance pipeline."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.expected = [StanceAnalyzer().analyze(text) for text in TEXTS]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_parallel_results_in_order(self):
+        """Worker results come back in input order with bounded batches in flight."""
+        stats = PipelineStats()
+        results = list(analyze_stream(TEXTS, workers=2, batch_size=7, max_pending=2, stats=stats))
+        self.assertEqual(results, self.expected)
+        self.assertEqual(stats.texts, len(TEXTS))
+        self.assertEqual(stats.batches, 18)
+
+    def test_jsonl_to_jsonl(self):
+        """JSON Lines input is decoded by field and written with its index."""
+        source = self.path("corpus.jsonl")
+        with open(source, "w", encoding="utf-8") as f:
+            for text in TEXTS:
+                f.write(json.dumps({"body": text}) + "\n")
+            f.write("\n")
+        progress = []
+        stats = run_pipeline(source, self.path("out.jsonl"), field="body", workers=1, batch_size=50,
+                             on_progress=lambda s: progress.append(s.texts))
+        self.assertEqual(progress, [50, 100, 120])
+        self.assertEqual(stats.texts, len(TEXTS))
+        with open(self.path("out.jsonl"), encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[3], {"index": 3, **self.expected[3]})
+
+    def test_csv_and_text_to_parquet(self):
+        """CSV and plain text inputs produce the same Parquet rows."""
+        with open(self.path("corpus.csv"), "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            writer.writerows(enumerate(TEXTS))
+        with open(self.path("corpus.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(TEXTS) + "\n")
+        tables = []
+        for name in ("corpus.csv", "corpus.txt"):
+            output = self.path(name + ".parquet")
+            run_pipeline(self.path(name), output, workers=2, batch_size=16)
+            tables.append(pq.read_table(output).to_pylist())
+        self.assertEqual(tables[0], tables[1])
+        self.assertEqual([row["stance"] for row in tables[0]], [r["stance"] for r in self.expected])
+        self.assertEqual(tables[0][1]["hits"], {"positive": 0, "negative": 2})
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(read_items(self.path("x"), "xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,413 @@
+'''
+mutation_ops.py: Pluggable, batched mutation operators for meme pools
+
+A MutationPipeline applies a sequence of operators to a batch of memes that
+were selected for mutation. Each operator fires independently on a meme with
+its own ``rate`` and works on whole arrays: content operators group the batch
+by distinct content and pick from variants memoized in the pool's
+ContentStore, while stance and fitness operators are plain NumPy updates.
+
+Operators are registered by name, so pipelines can be built from
+configuration:
+
+    pipeline = MutationPipeline.from_config({
+        "synonym": {"rate": 1.0, "lexicon": "synonyms.json"},
+        "word_drop": {"rate": 0.05},
+        "stance_flip": {"rate": 0.01},
+    })
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from content_store import ContentStore
+
+
+class Lexicon:
+    """Synonym lexicon compiled into a hash index over a flat word table.
+
+    Lookups are case-insensitive; replacements are returned as written.
+
+    Args:
+        synonyms (Mapping[str, Sequence[str]]): Word to replacement words
+    """
+
+    def __init__(self, synonyms: Mapping[str, Sequence[str]]):
+        words: List[str] = []
+        self.index: Dict[str, Tuple[int, int]] = {}
+        for word, replacements in synonyms.items():
+            if not replacements:
+                continue
+            start = len(words)
+            words.extend(replacements)
+            self.index[word.lower()] = (start, len(words))
+        self.words: Tuple[str, ...] = tuple(words)
+        self.vocabulary: Tuple[str, ...] = tuple(dict.fromkeys(list(synonyms) + words))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.index
+
+    def synonyms(self, word: str) -> Tuple[str, ...]:
+        """Return the replacements for ``word`` (empty if it has none).
+
+        Args:
+            word (str): Word to look up, any case
+
+        Returns:
+            Tuple[str, ...]: Replacement words
+        """
+        span = self.index.get(word.lower())
+        return () if span is None else self.words[span[0]:span[1]]
+
+    @classmethod
+    def load(cls, path: str) -> 'Lexicon':
+        """Load a lexicon from a file.
+
+        ``.json`` files hold an object mapping each word to a list of
+        replacements. Any other file is read as text, one entry per line in
+        the form ``word: replacement, replacement``; blank lines and lines
+        starting with ``#`` are ignored.
+
+        Args:
+            path (str): Lexicon file
+
+        Returns:
+            Lexicon: The compiled lexicon
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                return cls(json.load(f))
+            synonyms: Dict[str, List[str]] = {}
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                word, _, replacements = line.partition(':')
+                synonyms[word.strip()] = [r.strip() for r in replacements.split(',') if r.strip()]
+            return cls(synonyms)
+
+
+@dataclass
+class MutationBatch:
+    """Mutable view of the memes being mutated, one array entry per meme.
+
+    Attributes:
+        content (np.ndarray): ContentStore handles (int)
+        stance_codes (np.ndarray): Stance codes (int8)
+        initial_fitness (np.ndarray): Base fitness scores (float64)
+        n_stances (int): Number of stance codes
+    """
+
+    content: np.ndarray
+    stance_codes: np.ndarray
+    initial_fitness: np.ndarray
+    n_stances: int
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+
+class MutationOperator:
+    """Base class for batched mutation operators.
+
+    Args:
+        rate (float): Probability that the operator fires on a meme selected
+            for mutation (0.0 to 1.0)
+    """
+
+    name: str = ""
+
+    def __init__(self, rate: float = 1.0):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"rate must be between 0 and 1, got {rate}")
+        self.rate = rate
+
+    def apply(self, batch: MutationBatch, rows: np.ndarray, rng: np.random.Generator,
+              store: ContentStore) -> np.ndarray:
+        """Mutate ``rows`` of ``batch`` in place.
+
+        Args:
+            batch (MutationBatch): Memes being mutated
+            rows (np.ndarray): Rows the operator fires on
+            rng (np.random.Generator): Random source
+            store (ContentStore): Content store the handles refer to
+
+        Returns:
+            np.ndarray: Boolean mask over ``rows`` of the memes that changed
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rate={self.rate})"
+
+
+class ContentOperator(MutationOperator):
+    """Operator that replaces a content by one of a finite set of variants.
+
+    Subclasses implement ``variants``; the variant handles of each distinct
+    content are computed once per store and every meme sharing that content
+    picks from the same array.
+    """
+
+    def variants(self, handle: int, store: ContentStore) -> np.ndarray:
+        """Return the handles of every possible mutation of ``handle``.
+
+        Args:
+            handle (int): Content handle
+            store (ContentStore): Store to intern variants into
+
+        Returns:
+            np.ndarray: Variant handles (may be empty)
+        """
+        raise NotImplementedError
+
+    def apply(self, batch: MutationBatch, rows: np.ndarray, rng: np.random.Generator,
+              store: ContentStore) -> np.ndarray:
+        handles = batch.content[rows]
+        picks = rng.random(len(rows))
+        result = handles.copy()
+        for handle, group in _group_by_handle(handles):
+            variants = store.cached((self, handle), lambda: self.variants(handle, store))
+            if len(variants) == 0:
+                continue
+            result[group] = variants[(picks[group] * len(variants)).astype(np.intp)]
+        batch.content[rows] = result
+        return result != handles
+
+
+def _group_by_handle(handles: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield each distinct handle with the positions holding it, in one sort."""
+    unique, inverse, counts = np.unique(handles, return_inverse=True, return_counts=True)
+    groups = np.split(np.argsort(inverse.ravel(), kind="stable"), np.cumsum(counts)[:-1])
+    return zip(unique.tolist(), groups)
+
+
+OPERATORS: Dict[str, Type[MutationOperator]] = {}
+
+
+def register_operator(name: str) -> Callable[[Type[MutationOperator]], Type[MutationOperator]]:
+    """Class decorator adding a mutation operator to ``OPERATORS``.
+
+    Args:
+        name (str): Name used in pipeline configurations
+
+    Returns:
+        Callable: The decorator
+    """
+    def decorator(cls: Type[MutationOperator]) -> Type[MutationOperator]:
+        cls.name = name
+        OPERATORS[name] = cls
+        return cls
+    return decorator
+
+
+@register_operator("synonym")
+class SynonymSubstitution(ContentOperator):
+    """Replace one word that has synonyms with one of them.
+
+    Each (position, synonym) pair is equally likely.
+
+    Args:
+        lexicon (Lexicon or Mapping or str): Lexicon, synonym mapping or lexicon file
+        rate (float): Per-meme firing probability
+        first_word_only (bool): Only consider the first word, like ``Meme.mutate``
+    """
+
+    def __init__(self, lexicon: Union[Lexicon, Mapping[str, Sequence[str]], str], rate: float = 1.0,
+                 first_word_only: bool = False):
+        super().__init__(rate)
+        self.lexicon = _as_lexicon(lexicon)
+        self.first_word_only = first_word_only
+
+    def variants(self, handle: int, store: ContentStore) -> np.ndarray:
+        words = store.words(handle)
+        positions = words[:1] if self.first_word_only else words
+        handles = []
+        for position, word in enumerate(positions):
+            for synonym in self.lexicon.synonyms(word):
+                edited = list(words)
+                edited[position] = synonym
+                handles.append(store.edit(handle, edited))
+        return np.array(handles, dtype=np.int64)
+
+
+@register_operator("word_drop")
+class WordDrop(ContentOperator):
+    """Delete one word, chosen uniformly; single-word contents are left alone.
+
+    Args:
+        rate (float): Per-meme firing probability
+    """
+
+    def variants(self, handle: int, store: ContentStore) -> np.ndarray:
+        words = store.words(handle)
+        if len(words) < 2:
+            return np.empty(0, dtype=np.int64)
+        return np.array([store.edit(handle, words[:i] + words[i + 1:]) for i in range(len(words))],
+                        dtype=np.int64)
+
+
+@register_operator("word_insert")
+class WordInsert(MutationOperator):
+    """Insert a word from the lexicon's vocabulary at a random position.
+
+    Position and word are drawn independently, so large vocabularies cost no
+    more than small ones. Memes are grouped by content so each distinct
+    (content, position, word) edit is joined and interned once per batch;
+    nothing random is memoized across batches.
+
+    Args:
+        lexicon (Lexicon or Mapping or str): Source of inserted words
+        rate (float): Per-meme firing probability
+    """
+
+    def __init__(self, lexicon: Union[Lexicon, Mapping[str, Sequence[str]], str], rate: float = 1.0):
+        super().__init__(rate)
+        self.lexicon = _as_lexicon(lexicon)
+
+    def apply(self, batch: MutationBatch, rows: np.ndarray, rng: np.random.Generator,
+              store: ContentStore) -> np.ndarray:
+        vocabulary = self.lexicon.vocabulary
+        handles = batch.content[rows]
+        if not vocabulary:
+            return np.zeros(len(rows), dtype=bool)
+        picks = rng.random(len(rows))
+        choices = rng.integers(0, len(vocabulary), size=len(rows))
+        result = handles.copy()
+        for handle, group in _group_by_handle(handles):
+            words = store.words(handle)
+            positions = (picks[group] * (len(words) + 1)).astype(np.int64)
+            edits, inverse = np.unique(positions * len(vocabulary) + choices[group], return_inverse=True)
+            edited = [store.edit(handle, words[:position] + (vocabulary[choice],) + words[position:])
+                      for position, choice in (divmod(edit, len(vocabulary)) for edit in edits.tolist())]
+            result[group] = np.array(edited, dtype=np.int64)[inverse.ravel()]
+        batch.content[rows] = result
+        return result != handles
+
+
+@register_operator("stance_flip")
+class StanceFlip(MutationOperator):
+    """Switch to a different stance, chosen uniformly.
+
+    Args:
+        rate (float): Per-meme firing probability
+    """
+
+    def apply(self, batch: MutationBatch, rows: np.ndarray, rng: np.random.Generator,
+              store: ContentStore) -> np.ndarray:
+        if batch.n_stances < 2:
+            return np.zeros(len(rows), dtype=bool)
+        shift = rng.integers(1, batch.n_stances, size=len(rows))
+        batch.stance_codes[rows] = (batch.stance_codes[rows] + shift) % batch.n_stances
+        return np.ones(len(rows), dtype=bool)
+
+
+@register_operator("fitness_drift")
+class FitnessDrift(MutationOperator):
+    """Add Gaussian noise to the base fitness, clipped to [0, 1].
+
+    Args:
+        rate (float): Per-meme firing probability
+        scale (float): Standard deviation of the drift
+    """
+
+    def __init__(self, rate: float = 1.0, scale: float = 0.05):
+        super().__init__(rate)
+        self.scale = scale
+
+    def apply(self, batch: MutationBatch, rows: np.ndarray, rng: np.random.Generator,
+              store: ContentStore) -> np.ndarray:
+        before = batch.initial_fitness[rows]
+        after = np.clip(before + rng.normal(0.0, self.scale, size=len(rows)), 0.0, 1.0)
+        batch.initial_fitness[rows] = after
+        return after != before
+
+
+def _as_lexicon(lexicon: Union[Lexicon, Mapping[str, Sequence[str]], str]) -> Lexicon:
+    """Accept a compiled Lexicon, a synonym mapping or a lexicon file path."""
+    if isinstance(lexicon, Lexicon):
+        return lexicon
+    if isinstance(lexicon, str):
+        return Lexicon.load(lexicon)
+    return Lexicon(lexicon)
+
+
+class MutationPipeline:
+    """Ordered operators applied to a batch of memes selected for mutation.
+
+    Args:
+        operators (Iterable[MutationOperator]): Operators, applied in order
+    """
+
+    def __init__(self, operators: Iterable[MutationOperator]):
+        self.operators: List[MutationOperator] = list(operators)
+
+    def __repr__(self) -> str:
+        return f"MutationPipeline({self.operators!r})"
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Mapping[str, Any]],
+                    lexicon: Optional[Union[Lexicon, Mapping[str, Sequence[str]], str]] = None) -> 'MutationPipeline':
+        """Build a pipeline from ``{operator name: keyword arguments}``.
+
+        Args:
+            config (Mapping): Operators in application order, e.g.
+                ``{"synonym": {"rate": 0.8}, "stance_flip": {"rate": 0.1}}``
+            lexicon (Lexicon or Mapping or str, optional): Default lexicon for
+                operators whose configuration does not name one
+
+        Returns:
+            MutationPipeline: The pipeline
+        """
+        operators = []
+        for name, params in config.items():
+            if name not in OPERATORS:
+                raise ValueError(f"Unknown mutation operator '{name}', expected one of {sorted(OPERATORS)}")
+            params = dict(params)
+            operator = OPERATORS[name]
+            if issubclass(operator, (SynonymSubstitution, WordInsert)) and "lexicon" not in params:
+                if lexicon is None:
+                    raise ValueError(f"Mutation operator '{name}' needs a lexicon")
+                params["lexicon"] = lexicon
+            operators.append(operator(**params))
+        return cls(operators)
+
+    def apply(self, batch: MutationBatch, rng: np.random.Generator, store: ContentStore,
+              counts: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """Run every operator over ``batch`` in place.
+
+        Args:
+            batch (MutationBatch): Memes selected for mutation
+            rng (np.random.Generator): Random source
+            store (ContentStore): Content store the handles refer to
+            counts (Dict[str, int], optional): Incremented by the number of
+                memes each operator changed, keyed by operator name
+
+        Returns:
+            np.ndarray: Boolean mask of the memes that changed
+        """
+        size = len(batch)
+        changed = np.zeros(size, dtype=bool)
+        if size == 0:
+            return changed
+        for operator in self.operators:
+            if operator.rate >= 1.0:
+                rows = np.arange(size)
+            elif operator.rate > 0.0:
+                rows = np.flatnonzero(rng.random(size) < operator.rate)
+            else:
+                continue
+            if len(rows):
+                hits = operator.apply(batch, rows, rng, store)
+                changed[rows] |= hits
+                if counts is not None:
+                    counts[operator.name] = counts.get(operator.name, 0) + int(hits.sum())
+        return changed
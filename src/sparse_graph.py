@@ -0,0 +1,300 @@
+'''
+sparse_graph.py: Array-backed directed graph for meme complexes
+
+SparseMemeGraph stores a meme complex's network as NumPy arrays instead of
+networkx's dict-of-dicts: node fitness in a float array, node content as
+handles into a ContentStore, and edges as COO (source, target, weight)
+arrays. Repeated edges are collapsed lazily (the last write wins, as with
+``DiGraph.add_edge``) into CSR order, and ``adjacency()`` returns a SciPy
+sparse matrix for graph algorithms. It implements the subset of the
+``networkx.DiGraph`` API that MemeComplex uses; call ``to_networkx()`` when a
+real DiGraph is needed, e.g. for drawing.
+
+SciPy is only required for ``adjacency()``.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from content_store import ContentStore
+
+# Node attributes stored in arrays; other attributes are rejected
+NODE_ATTRIBUTES = ("content", "fitness")
+
+
+def _reserve(array: np.ndarray, size: int) -> np.ndarray:
+    """Return ``array`` or a copy with capacity for at least ``size`` entries."""
+    if size <= len(array):
+        return array
+    grown = np.empty(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _NodeView:
+    """Minimal stand-in for ``DiGraph.nodes``: iterable, callable and indexable."""
+
+    def __init__(self, graph: 'SparseMemeGraph'):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> List[Any]:
+        graph = self._graph
+        if not data:
+            return list(graph.ids)
+        return [(node, graph._attributes(i)) for i, node in enumerate(graph.ids)]
+
+    def __getitem__(self, node: Hashable) -> Dict[str, Any]:
+        return self._graph._attributes(self._graph.index[node])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._graph.ids)
+
+    def __len__(self) -> int:
+        return len(self._graph.ids)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._graph.index
+
+
+class SparseMemeGraph:
+    """Directed meme graph with NumPy node attributes and COO/CSR edges.
+
+    Unweighted edges get weight 1.0. Only the ``content`` and ``fitness``
+    node attributes are supported.
+
+    Attributes:
+        ids (List[Hashable]): Node IDs in insertion order
+        index (Dict[Hashable, int]): Node ID to row
+        contents (ContentStore): Distinct node contents
+        edge_version (int): Incremented whenever edges are added or the graph
+            is cleared; adding isolated nodes leaves it unchanged
+    """
+
+    edge_version = 0
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        self.edge_version += 1
+        self.ids: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self.contents = ContentStore()
+        self._fitness = np.empty(0, dtype=np.float64)
+        self._content = np.empty(0, dtype=np.int32)
+        self._attributed = np.empty(0, dtype=bool)
+        self._src = np.empty(0, dtype=np.int32)
+        self._dst = np.empty(0, dtype=np.int32)
+        self._weight = np.empty(0, dtype=np.float64)
+        self._edges = 0
+        self._compact = True
+        self.nodes = _NodeView(self)
+
+    # ------------------------------------------------------------------
+    # Nodes
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.ids)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.index
+
+    def number_of_nodes(self) -> int:
+        return len(self.ids)
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """Node fitness values, one per row (NaN where unset)."""
+        return self._fitness[:len(self.ids)]
+
+    def add_node(self, node: Hashable, **attrs: Any) -> None:
+        """Add a node or update its attributes.
+
+        Args:
+            node (Hashable): Node ID
+            **attrs: ``content`` and/or ``fitness``
+        """
+        unknown = set(attrs) - set(NODE_ATTRIBUTES)
+        if unknown:
+            raise ValueError(f"Unsupported node attributes {sorted(unknown)}, expected {NODE_ATTRIBUTES}")
+        row = self._row(node)
+        if "fitness" in attrs:
+            self._fitness[row] = attrs["fitness"]
+        if "content" in attrs:
+            self._content[row] = self.contents.intern(attrs["content"])
+        if attrs:
+            self._attributed[row] = True
+
+    def add_nodes_from(self, nodes: Iterable[Union[Hashable, Tuple[Hashable, Dict[str, Any]]]]) -> None:
+        """Add nodes given as IDs or ``(id, attributes)`` pairs.
+
+        Args:
+            nodes (Iterable): Nodes to add
+        """
+        for node in nodes:
+            if isinstance(node, tuple) and len(node) == 2 and isinstance(node[1], dict):
+                self.add_node(node[0], **node[1])
+            else:
+                self.add_node(node)
+
+    def rows(self, nodes: Iterable[Hashable]) -> np.ndarray:
+        """Return the rows of existing ``nodes``, e.g. to update ``fitness`` in place.
+
+        Args:
+            nodes (Iterable[Hashable]): Node IDs
+
+        Returns:
+            np.ndarray: Row indices (int64)
+        """
+        index = self.index
+        return np.array([index[node] for node in nodes], dtype=np.int64)
+
+    def relabel(self, mapping: Dict[Hashable, Hashable]) -> None:
+        """Rename nodes in place. Rows, attributes, edges and ``edge_version`` are unchanged.
+
+        Args:
+            mapping (Dict[Hashable, Hashable]): Old node ID to new node ID
+        """
+        moved = [(self.index.pop(old), new) for old, new in mapping.items()]
+        for row, new in moved:
+            if new in self.index:
+                raise ValueError(f"Cannot relabel to existing node {new!r}")
+            self.ids[row] = new
+            self.index[new] = row
+
+    def _row(self, node: Hashable) -> int:
+        """Return the row of ``node``, appending it if new."""
+        row = self.index.get(node)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(node)
+            self.index[node] = row
+            self._fitness = _reserve(self._fitness, row + 1)
+            self._content = _reserve(self._content, row + 1)
+            self._attributed = _reserve(self._attributed, row + 1)
+            self._fitness[row] = np.nan
+            self._content[row] = -1
+            self._attributed[row] = False
+        return row
+
+    def _attributes(self, row: int) -> Dict[str, Any]:
+        """Return the attribute dict of ``row`` (empty if none were set)."""
+        if not self._attributed[row]:
+            return {}
+        attrs: Dict[str, Any] = {}
+        if self._content[row] >= 0:
+            attrs["content"] = self.contents[int(self._content[row])]
+        if not np.isnan(self._fitness[row]):
+            attrs["fitness"] = float(self._fitness[row])
+        return attrs
+
+    # ------------------------------------------------------------------
+    # Edges
+    # ------------------------------------------------------------------
+
+    def add_edge(self, u: Hashable, v: Hashable, weight: float = 1.0) -> None:
+        """Add an edge ``u -> v``, adding missing nodes; re-adding replaces the weight."""
+        self.add_weighted_edges_from([(u, v, weight)])
+
+    def add_edges_from(self, edges: Iterable[Tuple]) -> None:
+        """Add edges given as ``(u, v)`` or ``(u, v, attributes)`` tuples.
+
+        Args:
+            edges (Iterable[Tuple]): Edges to add
+        """
+        self.add_weighted_edges_from(
+            (edge[0], edge[1], edge[2].get("weight", 1.0) if len(edge) > 2 else 1.0) for edge in edges
+        )
+
+    def add_weighted_edges_from(self, edges: Iterable[Tuple[Hashable, Hashable, float]]) -> None:
+        """Add ``(u, v, weight)`` edges in bulk.
+
+        Args:
+            edges (Iterable[Tuple]): Weighted edges to add
+        """
+        src, dst, weight = [], [], []
+        for u, v, w in edges:
+            src.append(self._row(u))
+            dst.append(self._row(v))
+            weight.append(w)
+        if not src:
+            return
+        end = self._edges + len(src)
+        self._src = _reserve(self._src, end)
+        self._dst = _reserve(self._dst, end)
+        self._weight = _reserve(self._weight, end)
+        self._src[self._edges:end] = src
+        self._dst[self._edges:end] = dst
+        self._weight[self._edges:end] = weight
+        self._edges = end
+        self._compact = False
+        self.edge_version += 1
+
+    def _compacted(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return deduplicated edges sorted by (source, target)."""
+        if not self._compact:
+            src, dst, weight = self._src[:self._edges], self._dst[:self._edges], self._weight[:self._edges]
+            keys = src.astype(np.int64) * max(1, len(self.ids)) + dst
+            # Keep the last write of each edge, like repeated DiGraph.add_edge calls
+            _, last = np.unique(keys[::-1], return_index=True)
+            keep = self._edges - 1 - last
+            self._src, self._dst, self._weight = src[keep].copy(), dst[keep].copy(), weight[keep].copy()
+            self._edges = len(keep)
+            self._compact = True
+        return self._src[:self._edges], self._dst[:self._edges], self._weight[:self._edges]
+
+    def number_of_edges(self) -> int:
+        return len(self._compacted()[0])
+
+    def edges(self, data: Union[bool, str] = False) -> List[Tuple]:
+        """List edges like ``DiGraph.edges``.
+
+        Args:
+            data (bool or str): False for ``(u, v)``, True for ``(u, v, {"weight": w})``,
+                or ``"weight"`` for ``(u, v, w)``
+
+        Returns:
+            List[Tuple]: Edges sorted by source row, then target row
+        """
+        src, dst, weight = self._compacted()
+        ids = self.ids
+        pairs = zip(src.tolist(), dst.tolist(), weight.tolist())
+        if data is True:
+            return [(ids[u], ids[v], {"weight": w}) for u, v, w in pairs]
+        if data == "weight":
+            return [(ids[u], ids[v], w) for u, v, w in pairs]
+        return [(ids[u], ids[v]) for u, v, _ in pairs]
+
+    def adjacency(self, fmt: str = "csr") -> Any:
+        """Return the weighted adjacency matrix as a SciPy sparse array.
+
+        Args:
+            fmt (str): 'csr' or 'coo'
+
+        Returns:
+            scipy.sparse array: ``n x n`` matrix with ``A[u, v] = weight``
+        """
+        try:
+            from scipy import sparse
+        except ImportError as e:
+            raise ImportError("SparseMemeGraph.adjacency requires the 'scipy' package") from e
+        src, dst, weight = self._compacted()
+        size = len(self.ids)
+        matrix = sparse.coo_array((weight, (src, dst)), shape=(size, size))
+        return matrix.tocsr() if fmt == "csr" else matrix
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Export to a ``networkx.DiGraph`` with the same nodes, attributes and weighted edges."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_weighted_edges_from(self.edges(data="weight"))
+        return graph
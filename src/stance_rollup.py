@@ -0,0 +1,187 @@
+'''
+stance_rollup.py: Time-bucketed stance counts for windowed trend queries
+
+StanceRollup keeps one small row of per-stance counts for every
+``bucket_seconds`` interval that saw at least one event, in a dict keyed by
+bucket index, so memory follows the number of busy buckets rather than the
+time span between the first and the last event. Raw events are not kept:
+recording adds to a cell, and a query over any window sums the rows of the
+buckets it covers. Buckets older than ``retention_seconds`` behind the newest
+one are evicted, and late events that would land in them are dropped.
+Windows are aligned to bucket boundaries; a bucket counts if its start lies in
+the window.
+
+TimeBuckets holds the bucket, retention and window logic and is shared with
+``stance_trends.StanceTrends``, which adds a meme dimension.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import math
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class TimeBuckets:
+    """Sparse time buckets with retention, the base of the stance stores.
+
+    Subclasses decide what a bucket holds; this class maps timestamps to
+    bucket indices, evicts buckets outside the retention period and selects
+    the buckets of a window.
+
+    Args:
+        bucket_seconds (float): Width of a bucket in seconds
+        retention_seconds (float, optional): Keep buckets up to this far behind
+            the newest one; None keeps every bucket
+        clock (Callable[[], float]): Time source for events and queries
+            without a timestamp
+
+    Attributes:
+        dropped (int): Late events discarded because they fell outside retention
+    """
+
+    def __init__(self, bucket_seconds: float, retention_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        if retention_seconds is not None and retention_seconds < bucket_seconds:
+            raise ValueError("retention_seconds must cover at least one bucket")
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.clock = clock
+        self._buckets: Dict[int, Any] = {}
+        self._newest: Optional[int] = None
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """Number of buckets currently retained."""
+        return len(self._buckets)
+
+    @property
+    def first_bucket(self) -> Optional[int]:
+        """Index of the oldest retained bucket, or None if there is none."""
+        return min(self._buckets) if self._buckets else None
+
+    def bucket(self, timestamp: float) -> int:
+        """Return the index of the bucket containing ``timestamp``."""
+        return math.floor(timestamp / self.bucket_seconds)
+
+    def _oldest_retained(self) -> Optional[int]:
+        if self.retention_seconds is None or self._newest is None:
+            return None
+        return self._newest - math.floor(self.retention_seconds / self.bucket_seconds) + 1
+
+    def _slot(self, timestamp: Optional[float], count: int) -> Optional[int]:
+        """Return the bucket index for an event, or None if it is too late to keep."""
+        index = self.bucket(self.clock() if timestamp is None else timestamp)
+        if self._newest is None or index > self._newest:
+            self._newest = index
+            self.evict()
+        else:
+            oldest = self._oldest_retained()
+            if oldest is not None and index < oldest:
+                self.dropped += count
+                return None
+        return index
+
+    def evict(self) -> int:
+        """Drop buckets outside the retention period.
+
+        Returns:
+            int: Number of buckets dropped
+        """
+        oldest = self._oldest_retained()
+        if oldest is None:
+            return 0
+        expired = [index for index in self._buckets if index < oldest]
+        for index in expired:
+            self._evicted(self._buckets.pop(index))
+        return len(expired)
+
+    def _evicted(self, bucket: Any) -> None:
+        """Hook called with every bucket dropped by ``evict``."""
+
+    def _window(self, start: Optional[float], end: Optional[float]) -> Tuple[float, float]:
+        """Bucket index range ``[lo, hi)`` of the buckets that start in ``[start, end)``."""
+        lo = -math.inf if start is None else math.ceil(start / self.bucket_seconds)
+        hi = math.inf if end is None else math.ceil(end / self.bucket_seconds)
+        return lo, hi
+
+    def _in_window(self, lo: float, hi: float) -> Iterator[Tuple[int, Any]]:
+        """Yield ``(index, bucket)`` for the retained buckets with index in ``[lo, hi)``."""
+        if hi - lo < len(self._buckets):
+            # Narrow window: probe its indices instead of scanning every bucket
+            for index in range(int(lo), int(hi)):
+                bucket = self._buckets.get(index)
+                if bucket is not None:
+                    yield index, bucket
+            return
+        for index, bucket in self._buckets.items():
+            if lo <= index < hi:
+                yield index, bucket
+
+
+class StanceRollup(TimeBuckets):
+    """Per-bucket stance counts over time.
+
+    Args:
+        n_stances (int): Number of stance codes
+        bucket_seconds (float): Width of a bucket in seconds
+        retention_seconds (float, optional): Keep buckets up to this far behind
+            the newest one; None keeps every bucket that saw an event
+        clock (Callable[[], float]): Time source for events without a timestamp
+    """
+
+    def __init__(self, n_stances: int, bucket_seconds: float = 3600.0, retention_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(bucket_seconds, retention_seconds, clock)
+        self.n_stances = n_stances
+        self._empty = bytes(8 * n_stances)
+
+    def add(self, code: int, timestamp: Optional[float] = None, count: int = 1) -> None:
+        """Record ``count`` events of stance ``code``.
+
+        Args:
+            code (int): Stance code
+            timestamp (float, optional): Event time in seconds (default: ``clock()``)
+            count (int): Number of events
+        """
+        index = self._slot(timestamp, count)
+        if index is None:
+            return
+        row = self._buckets.get(index)
+        if row is None:
+            row = self._buckets[index] = array('q', self._empty)
+        row[code] += count
+
+    def counts(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Return the stance counts of the buckets that start in ``[start, end)``.
+
+        Args:
+            start (float, optional): Window start in seconds (default: oldest retained)
+            end (float, optional): Window end in seconds (default: newest)
+
+        Returns:
+            np.ndarray: Count per stance code
+        """
+        return self.series(start, end)[1].sum(axis=0)
+
+    def series(self, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the retained buckets that start in ``[start, end)``, oldest first.
+
+        Buckets without events are not stored and do not appear.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Bucket start times and the
+                ``(buckets, n_stances)`` counts
+        """
+        found = sorted(self._in_window(*self._window(start, end)), key=lambda item: item[0])
+        counts = np.zeros((len(found), self.n_stances), dtype=np.int64)
+        for i, (_, row) in enumerate(found):
+            counts[i] = np.frombuffer(row, dtype=np.int64)
+        starts = np.array([index for index, _ in found], dtype=np.float64) * self.bucket_seconds
+        return starts, counts
@@ -0,0 +1,310 @@
+'''
+stance_trends.py: Per-meme stance time series with sliding and tumbling windows
+
+StanceTrends extends the sparse time buckets of ``stance_rollup`` with a meme
+dimension: every ``bucket_seconds`` interval holds the (meme, stance) pairs
+seen in it and how often, as NumPy key and count arrays. New events go into a
+small dict for their bucket, which is merged into the arrays on the next
+query. Buckets older than ``retention_seconds`` behind the newest one are
+evicted, and a meme's row is released once no retained bucket refers to it,
+so memory follows the event rate within the retention period rather than the
+whole history.
+
+A window query concatenates the arrays of the buckets that start inside it
+and adds them up with one ``np.bincount``, so its cost follows the events in
+the window, not the number of memes ever seen. That yields the stance mix of
+the window, per meme or overall, the last ``seconds`` of a sliding window, or
+a series of tumbling windows. ``top_shifts`` ranks memes by how much their
+stance mix changed between two consecutive windows. Windows are aligned to
+bucket boundaries: a bucket counts if its start lies in a ``[start, end)``
+window, and a sliding window covers whole buckets up to the one containing
+``now``. The overall queries (``counts`` and ``series``) match StanceRollup,
+so a StanceTrends can stand in wherever a rollup is expected.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import math
+import time
+from array import array
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from stance_rollup import TimeBuckets
+
+# Newest-bucket marker of a released row, which no eviction can expire
+_FREE = 2 ** 63 - 1
+
+
+class _Bucket:
+    """Counts of one time bucket, keyed by ``row * n_stances + code``."""
+
+    __slots__ = ("keys", "counts", "pending")
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.pending: Dict[int, int] = {}
+
+    def add(self, key: int, count: int) -> None:
+        self.pending[key] = self.pending.get(key, 0) + count
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (keys, counts) arrays, merging pending events first."""
+        if self.pending:
+            keys = np.concatenate([self.keys, np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))])
+            counts = np.concatenate([self.counts, np.fromiter(self.pending.values(), dtype=np.int64,
+                                                              count=len(self.pending))])
+            self.keys, inverse = np.unique(keys, return_inverse=True)
+            self.counts = np.bincount(inverse.ravel(), weights=counts).astype(np.int64)
+            self.pending = {}
+        return self.keys, self.counts
+
+
+class StanceTrends(TimeBuckets):
+    """Bucketed per-meme stance counts with windowed queries and retention.
+
+    Args:
+        n_stances (int): Number of stance codes
+        bucket_seconds (float): Width of a bucket in seconds
+        retention_seconds (float, optional): Keep buckets up to this far behind
+            the newest one; None keeps everything
+        clock (Callable[[], float]): Time source for events and queries
+            without a timestamp
+
+    Attributes:
+        dropped (int): Late events discarded because they fell outside retention
+    """
+
+    def __init__(self, n_stances: int, bucket_seconds: float = 60.0, retention_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(bucket_seconds, retention_seconds, clock)
+        self.n_stances = n_stances
+        self._ids: List[Optional[Hashable]] = []  # meme by row, None for released rows
+        self._rows: Dict[Hashable, int] = {}
+        self._last = array('q')  # newest bucket referring to each row
+        self._free: List[int] = []
+
+    @property
+    def memes(self) -> int:
+        """Number of memes with events in a retained bucket."""
+        return len(self._rows)
+
+    def add(self, meme_id: Hashable, code: int, timestamp: Optional[float] = None, count: int = 1) -> None:
+        """Record ``count`` events of stance ``code`` toward ``meme_id``.
+
+        Args:
+            meme_id (Hashable): ID of the meme
+            code (int): Stance code
+            timestamp (float, optional): Event time in seconds (default: ``clock()``)
+            count (int): Number of events
+        """
+        index = self._slot(timestamp, count)
+        if index is None:
+            return
+        row = self._rows.get(meme_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self._ids[row] = meme_id
+                self._last[row] = index
+            else:
+                row = len(self._ids)
+                self._ids.append(meme_id)
+                self._last.append(index)
+            self._rows[meme_id] = row
+        elif index > self._last[row]:
+            self._last[row] = index
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = _Bucket()
+        bucket.add(row * self.n_stances + code, count)
+
+    def evict(self) -> int:
+        """Drop buckets outside the retention period and release memes left without events.
+
+        Returns:
+            int: Number of buckets dropped
+        """
+        dropped = super().evict()
+        oldest = self._oldest_retained()
+        if dropped and self._rows:
+            stale = np.flatnonzero(np.frombuffer(self._last, dtype=np.int64) < oldest).tolist()
+            for row in stale:
+                del self._rows[self._ids[row]]
+                self._ids[row] = None
+                self._last[row] = _FREE
+            self._free.extend(stale)
+        return dropped
+
+    def _window_arrays(self, lo: float, hi: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatenated (keys, counts) of the buckets with index in ``[lo, hi)``."""
+        parts = [bucket.arrays() for _, bucket in self._in_window(lo, hi)]
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        keys, counts = zip(*parts)
+        return np.concatenate(keys), np.concatenate(counts)
+
+    def _counts(self, lo: float, hi: float, meme_id: Optional[Hashable]) -> np.ndarray:
+        """Stance counts of the window, for one meme or all of them."""
+        keys, counts = self._window_arrays(lo, hi)
+        n = self.n_stances
+        if meme_id is not None:
+            row = self._rows.get(meme_id)
+            if row is None:
+                return np.zeros(n, dtype=np.int64)
+            mask = (keys >= row * n) & (keys < (row + 1) * n)
+            keys, counts = keys[mask], counts[mask]
+        return np.bincount(keys % n, weights=counts, minlength=n).astype(np.int64)
+
+    def _by_row(self, lo: float, hi: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows with events in the window and their ``(rows, n_stances)`` counts."""
+        keys, counts = self._window_arrays(lo, hi)
+        n = self.n_stances
+        rows, inverse = np.unique(keys // n, return_inverse=True)
+        flat = np.bincount(inverse.ravel() * n + keys % n, weights=counts, minlength=len(rows) * n)
+        return rows, flat.astype(np.int64).reshape(-1, n)
+
+    def _sliding_window(self, seconds: float, now: Optional[float]) -> Tuple[int, int]:
+        """Bucket range of the ``seconds`` up to ``now``: the bucket of ``now`` and those before it."""
+        last = self.bucket(self.clock() if now is None else now)
+        return last - math.ceil(seconds / self.bucket_seconds) + 1, last + 1
+
+    def counts(self, start: Optional[float] = None, end: Optional[float] = None,
+               meme_id: Optional[Hashable] = None) -> np.ndarray:
+        """Return stance counts in ``[start, end)``.
+
+        Args:
+            start (float, optional): Window start in seconds (default: oldest retained)
+            end (float, optional): Window end in seconds (default: newest)
+            meme_id (Hashable, optional): Restrict to one meme (default: all memes)
+
+        Returns:
+            np.ndarray: Count per stance code
+        """
+        return self._counts(*self._window(start, end), meme_id)
+
+    def by_meme(self, start: Optional[float] = None,
+                end: Optional[float] = None) -> Tuple[List[Hashable], np.ndarray]:
+        """Return the stance counts in ``[start, end)`` of every meme with events there.
+
+        Args:
+            start (float, optional): Window start in seconds (default: oldest retained)
+            end (float, optional): Window end in seconds (default: newest)
+
+        Returns:
+            Tuple[List[Hashable], np.ndarray]: Meme IDs and their
+                ``(memes, n_stances)`` counts
+        """
+        rows, counts = self._by_row(*self._window(start, end))
+        return [self._ids[row] for row in rows.tolist()], counts
+
+    def series(self, start: Optional[float] = None,
+               end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the stance counts of the retained buckets in ``[start, end)``, oldest first.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Bucket start times and the
+                ``(buckets, n_stances)`` counts summed over memes
+        """
+        found = sorted(self._in_window(*self._window(start, end)), key=lambda item: item[0])
+        n = self.n_stances
+        counts = np.zeros((len(found), n), dtype=np.int64)
+        for i, (_, bucket) in enumerate(found):
+            keys, bucket_counts = bucket.arrays()
+            counts[i] = np.bincount(keys % n, weights=bucket_counts, minlength=n)
+        starts = np.array([index for index, _ in found], dtype=np.float64) * self.bucket_seconds
+        return starts, counts
+
+    def sliding(self, seconds: float, meme_id: Optional[Hashable] = None, now: Optional[float] = None) -> np.ndarray:
+        """Return stance counts over the last ``seconds`` up to ``now`` (default: ``clock()``).
+
+        The window is the bucket containing ``now`` and the buckets before it,
+        ``ceil(seconds / bucket_seconds)`` in all.
+
+        Returns:
+            np.ndarray: As ``counts``
+        """
+        return self._counts(*self._sliding_window(seconds, now), meme_id)
+
+    def tumbling(self, seconds: float, start: Optional[float] = None, end: Optional[float] = None,
+                 meme_id: Optional[Hashable] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return stance counts in consecutive, non-overlapping windows of ``seconds``.
+
+        Windows are aligned to multiples of ``seconds`` since the epoch.
+
+        Args:
+            seconds (float): Window width, a multiple of ``bucket_seconds``
+            start (float, optional): Start of the first window (default: oldest retained)
+            end (float, optional): End of the range (default: newest)
+            meme_id (Hashable, optional): Restrict to one meme
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Window start times and the
+                ``(windows, n_stances)`` counts, summed over memes unless
+                ``meme_id`` is given
+        """
+        per_window = seconds / self.bucket_seconds
+        if per_window < 1 or abs(per_window - round(per_window)) > 1e-9:
+            raise ValueError("seconds must be a multiple of bucket_seconds")
+        per_window = round(per_window)
+        if not self._buckets:
+            return np.empty(0), np.zeros((0, self.n_stances), dtype=np.int64)
+        first = self.first_bucket if start is None else math.ceil(start / self.bucket_seconds)
+        last = self._newest if end is None else math.ceil(end / self.bucket_seconds) - 1
+        first_window, last_window = first // per_window, last // per_window
+        n_windows = max(0, last_window - first_window + 1)
+
+        keys, counts, windows = [], [], []
+        for index, bucket in self._in_window(first, last + 1):
+            bucket_keys, bucket_counts = bucket.arrays()
+            keys.append(bucket_keys)
+            counts.append(bucket_counts)
+            windows.append(np.full(len(bucket_keys), index // per_window - first_window, dtype=np.int64))
+        n = self.n_stances
+        keys, counts, windows = (np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+                                 for parts in (keys, counts, windows))
+        if meme_id is not None:
+            mask = keys // n == self._rows.get(meme_id, -1)
+            keys, counts, windows = keys[mask], counts[mask], windows[mask]
+        flat = np.bincount(windows * n + keys % n, weights=counts, minlength=n_windows * n)
+        starts = (first_window + np.arange(n_windows)) * seconds
+        return starts, flat.astype(np.int64).reshape(n_windows, n)
+
+    def top_shifts(self, k: int, seconds: float, now: Optional[float] = None,
+                   code: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Rank memes by the change in their stance mix between two consecutive windows.
+
+        The windows are the last ``seconds`` before ``now`` and the ``seconds``
+        before that. The shift is the total variation distance between the two
+        stance distributions (half the L1 distance, in [0, 1]), or with
+        ``code`` the signed change in that stance's share. Memes without
+        events in both windows are skipped.
+
+        Args:
+            k (int): Number of memes to return
+            seconds (float): Window width
+            now (float, optional): End of the recent window (default: ``clock()``)
+            code (int, optional): Rank by the change in this stance's share
+
+        Returns:
+            List[Tuple[Hashable, float]]: ``(meme_id, shift)`` pairs, largest shift first
+        """
+        now = self.clock() if now is None else now
+        recent_rows, recent = self._by_row(*self._sliding_window(seconds, now))
+        previous_rows, previous = self._by_row(*self._sliding_window(seconds, now - seconds))
+        rows, in_recent, in_previous = np.intersect1d(recent_rows, previous_rows, assume_unique=True,
+                                                      return_indices=True)
+        if not len(rows) or k <= 0:
+            return []
+        recent, previous = recent[in_recent], previous[in_previous]
+        p = recent / recent.sum(axis=1, keepdims=True)
+        q = previous / previous.sum(axis=1, keepdims=True)
+        shift = p[:, code] - q[:, code] if code is not None else 0.5 * np.abs(p - q).sum(axis=1)
+        if k < len(rows):
+            top = np.argpartition(-shift, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-shift[top], kind="stable")]
+        return [(self._ids[rows[i]], float(shift[i])) for i in top]
@@ -0,0 +1,104 @@
+'''
+telemetry.py: Aggregated, rate-limited logging for the evolution loop
+
+Instead of one log line per meme, a pool emits a single GenerationEvent per
+generation with population counts, mutation totals per operator and timing.
+GenerationTelemetry logs those events every ``interval`` generations using
+lazy %-style formatting, attaches the event as structured ``extra`` data, and
+picks a small uniform sample of per-meme events for debug-level detail lines,
+so nothing is formatted unless the corresponding log level is enabled.
+
+Importing this module (or memetics) does not configure logging; applications
+choose their own handlers and levels.
+
+Licensed under CC-BY 4.0: https://creativecommons.org/licenses/by/4.0/
+'''
+
+import logging
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class GenerationEvent:
+    """Summary of one generation of evolution.
+
+    Attributes:
+        generation (int): Generation number after evolving
+        population (int): Pool size before selection
+        survivors (int): Memes kept by selection
+        offspring (int): Offspring produced
+        mutated (int): Offspring changed by at least one mutation operator
+        mutations (Dict[str, int]): Memes changed, per operator name
+        duration (float): Wall time of the generation in seconds
+    """
+
+    generation: int
+    population: int
+    survivors: int
+    offspring: int
+    mutated: int
+    mutations: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the event as a plain dictionary (for JSON or structured logs)."""
+        return asdict(self)
+
+
+class GenerationTelemetry:
+    """Logs aggregated generation events and rations debug detail.
+
+    Args:
+        logger (logging.Logger): Logger to write to
+        interval (int): Log every ``interval``-th generation at INFO level
+        debug_samples (int): Maximum per-meme DEBUG lines per generation
+        debug_seed (int, optional): Seed of the generator that picks them
+
+    Attributes:
+        last_event (GenerationEvent or None): The most recent event, logged or not
+    """
+
+    def __init__(self, logger: logging.Logger, interval: int = 1, debug_samples: int = 5,
+                 debug_seed: Optional[int] = None):
+        self.logger = logger
+        self.interval = max(1, interval)
+        self.debug_samples = debug_samples
+        self.last_event: Optional[GenerationEvent] = None
+        # Separate from the pool's generator, so enabling DEBUG does not change a seeded run
+        self._debug_rng = random.Random(debug_seed)
+
+    def debug_sample(self, count: int) -> List[int]:
+        """Pick which of ``count`` per-meme events get a DEBUG line this generation.
+
+        Up to ``debug_samples`` positions are drawn uniformly without
+        replacement, so late events are as likely to be shown as early ones.
+
+        Args:
+            count (int): Number of events this generation
+
+        Returns:
+            List[int]: Positions in ``range(count)``, ascending; empty unless
+                DEBUG is enabled for the logger
+        """
+        if count <= 0 or not self.logger.isEnabledFor(logging.DEBUG):
+            return []
+        if count <= self.debug_samples:
+            return list(range(count))
+        return sorted(self._debug_rng.sample(range(count), self.debug_samples))
+
+    def emit(self, event: GenerationEvent) -> None:
+        """Record ``event`` and log it if this generation falls on the interval.
+
+        Args:
+            event (GenerationEvent): The generation summary
+        """
+        self.last_event = event
+        if event.generation % self.interval == 0 and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Generation %d: %d -> %d memes (%d survivors, %d offspring, %d mutated) in %.3fs",
+                event.generation, event.population, event.survivors + event.offspring,
+                event.survivors, event.offspring, event.mutated, event.duration,
+                extra={"telemetry": event.as_dict()}
+            )
@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import matplotlib
+matplotlib.use("Agg")
+
+import analysis_tools
+from analysis_tools import generate_coevolution_report, network_layout, plot_meme_complex_network, run_reports
+from meme_complex import Meme, MemeComplex
+
+
+def make_complex(name, size):
+    mc = MemeComplex(name, seed=0)
+    for i in range(size):
+        mc.add_meme(Meme(id=f"{name}{i}", content=name, fitness=1.0 + i / size))
+    mc.network.add_edges_from((f"{name}{i}", f"{name}{i + 1}") for i in range(size - 1))
+    return mc
+
+
+class TestRunReports(unittest.TestCase):
+
+    def setUp(self):
+        self.complexes = [make_complex(f"c{k}", 5 + k) for k in range(4)]
+
+    def test_parallel_matches_serial(self):
+        expected = [mc.report() for mc in self.complexes]
+        frame = run_reports(self.complexes, max_workers=2)
+        self.assertEqual(list(frame["name"]), [r["name"] for r in expected])
+        for row, report in zip(frame.to_dict("records"), expected):
+            self.assertEqual(row["memes_count"], report["memes_count"])
+            self.assertAlmostEqual(row["coevolution_strength"], report["coevolution_strength"])
+            self.assertAlmostEqual(row["avg_fitness"], report["avg_fitness"])
+
+    def test_memoized_until_version_changes(self):
+        run_reports(self.complexes, max_workers=1)
+        with mock.patch.object(MemeComplex, "report", autospec=True, side_effect=MemeComplex.report) as report:
+            run_reports(self.complexes, max_workers=1)
+            self.assertEqual(report.call_count, 0)
+            self.complexes[1].network.add_edge("c14", "c10")
+            self.complexes[2].evolve()
+            frame = run_reports(self.complexes, max_workers=1)
+            self.assertEqual(report.call_count, 2)
+        self.assertEqual(frame.loc[2, "generation"], 1)
+
+    def test_direct_changes_invalidate_cache(self):
+        run_reports(self.complexes, max_workers=1)
+        meme = next(iter(self.complexes[0].memes))
+        meme.fitness += 1.0
+        self.complexes[3].fitness_history.append(5.0)
+        with mock.patch.object(MemeComplex, "report", autospec=True, side_effect=MemeComplex.report) as report:
+            frame = run_reports(self.complexes, max_workers=1)
+            self.assertEqual(report.call_count, 2)
+        self.assertAlmostEqual(frame.loc[0, "avg_fitness"], self.complexes[0].report()["avg_fitness"])
+
+    def test_small_batches_run_inline(self):
+        with mock.patch.object(analysis_tools, "ProcessPoolExecutor") as executor:
+            run_reports(self.complexes[:2])
+        executor.assert_not_called()
+
+    def test_sorted_report(self):
+        frame = generate_coevolution_report(self.complexes, max_workers=1)
+        self.assertTrue(frame["coevolution_strength"].is_monotonic_decreasing)
+        self.assertTrue(generate_coevolution_report([]).empty)
+
+
+
+class TestPlotNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.mc = make_complex("p", 30)
+        self.mc.network.add_edge("p0", "p5", weight=2.0)
+
+    def test_png_to_buffer_without_pyplot(self):
+        buffer = io.BytesIO()
+        with mock.patch.object(analysis_tools.plt, "show") as show:
+            plot_meme_complex_network(self.mc, output=buffer, layout="spectral")
+        show.assert_not_called()
+        self.assertTrue(buffer.getvalue().startswith(b"\x89PNG"))
+
+    def test_svg_to_file_with_level_of_detail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "network.svg")
+            with self.assertLogs(analysis_tools.logger, "WARNING"):
+                fig = plot_meme_complex_network(self.mc, output=path, max_nodes=10, label_limit=5)
+            with open(path, "rb") as f:
+                self.assertIn(b"<svg", f.read(500))
+        self.assertEqual(len(fig.axes[0].collections[0].get_offsets()), 10)
+
+    def test_layout_cached_until_change(self):
+        pos = network_layout(self.mc, "spectral")
+        self.assertIs(network_layout(self.mc, "spectral"), pos)
+        self.mc.network.add_edge("p1", "p9")
+        self.assertIsNot(network_layout(self.mc, "spectral"), pos)
+        with self.assertRaises(ValueError):
+            network_layout(self.mc, "sfdp")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+
+
+class TestArrayMemePool(unittest.TestCase):
+
+    def setUp(self):
+        stances = list(MemeStance)
+        self.memes = [
+            Meme(
+                id=f"meme_{i:03d}",
+                content="The world is a simulation" if i % 2 else "Memes are genes",
+                mutation_rate=0.5,
+                initial_fitness=round(0.1 + (i % 7) * 0.1, 2),
+                stance=stances[i % len(stances)]
+            )
+            for i in range(40)
+        ]
+
+    def test_round_trip(self):
+        pool = ArrayMemePool.from_dicts([m.to_dict() for m in self.memes])
+        self.assertEqual(len(pool), 40)
+        self.assertEqual(pool.to_dicts(), [m.to_dict() for m in self.memes])
+        self.assertEqual(pool.to_memes(), self.memes)
+
+    def test_fitness_matches_meme(self):
+        pool = ArrayMemePool.from_memes(self.memes)
+        expected = [m.get_fitness() for m in self.memes]
+        np.testing.assert_allclose(pool.fitness_vector(), expected)
+        self.assertEqual(pool.get_top_index(), expected.index(max(expected)))
+
+    def test_evolve_matches_meme_pool(self):
+        reference = MemePool()
+        for meme in self.memes:
+            reference.add_meme(meme)
+        pool = ArrayMemePool.from_memes(self.memes, seed=0)
+
+        for _ in range(3):
+            reference.evolve(0.4)
+            pool.evolve(0.4)
+
+        self.assertEqual(pool.generation, reference.generation)
+        self.assertEqual(len(pool), len(reference.memes))
+        np.testing.assert_allclose(
+            np.sort(pool.fitness_vector()),
+            np.sort([m.get_fitness() for m in reference.memes])
+        )
+        self.assertEqual(
+            Counter(d["stance"] for d in pool.iter_dicts()),
+            Counter(m.stance.value for m in reference.memes)
+        )
+
+    def test_mutation_rewrites_first_word(self):
+        meme = Meme(id="m", content="The world is a simulation", mutation_rate=1.0,
+                    initial_fitness=0.5, stance=MemeStance.IRONIC)
+        pool = ArrayMemePool.from_memes([meme], seed=1)
+        pool.evolve(1.0)
+
+        self.assertEqual(len(pool), 3)
+        self.assertEqual(pool.meme_id(0), "m")
+        for row in (1, 2):
+            first, rest = pool.contents[pool.content_index[row]].split(" ", 1)
+            self.assertIn(first, ["this", "that", "our"])
+            self.assertEqual(rest, "world is a simulation")
+            self.assertEqual(pool.versions[row], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
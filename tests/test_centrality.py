@@ -0,0 +1,79 @@
+import math
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+import meme_complex
+from centrality import harmonic_total, sample_size
+from meme_complex import Meme, MemeComplex
+
+
+def random_complex(size, edges, backend="networkx", seed=0):
+    rng = np.random.default_rng(seed)
+    mc = MemeComplex("c", backend=backend)
+    for i in range(size):
+        mc.add_meme(Meme(id=f"m{i}", content="x", fitness=1.0))
+    pairs = rng.integers(0, size, size=(edges, 2))
+    mc.network.add_edges_from((f"m{u}", f"m{v}") for u, v in pairs.tolist() if u != v)
+    return mc
+
+
+class TestHarmonicCentrality(unittest.TestCase):
+
+    def test_sample_size(self):
+        self.assertEqual(sample_size(0.1, 0.05), math.ceil(math.log(40) / 0.02))
+        with self.assertRaises(ValueError):
+            sample_size(0.0)
+
+    def test_exact_matches_networkx(self):
+        for backend in ("networkx", "sparse"):
+            mc = random_complex(60, 150, backend)
+            expected = np.mean(list(nx.harmonic_centrality(mc.to_networkx()).values()))
+            self.assertAlmostEqual(mc.coevolution_strength(), expected)
+
+    def test_sampled_estimate_within_bound(self):
+        mc = random_complex(600, 2400, "sparse", seed=1)
+        exact = mc.coevolution_strength()
+        epsilon = 0.1
+        self.assertLess(sample_size(epsilon), 600)
+        estimate = mc.coevolution_strength(epsilon=epsilon, seed=3)
+        self.assertLessEqual(abs(estimate - exact), epsilon * 599)
+
+    def test_total_of_tiny_graph(self):
+        self.assertEqual(harmonic_total(nx.to_scipy_sparse_array(nx.DiGraph([(0, 1)]))), 1.0)
+
+    def test_cache_rescales_for_isolated_memes(self):
+        mc = random_complex(30, 60)
+        before = mc.coevolution_strength()
+        with mock.patch.object(meme_complex, "harmonic_total", wraps=meme_complex.harmonic_total) as total:
+            mc.add_meme(Meme(id="isolated", content="x"))
+            self.assertAlmostEqual(mc.coevolution_strength(), before * 30 / 31)
+            self.assertEqual(total.call_count, 0)
+            mc.network.add_edge("isolated", "m0")
+            mc.coevolution_strength()
+            self.assertEqual(total.call_count, 1)
+
+    def test_cache_is_keyed_on_sampling_seed(self):
+        mc = random_complex(200, 400, "sparse", seed=2)
+        with mock.patch.object(meme_complex, "harmonic_total", wraps=meme_complex.harmonic_total) as total:
+            first = mc.coevolution_strength(epsilon=0.2, seed=1)
+            self.assertEqual(mc.coevolution_strength(epsilon=0.2, seed=1), first)
+            self.assertEqual(total.call_count, 1)
+            mc.coevolution_strength(epsilon=0.2, seed=2)
+            self.assertEqual(total.call_count, 2)
+            rng = np.random.default_rng(0)
+            mc.coevolution_strength(epsilon=0.2, seed=rng)
+            mc.coevolution_strength(epsilon=0.2, seed=rng)
+            self.assertEqual(total.call_count, 4)
+
+    def test_sparse_backend_invalidates_on_edges(self):
+        mc = random_complex(10, 0, "sparse")
+        self.assertEqual(mc.coevolution_strength(), 0.0)
+        mc.network.add_edge("m0", "m1")
+        self.assertAlmostEqual(mc.coevolution_strength(), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from content_store import ContentStore
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+
+
+class TestContentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ContentStore()
+
+    def test_intern_deduplicates(self):
+        first = self.store.intern("The world is a simulation")
+        second = self.store.intern("The world is a simulation")
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.store), 1)
+        self.assertIs(self.store.canonical("The world " + "is a simulation"), self.store[first])
+
+    def test_edit(self):
+        handle = self.store.intern("The world is a simulation")
+        edited = self.store.edit(handle, ("A",) + self.store.words(handle)[1:])
+        self.assertEqual(self.store[edited], "A world is a simulation")
+        self.assertEqual(self.store.edit(handle, self.store.words(handle)), handle)
+        self.assertEqual(len(self.store), 2)
+
+    def test_compact_renumbers_live_contents(self):
+        a, b, c = (self.store.intern(text) for text in ("a b", "c", "d e"))
+        self.store.words(c)
+        self.store.cached("key", lambda: a)
+        mapping = self.store.compact([c, a, c])
+        self.assertEqual(mapping.tolist(), [0, -1, 1])
+        self.assertEqual(list(self.store), ["a b", "d e"])
+        self.assertEqual(self.store.intern("d e"), 1)
+        self.assertEqual(self.store.words(1), ("d", "e"))
+        self.assertEqual(len(self.store._memo), 0)
+        self.assertEqual(self.store.intern("c"), 2)
+
+    def test_memo_is_bounded(self):
+        store = ContentStore(memo_size=2)
+        calls = []
+        for key in ("a", "b", "a", "c", "b"):
+            store.cached(key, lambda: calls.append(key) or key.upper())
+        # "b" was least recently used when "c" arrived
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        self.assertEqual(len(store._memo), 2)
+
+    def test_dedup_stats(self):
+        a = self.store.intern("abc")
+        b = self.store.intern("de")
+        stats = self.store.dedup_stats([a, a, a, b])
+        self.assertEqual(stats["references"], 4)
+        self.assertEqual(stats["distinct"], 2)
+        self.assertEqual(stats["dedup_ratio"], 2.0)
+        self.assertEqual(stats["bytes_stored"], 5)
+        self.assertEqual(stats["bytes_referenced"], 11)
+
+
+class TestPoolContentSharing(unittest.TestCase):
+
+    def make_memes(self):
+        return [
+            Meme(f"meme_{i:03d}", "The world is a simulation", 0.5, 0.5 + i / 100, MemeStance.SUPPORTIVE)
+            for i in range(20)
+        ]
+
+    def test_meme_pool_shares_contents(self):
+        pool = MemePool(seed=3)
+        for meme in self.make_memes():
+            pool.add_meme(meme)
+        for _ in range(5):
+            pool.evolve()
+        stats = pool.content_stats()
+        self.assertEqual(stats["references"], len(pool.memes))
+        self.assertLessEqual(stats["distinct"], len(pool.contents))
+        self.assertGreater(stats["dedup_ratio"], 1.0)
+        for meme in pool.memes:
+            self.assertIs(meme.content, pool.contents.canonical(meme.content))
+
+    def test_array_pool_stats(self):
+        pool = ArrayMemePool.from_memes(self.make_memes(), seed=3)
+        for _ in range(5):
+            pool.evolve()
+        stats = pool.content_stats()
+        self.assertEqual(stats["references"], len(pool))
+        self.assertGreater(stats["dedup_ratio"], 1.0)
+
+    def test_pools_reclaim_unused_contents(self):
+        memes = [Meme(f"meme_{i:03d}", f"The world {i}", 1.0, 0.5, MemeStance.SUPPORTIVE) for i in range(4)]
+        pool = MemePool(seed=4)
+        for meme in memes:
+            pool.add_meme(meme)
+        array_pool = ArrayMemePool.from_memes(memes, seed=4)
+        for p in (pool, array_pool):
+            for i in range(5000):
+                p.contents.intern(f"unused {i}")
+            p.evolve(1.0)
+            self.assertLess(len(p.contents), 100)
+        self.assertEqual(len(pool.memes), 12)
+        self.assertEqual({d["content"].split()[-1] for d in array_pool.iter_dicts()}, {"0", "1", "2", "3"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from fitness_history import FitnessHistory
+from meme_complex import Meme, MemeComplex
+
+
+class TestFitnessHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(0).uniform(0.0, 2.0, 500)
+
+    def test_unbounded_matches_numpy(self):
+        history = FitnessHistory()
+        history.extend(self.values)
+        self.assertEqual(len(history), 500)
+        np.testing.assert_array_equal(history.values(), self.values)
+        self.assertAlmostEqual(history.std_of_diffs(), np.std(np.diff(self.values)))
+
+    def test_window_matches_numpy(self):
+        history = FitnessHistory(window=50)
+        for i, value in enumerate(self.values, start=1):
+            history.append(value)
+            kept = self.values[max(0, i - 50):i]
+            self.assertEqual(len(history), len(kept))
+            self.assertAlmostEqual(history.std_of_diffs(), np.std(np.diff(kept)) if i > 1 else 0.0)
+        np.testing.assert_array_equal(np.asarray(history), self.values[-50:])
+        self.assertEqual(list(history)[-1], self.values[-1])
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            FitnessHistory(window=1)
+
+    def test_meme_complex_window(self):
+        mc = MemeComplex("c", history_window=3)
+        for i, fitness in enumerate([1.0, 5.0, 1.0, 1.5, 2.0]):
+            mc.add_meme(Meme(id=f"m{i}", content="x", fitness=fitness))
+        self.assertEqual(list(mc.fitness_history), [1.0, 1.5, 2.0])
+        self.assertEqual(mc.get_stability_score(), 1.0)
+        self.assertEqual(mc.merge(MemeComplex("d")).fitness_history.window, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
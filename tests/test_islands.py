@@ -0,0 +1,103 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+from islands import IslandModel
+
+
+def make_pool(size=24):
+    pool = MemePool()
+    stances = list(MemeStance)
+    for i in range(size):
+        pool.add_meme(Meme(
+            id=f"meme_{i}",
+            content="The world is a simulation",
+            mutation_rate=0.3,
+            initial_fitness=0.02 * (i + 1),
+            stance=stances[i % len(stances)]
+        ))
+    return pool
+
+
+class TestIslandModel(unittest.TestCase):
+
+    def test_sharding(self):
+        model = IslandModel.from_pool(make_pool(), n_islands=4)
+        self.assertEqual([len(island) for island in model.islands], [6, 6, 6, 6])
+
+    def test_routes(self):
+        self.assertEqual(IslandModel(n_islands=3, topology="ring").routes(), [[1], [2], [0]])
+        self.assertEqual(IslandModel(n_islands=3, topology="full").routes(), [[1, 2], [0, 2], [0, 1]])
+        for i, targets in enumerate(IslandModel(n_islands=5, topology="random", seed=3).routes()):
+            self.assertEqual(len(targets), 1)
+            self.assertNotEqual(targets[0], i)
+        with self.assertRaises(ValueError):
+            IslandModel(topology="star")
+
+    def test_migration_copies_top_memes(self):
+        model = IslandModel.from_pool(make_pool(), n_islands=2, migrants=2, topology="ring")
+        top = model.islands[0].to_batch(model.islands[0].top_rows(2))
+        model.migrate()
+        self.assertEqual(len(model.islands[1]), 14)
+        self.assertEqual([model.islands[1].meme_id(row) for row in (12, 13)],
+                         [f"{label}-migrated-{origin}" for label, origin in zip(top["labels"], top["origins"])])
+
+    def test_migrant_ids_stay_short_and_keep_ancestry(self):
+        model = IslandModel.from_pool(make_pool(), n_islands=2, migrants=1, topology="ring",
+                                      selection_pressure=0.5, seed=1)
+        for _ in range(4):
+            for island in model.islands:
+                island.evolve()
+            model.migrate()
+        island = model.islands[0]
+        row = int(np.argmax(island.ids))
+        self.assertEqual(island.meme_id(row).count("-migrated-"), 1)
+        chain = model.ancestry(int(island.ids[row]))
+        self.assertEqual({uid // 10 ** 9 for uid in chain}, {0, 1})
+        root = chain[-1]
+        self.assertEqual(model.islands[root // 10 ** 9].lineage.origins.get(root), None)
+        self.assertTrue(model.islands[root // 10 ** 9].lineage.labels[root].startswith("meme_"))
+
+    def test_run_is_reproducible(self):
+        pool = make_pool()
+        results = []
+        for _ in range(2):
+            model = IslandModel.from_pool(pool, n_islands=3, migration_interval=2,
+                                          selection_pressure=1 / 3, max_workers=2, seed=42)
+            model.run(5)
+            results.append([m.to_dict() for m in model.to_memes()])
+        self.assertEqual(model.generation, 5)
+        self.assertEqual(results[0], results[1])
+        ids = [d["id"] for d in results[0]]
+        self.assertEqual(len(ids), model.population_size())
+        self.assertTrue(all(i.startswith("meme_") for i in ids))
+
+    def test_array_pool_pickles_compactly(self):
+        pool = ArrayMemePool.from_memes(make_pool().memes, seed=0)
+        pool.evolve()
+        restored = pickle.loads(pickle.dumps(pool))
+        self.assertEqual(restored.to_dicts(), pool.to_dicts())
+        self.assertEqual(restored.generation, 1)
+
+    def test_fork_ships_only_new_lineage_rows(self):
+        memes = make_pool().memes
+        pools = [ArrayMemePool.from_memes(memes, seed=5) for _ in range(2)]
+        for _ in range(3):
+            pools[0].evolve()
+        for _ in range(3):
+            fork = pickle.loads(pickle.dumps(pools[1].fork()))
+            fork.evolve()
+            fork = pickle.loads(pickle.dumps(fork))
+            self.assertEqual(fork.lineage.id_base, len(pools[1].lineage))
+            pools[1].join(fork)
+        self.assertEqual(pools[1].to_dicts(), pools[0].to_dicts())
+        self.assertEqual(list(pools[1].lineage.depths), list(pools[0].lineage.depths))
+        with self.assertRaises(ValueError):
+            pools[1].join(fork)
+
+
+if __name__ == "__main__":
+    unittest.main()
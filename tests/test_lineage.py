@@ -0,0 +1,166 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from lineage import KIND_COPY, KIND_MUTATED, Lineage, MemeId
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+
+
+class TestLineage(unittest.TestCase):
+
+    def setUp(self):
+        self.lineage = Lineage()
+        self.root = self.lineage.add_root("meme_001")
+        self.copy = self.lineage.allocate(self.root, KIND_COPY)
+        self.mutant = self.lineage.allocate(self.copy, KIND_MUTATED)
+
+    def test_render_legacy_ids(self):
+        self.assertEqual(self.lineage.render(self.root), "meme_001")
+        self.assertEqual(self.lineage.render(self.mutant), "meme_001-copy-1-mutated-2")
+        self.assertEqual(self.lineage.ancestry(self.mutant), [2, 1, 0])
+
+    def test_allocate_many(self):
+        uids = self.lineage.allocate_many(np.array([self.root, self.mutant]), KIND_COPY)
+        np.testing.assert_array_equal(uids, [3, 4])
+        self.assertEqual(self.lineage.parent(4), self.mutant)
+        self.assertEqual(self.lineage.render(4), "meme_001-copy-1-mutated-2-copy-4")
+
+    def test_id_base(self):
+        lineage = Lineage(id_base=1000)
+        root = lineage.add_root("x")
+        self.assertEqual(lineage.render(lineage.allocate(root, KIND_COPY)), "x-copy-1001")
+
+    def test_meme_id_handle(self):
+        handle = self.lineage.handle(self.copy)
+        self.assertEqual(f"{handle}", "meme_001-copy-1")
+        self.assertNotEqual(handle, "meme_001-copy-1")
+        restored = pickle.loads(pickle.dumps(handle))
+        self.assertEqual(restored, handle)
+        self.assertEqual(hash(restored), hash(handle))
+        self.assertNotEqual(handle, self.lineage.handle(self.mutant))
+        self.assertNotEqual(handle, Lineage().handle(self.copy))
+        self.assertIsInstance(handle.child(KIND_COPY), MemeId)
+
+
+class TestPhylogenyQueries(unittest.TestCase):
+
+    def setUp(self):
+        # Random forest of three roots; parents always precede children
+        self.rng = np.random.default_rng(5)
+        self.lineage = Lineage(id_base=100)
+        for label in ("a", "b", "c"):
+            self.lineage.add_root(label)
+        for _ in range(400):
+            parent = 100 + int(self.rng.integers(0, len(self.lineage)))
+            self.lineage.allocate(parent, KIND_COPY)
+
+    def brute_ancestors(self, uid):
+        return self.lineage.ancestry(uid)
+
+    def test_root_and_depth(self):
+        for uid in range(100, 100 + len(self.lineage)):
+            chain = self.brute_ancestors(uid)
+            self.assertEqual(self.lineage.root_of(uid), chain[-1])
+            self.assertEqual(self.lineage.depth(uid), len(chain) - 1)
+
+    def test_clade_size(self):
+        counts = {}
+        for uid in range(100, 100 + len(self.lineage)):
+            for ancestor in self.brute_ancestors(uid):
+                counts[ancestor] = counts.get(ancestor, 0) + 1
+        for uid, count in counts.items():
+            self.assertEqual(self.lineage.clade_size(uid), count)
+
+    def test_common_ancestor(self):
+        size = len(self.lineage)
+        for _ in range(300):
+            a, b = (100 + int(x) for x in self.rng.integers(0, size, 2))
+            shared = set(self.brute_ancestors(a))
+            expected = next((u for u in self.brute_ancestors(b) if u in shared), -1)
+            self.assertEqual(self.lineage.common_ancestor(a, b), expected)
+
+    def test_index_rebuilds_after_append(self):
+        before = self.lineage.clade_size(100)
+        self.lineage.allocate(100, KIND_MUTATED)
+        self.assertEqual(self.lineage.clade_size(100), before + 1)
+
+    def test_save_and_load(self):
+        migrant = self.lineage.add_migrant("z", 7)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "lineage.npz")
+            self.lineage.save(path)
+            restored = Lineage.load(path)
+        last = 100 + len(self.lineage) - 1
+        self.assertEqual(restored.render(last), self.lineage.render(last))
+        self.assertEqual(restored.common_ancestor(last, 150), self.lineage.common_ancestor(last, 150))
+        self.assertEqual(restored.render(migrant), "z-migrated-7")
+        self.assertEqual(restored.origins, {migrant: 7})
+        restored.allocate(last, KIND_COPY)
+
+
+class TestPoolIds(unittest.TestCase):
+
+    def make_meme(self):
+        return Meme(id="meme_001", content="The world is a simulation", mutation_rate=1.0,
+                    initial_fitness=0.5, stance=MemeStance.IRONIC)
+
+    def test_meme_pool_ids_do_not_grow(self):
+        pool = MemePool(seed=0)
+        pool.add_meme(self.make_meme())
+        for _ in range(30):
+            pool.evolve(1.0)
+            pool.memes = pool.memes[-1:]
+        deepest = pool.memes[0]
+        self.assertIsInstance(deepest.id, str)
+        self.assertGreaterEqual(len(pool.lineage.ancestry(pool.uid_of(deepest))), 31)
+        mutations = sum(1 for kind in pool.lineage.kinds if kind == KIND_MUTATED)
+        self.assertEqual(len(pool.lineage), 1 + 2 * 30 + mutations)
+        self.assertTrue(deepest.to_dict()["id"].startswith("meme_001-copy-"))
+        self.assertEqual(Meme.from_dict(deepest.to_dict()), deepest)
+
+    def test_checkpoint_restores_lineage(self):
+        pool = MemePool(seed=1)
+        pool.add_meme(self.make_meme())
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "pool.jsonl")
+            for _ in range(3):
+                pool.evolve(1.0)
+                pool.checkpoint(path)
+            restored = MemePool()
+            restored.load_from_jsonl(path)
+        meme = restored.memes[-1]
+        self.assertEqual(meme.id, pool.memes[-1].id)
+        self.assertEqual(restored.uid_of(meme), pool.uid_of(pool.memes[-1]))
+        self.assertEqual(restored.lineage.render(restored.lineage.root_of(restored.uid_of(meme))), "meme_001")
+        self.assertEqual(restored.lineage.clade_size(0), len(pool.lineage))
+
+    def test_add_meme_keeps_caller_fields(self):
+        meme = self.make_meme()
+        content = meme.content
+        pool = MemePool(seed=0)
+        pool.add_meme(meme)
+        self.assertIsInstance(meme.id, str)
+        self.assertEqual(meme.id, "meme_001")
+        self.assertIs(meme.content, content)
+        self.assertIn(meme.id, {"meme_001": 1})
+        self.assertEqual(pool.uid_of(meme), 0)
+        self.assertIsNone(MemePool().uid_of(meme))
+
+    def test_unmanaged_meme_keeps_legacy_ids(self):
+        child = self.make_meme().replicate(np.random.default_rng(0))
+        self.assertIsInstance(child.id, str)
+        self.assertRegex(child.id, r"^meme_001-copy-\d{4}$")
+
+    def test_array_pool_ids(self):
+        pool = ArrayMemePool.from_memes([self.make_meme()], seed=0)
+        pool.evolve(1.0)
+        self.assertEqual(pool.meme_id(0), "meme_001")
+        self.assertRegex(pool.meme_id(1), r"^meme_001-copy-\d+-mutated-\d+$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,20 @@
 import unittest
+import warnings
+
+import numpy as np
+
 from meme_complex import Meme, MemeComplex
 
 
+def random_complex(name, size, seed):
+    """Complex with coarse fitness values so that ties are common."""
+    rng = np.random.default_rng(seed)
+    mc = MemeComplex(name)
+    for i, fitness in enumerate(np.round(rng.uniform(0.1, 2.0, size), 1)):
+        mc.add_meme(Meme(id=f"{name}{i}", content=name, fitness=float(fitness)))
+    return mc
+
+
 class TestMemeComplex(unittest.TestCase):
 
     def setUp(self):
@@ -36,16 +49,91 @@ class TestMemeComplex(unittest.TestCase):
         self.assertIn(self.meme3, merged.memes)
         self.assertEqual(merged.generation, 1)
 
+    def test_merge_matches_correlation_rule(self):
+        first, second = random_complex("a", 30, 1), random_complex("b", 30, 2)
+        second.add_meme(Meme(id="a0", content="shared", fitness=1.0))
+        expected = set(first.network.edges()) | set(second.network.edges())
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore")
+            for m1 in first.memes:
+                for m2 in second.memes:
+                    a, b = first.network.nodes[m1.id]["fitness"], second.network.nodes[m2.id]["fitness"]
+                    if np.corrcoef([a, b], [b, a])[0][1] > 0.6:
+                        expected |= {(m1.id, m2.id), (m2.id, m1.id)}
+        self.assertEqual(set(first.merge(second).network.edges()), expected)
+
+    def test_merge_similarity_matches_brute_force(self):
+        first, second = random_complex("a", 40, 3), random_complex("b", 25, 4)
+        for tolerance in (0.0, 0.1, 0.35):
+            merged = first.merge(second, similarity=tolerance)
+            expected = set()
+            for m1 in first.memes:
+                for m2 in second.memes:
+                    if abs(m1.fitness - m2.fitness) <= tolerance:
+                        expected |= {(m1.id, m2.id), (m2.id, m1.id)}
+            self.assertEqual(set(merged.network.edges()), expected)
+            for u, v, weight in merged.network.edges(data="weight"):
+                self.assertAlmostEqual(weight, 1.0 / (1.0 + abs(merged.network.nodes[u]["fitness"]
+                                                                - merged.network.nodes[v]["fitness"])))
+
     def test_coevolution_strength(self):
-        # Should be non-zero if more than one meme
-        self.assertGreater(self.complex1.coevolution_strength(), 0.0)
+        # Unlinked memes have no paths between them
+        self.assertEqual(self.complex1.coevolution_strength(), 0.0)
         self.assertEqual(self.complex2.coevolution_strength(), 0.0)  # Single meme
 
+    def test_coevolution_strength_of_linked_memes(self):
+        linked = MemeComplex("Linked")
+        linked.add_meme(Meme(id="a", content="Evolution", fitness=1.2))
+        linked.add_meme(Meme(id="b", content="Selection", fitness=1.5))
+        linked.network.add_edge("a", "b")
+        # Harmonic centrality: 1 for a (reaches b), 0 for b
+        self.assertAlmostEqual(linked.coevolution_strength(), 0.5)
+
     def test_evolve(self):
         self.complex1.evolve()
         self.assertEqual(self.complex1.generation, 1)
         self.assertEqual(len(self.complex1.memes), 2)  # Should still have 2 memes
 
+    def test_seeded_evolve_is_reproducible(self):
+        fitness = []
+        for _ in range(2):
+            mc = MemeComplex("Seeded", seed=11)
+            mc.add_meme(self.meme1)
+            mc.add_meme(self.meme2)
+            mc.evolve()
+            fitness.append(sorted((m.id, m.fitness, m.spread_rate) for m in mc.memes))
+        self.assertEqual(fitness[0], fitness[1])
+
+    def test_evolve_preserves_edges(self):
+        for backend in ("networkx", "sparse"):
+            mc = MemeComplex("Linked", seed=5, backend=backend)
+            for meme in (self.meme1, self.meme2, self.meme3):
+                mc.add_meme(meme)
+            mc.network.add_edge("m1", "m2", weight=0.5)
+            mc.network.add_edge("m3", "m1", weight=2.0)
+            strength = mc.coevolution_strength()
+            mc.evolve()
+            mc.evolve()
+            edges = set(mc.network.edges(data="weight"))
+            self.assertEqual(edges, {("m1_mutated_0_mutated_1", "m2_mutated_0_mutated_1", 0.5),
+                                     ("m3_mutated_0_mutated_1", "m1_mutated_0_mutated_1", 2.0)})
+            for meme in mc.memes:
+                self.assertEqual(mc.network.nodes[meme.id]["fitness"], meme.fitness)
+                self.assertTrue(0.1 <= meme.fitness <= 2.0)
+            self.assertAlmostEqual(mc.coevolution_strength(), strength)
+
+    def test_evolve_updates_in_place(self):
+        mc = MemeComplex("InPlace", seed=2)
+        mc.add_meme(self.meme1)
+        mc.add_meme(self.meme2)
+        network, memes = mc.network, {id(m) for m in mc.memes}
+        mc.evolve()
+        self.assertIs(mc.network, network)
+        self.assertEqual({id(m) for m in mc.memes}, memes)
+        self.assertEqual(set(network.nodes), {"m1_mutated_0", "m2_mutated_0"})
+        # The caller's memes are copied on add, so they keep their IDs
+        self.assertEqual((self.meme1.id, self.meme1.fitness), ("m1", 1.2))
+
     def test_report(self):
         report = self.complex1.report()
         self.assertIn("name", report)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+from meme_parquet import GenerationWriter, read_generations
+
+
+class TestGenerationWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "run.parquet")
+        self.pool = MemePool()
+        stances = list(MemeStance)
+        for i in range(8):
+            self.pool.add_meme(Meme(
+                id=f"meme_{i}",
+                content="The world is a simulation",
+                mutation_rate=0.3,
+                initial_fitness=0.1 * (i + 1),
+                stance=stances[i % len(stances)]
+            ))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_run(self, pool, generations=4):
+        with GenerationWriter(self.path) as writer:
+            for _ in range(generations):
+                writer.write(pool)
+                pool.evolve()
+        return writer
+
+    def test_one_row_group_per_generation(self):
+        writer = self.write_run(self.pool)
+        self.assertEqual(writer.generations_written, 4)
+        self.assertEqual(pq.ParquetFile(self.path).num_row_groups, 4)
+
+    def test_types_are_preserved(self):
+        memes = list(self.pool.memes)
+        self.write_run(self.pool, generations=1)
+        df = read_generations(self.path)
+        self.assertIsInstance(df["stance"].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["created_at"]))
+        self.assertEqual(list(df["id"]), [m.id for m in memes])
+        self.assertEqual(list(df["stance"]), [m.stance.value for m in memes])
+        np.testing.assert_allclose(df["fitness"], [m.get_fitness() for m in memes])
+
+    def test_filter_pushdown(self):
+        self.write_run(self.pool)
+        df = read_generations(self.path, generations=(1, 2), stances=[MemeStance.PARODIC, "ironic"],
+                              columns=["generation", "stance"])
+        self.assertEqual(list(df.columns), ["generation", "stance"])
+        self.assertTrue(df["generation"].between(1, 2).all())
+        self.assertEqual(set(df["stance"]), {"parodic", "ironic"})
+
+    def test_array_pool(self):
+        pool = ArrayMemePool.from_memes(self.pool.memes, seed=0)
+        pool.evolve()
+        expected = pool.to_dicts()
+        self.write_run(pool, generations=1)
+        df = read_generations(self.path, generations=(1, 1))
+        self.assertEqual(list(df["id"]), [d["id"] for d in expected])
+        self.assertEqual(list(df["content"]), [d["content"] for d in expected])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from memetics import Meme, MemePool, MemeStance, StanceAnalyzer
+from stance_rollup import StanceRollup
+
+
+class TestMemePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = MemePool()
+        stances = list(MemeStance)
+        for i in range(12):
+            self.pool.add_meme(Meme(
+                id=f"meme_{i:03d}",
+                content="The world is a simulation",
+                mutation_rate=0.0,
+                initial_fitness=0.05 * i,
+                stance=stances[i % len(stances)]
+            ))
+
+    def test_fitness_vector_matches_get_fitness(self):
+        expected = [m.get_fitness() for m in self.pool.memes]
+        np.testing.assert_allclose(self.pool.fitness_vector(), expected)
+
+    def test_fitness_vector_per_meme_engagement(self):
+        engagement = np.linspace(0.5, 2.0, len(self.pool.memes))
+        expected = [m.get_fitness(e) for m, e in zip(self.pool.memes, engagement)]
+        np.testing.assert_allclose(self.pool.fitness_vector(engagement), expected)
+
+    def test_get_top_meme(self):
+        expected = max(self.pool.memes, key=lambda m: m.get_fitness())
+        self.assertIs(self.pool.get_top_meme(), expected)
+        self.assertIsNone(MemePool().get_top_meme())
+
+    def test_evolve_keeps_fittest(self):
+        ranked = sorted(self.pool.memes, key=lambda m: m.get_fitness(), reverse=True)
+        self.pool.evolve(0.5)
+        self.assertEqual(self.pool.generation, 1)
+        self.assertEqual(self.pool.memes[:6], ranked[:6])
+        self.assertEqual(len(self.pool.memes), 18)
+
+    def test_seeded_evolution_is_reproducible(self):
+        runs = []
+        for _ in range(2):
+            pool = MemePool(seed=7)
+            pool.memes = [Meme(id=m.id, content=m.content, mutation_rate=0.5,
+                               initial_fitness=m.initial_fitness, stance=m.stance,
+                               created_at=m.created_at) for m in self.pool.memes]
+            for _ in range(3):
+                pool.evolve()
+            runs.append([m.to_dict() for m in pool.memes])
+        self.assertEqual(runs[0], runs[1])
+
+    def test_meme_methods_accept_generator(self):
+        meme = Meme(id="m", content="The world is a simulation", mutation_rate=1.0,
+                    initial_fitness=0.5, stance=MemeStance.IRONIC)
+        first = meme.replicate(np.random.default_rng(3)).mutate(np.random.default_rng(4))
+        second = meme.replicate(np.random.default_rng(3)).mutate(np.random.default_rng(4))
+        self.assertEqual(first, second)
+        self.assertEqual(first.version, 2)
+        self.assertIn(first.content.split()[0], ["this", "that", "our"])
+
+
+class TestJsonlPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = MemePool()
+        for i in range(5):
+            self.pool.add_meme(Meme(
+                id=f"meme_{i}",
+                content="The world is a simulation",
+                mutation_rate=0.5,
+                initial_fitness=0.1 * (i + 1),
+                stance=MemeStance.IRONIC
+            ))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_round_trip(self):
+        for name in ("pool.jsonl", "pool.jsonl.gz"):
+            self.pool.save_to_jsonl(self.path(name))
+            restored = MemePool()
+            restored.load_from_jsonl(self.path(name))
+            self.assertEqual(restored.memes, self.pool.memes)
+            self.assertEqual(list(MemePool.iter_jsonl(self.path(name))), self.pool.memes)
+
+    def test_incremental_checkpoints(self):
+        path = self.path("checkpoint.jsonl.gz")
+        snapshots = {}
+        for _ in range(3):
+            self.pool.checkpoint(path)
+            snapshots[self.pool.generation] = list(self.pool.memes)
+            self.pool.evolve()
+
+        latest = MemePool()
+        latest.load_from_jsonl(path)
+        self.assertEqual(latest.generation, 2)
+        self.assertEqual([m.to_dict() for m in latest.memes], [m.to_dict() for m in snapshots[2]])
+
+        first = MemePool()
+        first.load_from_jsonl(path, generation=0)
+        self.assertEqual(first.memes, snapshots[0])
+        self.assertEqual(len(list(MemePool.iter_jsonl(path, generation=1))), len(snapshots[1]))
+
+        with self.assertRaises(ValueError):
+            MemePool().load_from_jsonl(path, generation=7)
+
+    def test_stance_log(self):
+        analyzer = StanceAnalyzer()
+        analyzer.add_stance("meme_0", MemeStance.PARODIC)
+        analyzer.add_stance("meme_0", MemeStance.IRONIC)
+        analyzer.add_stance("meme_1", MemeStance.NEUTRAL)
+        analyzer.export_stance_log_jsonl(self.path("stances.jsonl"))
+
+        restored = StanceAnalyzer()
+        restored.load_stance_log_jsonl(self.path("stances.jsonl"))
+        self.assertEqual(restored.stance_history, analyzer.stance_history)
+        self.assertEqual(restored.get_overall_stance_trend(), analyzer.get_overall_stance_trend())
+
+    def test_legacy_stance_log(self):
+        from meme_io import write_jsonl
+        write_jsonl(self.path("legacy.jsonl"), [{"meme_id": "m", "stances": ["ironic", "neutral", "ironic"]}])
+        analyzer = StanceAnalyzer()
+        analyzer.load_stance_log_jsonl(self.path("legacy.jsonl"))
+        self.assertEqual(analyzer.get_stance_distribution("m"), {"ironic": 2, "neutral": 1})
+
+
+class TestStanceAnalyzer(unittest.TestCase):
+
+    def test_counts_match_events(self):
+        stances = list(MemeStance)
+        rng = np.random.default_rng(0)
+        events = [(f"m{rng.integers(40)}", stances[rng.integers(len(stances))]) for _ in range(2000)]
+        analyzer = StanceAnalyzer()
+        for meme_id, stance in events:
+            analyzer.add_stance(meme_id, stance)
+        expected = {}
+        for meme_id, stance in events:
+            counts = expected.setdefault(meme_id, {})
+            counts[stance.value] = counts.get(stance.value, 0) + 1
+        for meme_id, counts in expected.items():
+            self.assertEqual(analyzer.get_stance_distribution(meme_id), counts)
+        self.assertEqual(sum(analyzer.get_overall_stance_trend().values()), 2000)
+        self.assertEqual(analyzer.get_stance_distribution("unknown"), {})
+        self.assertEqual(sorted(analyzer.stance_history["m1"]),
+                         sorted(s.value for m, s in events if m == "m1"))
+
+    def test_stance_history_is_read_only(self):
+        analyzer = StanceAnalyzer()
+        analyzer.add_stance("m", MemeStance.IRONIC)
+        history = analyzer.stance_history
+        with self.assertRaises(AttributeError):
+            history["m"].append(MemeStance.NEUTRAL.value)
+        with self.assertRaises(TypeError):
+            history["n"] = [MemeStance.NEUTRAL.value]
+        with self.assertRaises(AttributeError):
+            analyzer.stance_history = {}
+        self.assertEqual(analyzer.stance_history, {"m": ("ironic",)})
+
+    def test_windowed_trend_uses_rollup(self):
+        analyzer = StanceAnalyzer(rollup=StanceRollup(len(MemeStance), bucket_seconds=60.0))
+        analyzer.add_stance("a", MemeStance.IRONIC, timestamp=0.0)
+        analyzer.add_stance("b", MemeStance.IRONIC, timestamp=90.0)
+        analyzer.add_stance("a", MemeStance.NEUTRAL, timestamp=130.0)
+        self.assertEqual(analyzer.get_overall_stance_trend(60.0, 180.0), {"ironic": 1, "neutral": 1})
+        self.assertEqual(analyzer.get_overall_stance_trend(), {"ironic": 2, "neutral": 1})
+        with self.assertRaises(ValueError):
+            StanceAnalyzer().get_overall_stance_trend(start=0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from content_store import ContentStore
+from mutation_ops import (
+    OPERATORS, FitnessDrift, Lexicon, MutationBatch, MutationPipeline, StanceFlip,
+    SynonymSubstitution, WordDrop, WordInsert
+)
+from memetics import Meme, MemePool, MemeStance, STANCES, SYNONYMS
+from array_pool import ArrayMemePool
+
+
+class TestLexicon(unittest.TestCase):
+
+    def test_compiled_lookup(self):
+        lexicon = Lexicon({"World": ["reality", "planet"], "empty": []})
+        self.assertEqual(lexicon.synonyms("WORLD"), ("reality", "planet"))
+        self.assertEqual(lexicon.synonyms("missing"), ())
+        self.assertNotIn("empty", lexicon)
+        self.assertEqual(lexicon.vocabulary, ("World", "empty", "reality", "planet"))
+
+    def test_load_text_and_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            text = os.path.join(tmp, "lexicon.txt")
+            with open(text, "w", encoding="utf-8") as f:
+                f.write("# comment\nworld: reality, planet\n\nis: are\n")
+            loaded = Lexicon.load(text)
+            self.assertEqual(loaded.synonyms("is"), ("are",))
+            path = os.path.join(tmp, "lexicon.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"world": ["reality"]}')
+            self.assertEqual(Lexicon.load(path).synonyms("world"), ("reality",))
+
+
+class TestOperators(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ContentStore()
+        self.rng = np.random.default_rng(0)
+
+    def make_batch(self, texts):
+        return MutationBatch(
+            content=np.array([self.store.intern(t) for t in texts], dtype=np.int64),
+            stance_codes=np.zeros(len(texts), dtype=np.int8),
+            initial_fitness=np.full(len(texts), 0.5),
+            n_stances=len(STANCES)
+        )
+
+    def test_synonym_any_position(self):
+        batch = self.make_batch(["hello world"] * 50 + ["nothing here"])
+        changed = SynonymSubstitution(SYNONYMS).apply(batch, np.arange(51), self.rng, self.store)
+        self.assertTrue(changed[:50].all())
+        self.assertFalse(changed[50])
+        texts = {self.store[h] for h in batch.content[:50].tolist()}
+        self.assertEqual(texts, {"hello reality", "hello planet", "hello universe"})
+
+    def test_first_word_only(self):
+        batch = self.make_batch(["hello world"])
+        operator = SynonymSubstitution(SYNONYMS, first_word_only=True)
+        self.assertFalse(operator.apply(batch, np.arange(1), self.rng, self.store).any())
+
+    def test_word_drop_and_insert(self):
+        batch = self.make_batch(["a b c", "single"])
+        changed = WordDrop().apply(batch, np.arange(2), self.rng, self.store)
+        np.testing.assert_array_equal(changed, [True, False])
+        self.assertEqual(len(self.store.words(int(batch.content[0]))), 2)
+        WordInsert({"x": ["y"]}).apply(batch, np.array([1]), self.rng, self.store)
+        self.assertEqual(len(self.store.words(int(batch.content[1]))), 2)
+
+    def test_word_insert_groups_by_content(self):
+        texts = ["a b", "c"] * 100
+        batch = self.make_batch(texts)
+        changed = WordInsert({"x": ["y", "z"]}).apply(batch, np.arange(200), self.rng, self.store)
+        self.assertTrue(changed.all())
+        for text, handle in zip(texts, batch.content.tolist()):
+            words = self.store.words(handle)
+            self.assertEqual(len(words), len(text.split()) + 1)
+            self.assertEqual([w for w in words if w not in ("x", "y", "z")], text.split())
+        self.assertEqual(len(self.store._memo), 0)
+
+    def test_stance_flip_always_changes(self):
+        batch = self.make_batch(["a"] * 100)
+        StanceFlip().apply(batch, np.arange(100), self.rng, self.store)
+        self.assertTrue((batch.stance_codes != 0).all())
+        self.assertTrue((batch.stance_codes < len(STANCES)).all())
+
+    def test_fitness_drift_is_clipped(self):
+        batch = self.make_batch(["a"] * 100)
+        FitnessDrift(scale=10.0).apply(batch, np.arange(100), self.rng, self.store)
+        self.assertTrue(((batch.initial_fitness >= 0.0) & (batch.initial_fitness <= 1.0)).all())
+
+    def test_pipeline_rates(self):
+        batch = self.make_batch(["a"] * 1000)
+        pipeline = MutationPipeline([StanceFlip(rate=0.2), FitnessDrift(rate=0.0)])
+        changed = pipeline.apply(batch, self.rng, self.store)
+        self.assertTrue(100 < changed.sum() < 300)
+        self.assertTrue((batch.initial_fitness == 0.5).all())
+
+    def test_from_config(self):
+        pipeline = MutationPipeline.from_config(
+            {"synonym": {"rate": 0.5}, "word_drop": {"rate": 0.1}, "stance_flip": {}}, lexicon=SYNONYMS
+        )
+        self.assertEqual([op.name for op in pipeline.operators], ["synonym", "word_drop", "stance_flip"])
+        self.assertIn("fitness_drift", OPERATORS)
+        with self.assertRaises(ValueError):
+            MutationPipeline.from_config({"unknown": {}})
+        with self.assertRaises(ValueError):
+            MutationPipeline.from_config({"synonym": {}})
+        with self.assertRaises(ValueError):
+            StanceFlip(rate=1.5)
+
+
+class TestPoolMutations(unittest.TestCase):
+
+    def make_memes(self):
+        return [Meme(f"meme_{i:03d}", "The world is a simulation", 1.0, 0.5, MemeStance.NEUTRAL)
+                for i in range(20)]
+
+    def test_meme_pool_pipeline(self):
+        pool = MemePool(seed=1, mutations=MutationPipeline([StanceFlip()]))
+        for meme in self.make_memes():
+            pool.add_meme(meme)
+        pool.evolve()
+        offspring = pool.memes[10:]
+        self.assertTrue(all(m.stance is not MemeStance.NEUTRAL for m in offspring))
+        self.assertTrue(all(m.version == 2 for m in offspring))
+        self.assertTrue(all("-mutated-" in str(m.id) for m in offspring))
+
+    def test_array_pool_pipeline(self):
+        pipeline = MutationPipeline([WordDrop(), FitnessDrift()])
+        pool = ArrayMemePool.from_memes(self.make_memes(), seed=1, mutations=pipeline)
+        pool.evolve()
+        self.assertTrue((pool.versions[10:] == 2).all())
+        self.assertTrue(all(len(m.content.split()) == 4 for m in pool.to_memes()[10:]))
+        clone = pickle.loads(pickle.dumps(pool))
+        self.assertEqual([op.name for op in clone.mutations.operators], ["word_drop", "fitness_drift"])
+
+    def test_default_matches_first_word_synonyms(self):
+        pool = ArrayMemePool.from_memes(self.make_memes(), seed=2)
+        pool.evolve()
+        firsts = {m.content.split()[0] for m in pool.to_memes()[10:]}
+        self.assertTrue(firsts <= set(SYNONYMS["the"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import pickle
+import unittest
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+from profiling import GenerationProfile, Profiler
+
+
+def make_memes(count=40):
+    return [Meme(f"meme_{i:03d}", "The world is a simulation", 0.5, 0.3 + i / 100, MemeStance.NEUTRAL)
+            for i in range(count)]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_meme_pool_phases_and_observer(self):
+        pool = MemePool(seed=0)
+        for meme in make_memes():
+            pool.add_meme(meme)
+        profiles = []
+        pool.profiler = Profiler()
+        pool.profiler.add_observer(profiles.append)
+        pool.evolve()
+        pool.evolve()
+        self.assertEqual(len(profiles), 2)
+        first = profiles[0]
+        self.assertEqual(list(first.phases), ["rank", "replicate", "mutate", "replace"])
+        self.assertEqual((first.generation, first.population, first.survivors, first.offspring), (1, 40, 20, 40))
+        self.assertTrue(all(t >= 0 for t in first.phases.values()))
+        self.assertEqual(first.allocations, {})
+        self.assertEqual(pool.profiler.generations, 2)
+        self.assertAlmostEqual(pool.profiler.phase_seconds["rank"], sum(p.phases["rank"] for p in profiles))
+
+    def test_array_pool_allocations(self):
+        pool = ArrayMemePool.from_memes(make_memes(), seed=0)
+        pool.profiler = Profiler(track_allocations=True)
+        pool.evolve()
+        profile = pool.profiler.last
+        self.assertEqual(list(profile.phases), ["rank", "replicate", "mutate"])
+        self.assertEqual(set(profile.allocations), set(profile.phases))
+        self.assertIsNone(pickle.loads(pickle.dumps(pool)).profiler)
+
+    def test_prometheus_exposition(self):
+        profiler = Profiler(namespace="test", keep=1)
+        profiler.record(GenerationProfile(1, 10, 5, 10, 3, phases={"rank": 0.5}))
+        profiler.record(GenerationProfile(2, 15, 7, 14, 2, phases={"rank": 0.25}))
+        text = profiler.prometheus()
+        self.assertIn("# TYPE test_generations_total counter\ntest_generations_total 2\n", text)
+        self.assertIn('test_phase_seconds_total{phase="rank"} 0.75\n', text)
+        self.assertIn('test_population{stage="after"} 21\n', text)
+        self.assertIn("test_mutated_total 5\n", text)
+        self.assertNotIn("allocated_bytes", text)
+        self.assertEqual(len(profiler.history), 1)
+
+    def test_prometheus_allocation_counters_are_monotonic(self):
+        profiler = Profiler(namespace="test")
+        profiler.record(GenerationProfile(1, 10, phases={"rank": 0.1}, allocations={"rank": 300}))
+        profiler.record(GenerationProfile(2, 10, phases={"rank": 0.1}, allocations={"rank": -500}))
+        text = profiler.prometheus()
+        self.assertEqual(profiler.phase_bytes["rank"], -200)
+        self.assertIn('# TYPE test_phase_allocated_bytes_total counter\n'
+                      'test_phase_allocated_bytes_total{phase="rank"} 300\n', text)
+        self.assertIn('# TYPE test_phase_freed_bytes_total counter\n'
+                      'test_phase_freed_bytes_total{phase="rank"} 500\n', text)
+
+    def test_remove_observer(self):
+        profiler = Profiler()
+        seen = []
+        profiler.add_observer(seen.append)
+        profiler.remove_observer(seen.append)
+        profiler.record(GenerationProfile(1, 1))
+        self.assertEqual(seen, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
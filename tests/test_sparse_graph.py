@@ -0,0 +1,84 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from meme_complex import Meme, MemeComplex
+from sparse_graph import SparseMemeGraph
+
+
+class TestSparseMemeGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = SparseMemeGraph()
+        self.graph.add_nodes_from([("a", {"content": "x", "fitness": 1.0}), ("b", {"content": "x", "fitness": 0.5})])
+        self.graph.add_node("c")
+
+    def test_nodes(self):
+        self.assertEqual(self.graph.nodes(), ["a", "b", "c"])
+        self.assertEqual(self.graph.nodes["b"], {"content": "x", "fitness": 0.5})
+        self.assertEqual(self.graph.nodes(data=True)[2], ("c", {}))
+        self.assertIn("a", self.graph.nodes)
+        self.assertEqual(len(self.graph.contents), 1)
+        np.testing.assert_array_equal(self.graph.fitness[:2], [1.0, 0.5])
+        with self.assertRaises(ValueError):
+            self.graph.add_node("d", color="red")
+
+    def test_edges_deduplicate_last_write(self):
+        self.graph.add_edge("b", "a", weight=2.0)
+        self.graph.add_edges_from([("a", "b"), ("b", "a", {"weight": 3.0})])
+        self.graph.add_weighted_edges_from([("a", "d", 0.25)])
+        self.assertEqual(self.graph.number_of_edges(), 3)
+        self.assertEqual(self.graph.edges(data="weight"), [("a", "b", 1.0), ("a", "d", 0.25), ("b", "a", 3.0)])
+        self.assertEqual(self.graph.number_of_nodes(), 4)
+
+    def test_adjacency_and_networkx_export(self):
+        self.graph.add_weighted_edges_from([("a", "b", 0.5), ("b", "c", 2.0)])
+        matrix = self.graph.adjacency()
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertEqual(matrix[0, 1], 0.5)
+        exported = self.graph.to_networkx()
+        self.assertIsInstance(exported, nx.DiGraph)
+        self.assertEqual(exported["b"]["c"]["weight"], 2.0)
+        self.assertEqual(exported.nodes["a"]["fitness"], 1.0)
+
+    def test_clear(self):
+        self.graph.add_edge("a", "b")
+        self.graph.clear()
+        self.assertEqual(len(self.graph), 0)
+        self.assertEqual(self.graph.edges(), [])
+
+
+class TestSparseBackend(unittest.TestCase):
+
+    def make_complex(self, name, backend, seed):
+        rng = np.random.default_rng(seed)
+        mc = MemeComplex(name, seed=seed, backend=backend)
+        for i, fitness in enumerate(np.round(rng.uniform(0.1, 2.0, 30), 1)):
+            mc.add_meme(Meme(id=f"{name}{i}", content=name, fitness=float(fitness)))
+        return mc
+
+    def test_merge_matches_networkx_backend(self):
+        results = {}
+        for backend in ("networkx", "sparse"):
+            merged = self.make_complex("a", backend, 1).merge(self.make_complex("b", backend, 2), similarity=0.2)
+            self.assertEqual(merged.backend, backend)
+            results[backend] = merged
+        self.assertEqual(set(results["sparse"].network.edges()), set(results["networkx"].network.edges()))
+        self.assertEqual(sorted(results["sparse"].to_networkx().nodes(data=True)),
+                         sorted(results["networkx"].network.nodes(data=True)))
+        self.assertAlmostEqual(results["sparse"].coevolution_strength(), results["networkx"].coevolution_strength())
+
+    def test_evolve_and_report(self):
+        mc = self.make_complex("c", "sparse", 3)
+        mc.evolve()
+        self.assertEqual(mc.network.number_of_nodes(), 30)
+        self.assertEqual(mc.report()["memes_count"], 30)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            MemeComplex("x", backend="igraph")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from stance_rollup import StanceRollup
+
+
+class TestStanceRollup(unittest.TestCase):
+
+    def setUp(self):
+        self.rollup = StanceRollup(3, bucket_seconds=60.0)
+        for timestamp, code in [(125.0, 0), (130.0, 1), (200.0, 1), (610.0, 2)]:
+            self.rollup.add(code, timestamp)
+
+    def test_windows_sum_buckets(self):
+        np.testing.assert_array_equal(self.rollup.counts(), [1, 2, 1])
+        np.testing.assert_array_equal(self.rollup.counts(120.0, 240.0), [1, 2, 0])
+        # A bucket counts when its start lies in the window
+        np.testing.assert_array_equal(self.rollup.counts(121.0, 600.0), [0, 1, 0])
+        np.testing.assert_array_equal(self.rollup.counts(10_000.0), [0, 0, 0])
+        # Only buckets with events are stored
+        self.assertEqual(len(self.rollup), 3)
+        starts, counts = self.rollup.series(120.0, 240.0)
+        np.testing.assert_array_equal(starts, [120.0, 180.0])
+        self.assertEqual(counts.shape, (2, 3))
+
+    def test_late_event_before_first_bucket(self):
+        self.rollup.add(2, 5.0, count=4)
+        self.assertEqual(self.rollup.first_bucket, 0)
+        np.testing.assert_array_equal(self.rollup.counts(0.0, 60.0), [0, 0, 4])
+        np.testing.assert_array_equal(self.rollup.counts(), [1, 2, 5])
+
+    def test_distant_events_stay_sparse(self):
+        rollup = StanceRollup(2, bucket_seconds=1.0)
+        rollup.add(0, 0.0)
+        rollup.add(1, 1e9)
+        rollup.add(1, -1e9)
+        self.assertEqual(len(rollup), 3)
+        np.testing.assert_array_equal(rollup.counts(), [1, 2])
+
+    def test_retention_evicts_old_buckets(self):
+        rollup = StanceRollup(2, bucket_seconds=10.0, retention_seconds=30.0)
+        for timestamp in (0.0, 15.0, 25.0, 35.0):
+            rollup.add(0, timestamp)
+        self.assertEqual(len(rollup), 3)
+        self.assertEqual(rollup.first_bucket, 1)
+        np.testing.assert_array_equal(rollup.counts(), [3, 0])
+        rollup.add(1, 5.0)
+        self.assertEqual(rollup.dropped, 1)
+
+    def test_clock(self):
+        rollup = StanceRollup(2, bucket_seconds=10.0, clock=lambda: 95.0)
+        rollup.add(1)
+        self.assertEqual(rollup.first_bucket, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+import numpy as np
+
+from memetics import MemeStance, StanceAnalyzer
+from stance_trends import StanceTrends
+
+
+class TestStanceTrends(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.events = [(f"m{rng.integers(20)}", int(rng.integers(3)), float(rng.uniform(0, 3600)))
+                       for _ in range(3000)]
+        self.trends = StanceTrends(3, bucket_seconds=60.0)
+        for meme_id, code, timestamp in self.events:
+            self.trends.add(meme_id, code, timestamp)
+
+    def brute_force(self, start, end, meme_id=None):
+        counts = np.zeros(3, dtype=np.int64)
+        for m, code, timestamp in self.events:
+            # Bucket-aligned: an event counts if its bucket starts in [start, end)
+            bucket_start = timestamp // 60.0 * 60.0
+            if start <= bucket_start < end and (meme_id is None or m == meme_id):
+                counts[code] += 1
+        return counts
+
+    def test_window_counts_match_brute_force(self):
+        np.testing.assert_array_equal(self.trends.counts(600.0, 1800.0), self.brute_force(600.0, 1800.0))
+        np.testing.assert_array_equal(self.trends.counts(610.0, 1800.0, "m3"), self.brute_force(610.0, 1800.0, "m3"))
+        np.testing.assert_array_equal(self.trends.sliding(900.0, "m4", now=3000.0),
+                                      self.brute_force(2160.0, 3060.0, "m4"))
+        np.testing.assert_array_equal(self.trends.counts(meme_id="unknown"), [0, 0, 0])
+        self.assertEqual(self.trends.counts().sum(), 3000)
+
+    def test_by_meme_and_series(self):
+        ids, counts = self.trends.by_meme(600.0, 1800.0)
+        self.assertEqual(len(ids), counts.shape[0])
+        for meme_id, row in zip(ids, counts):
+            np.testing.assert_array_equal(row, self.brute_force(600.0, 1800.0, meme_id))
+        starts, series = self.trends.series(600.0, 1800.0)
+        self.assertEqual(len(starts), 20)
+        np.testing.assert_array_equal(series[0], self.brute_force(600.0, 660.0))
+        np.testing.assert_array_equal(series.sum(axis=0), self.brute_force(600.0, 1800.0))
+
+    def test_tumbling(self):
+        starts, counts = self.trends.tumbling(900.0)
+        np.testing.assert_array_equal(starts, [0.0, 900.0, 1800.0, 2700.0])
+        for window_start, row in zip(starts, counts):
+            np.testing.assert_array_equal(row, self.brute_force(window_start, window_start + 900.0))
+        _, one = self.trends.tumbling(1800.0, meme_id="m2")
+        np.testing.assert_array_equal(one[1], self.brute_force(1800.0, 3600.0, "m2"))
+        with self.assertRaises(ValueError):
+            self.trends.tumbling(90.0)
+
+    def test_retention_evicts_old_buckets(self):
+        trends = StanceTrends(2, bucket_seconds=10.0, retention_seconds=30.0)
+        for timestamp in (0.0, 15.0, 25.0, 35.0):
+            trends.add("m", 0, timestamp)
+        self.assertEqual(len(trends), 3)
+        np.testing.assert_array_equal(trends.counts(meme_id="m"), [3, 0])
+        trends.add("m", 1, 5.0)
+        self.assertEqual(trends.dropped, 1)
+
+    def test_retention_releases_memes(self):
+        trends = StanceTrends(2, bucket_seconds=10.0, retention_seconds=20.0)
+        trends.add("old", 0, 0.0)
+        trends.add("kept", 0, 5.0)
+        trends.add("kept", 1, 15.0)
+        self.assertEqual(trends.memes, 2)
+        trends.add("new", 1, 25.0)
+        self.assertEqual(trends.memes, 2)
+        np.testing.assert_array_equal(trends.counts(meme_id="old"), [0, 0])
+        # The released row is reused without leaking the old meme's counts
+        self.assertEqual(len(trends._ids), 2)
+        ids, counts = trends.by_meme()
+        self.assertEqual(dict(zip(ids, counts.tolist())), {"kept": [0, 1], "new": [0, 1]})
+
+    def test_top_shifts(self):
+        trends = StanceTrends(2, bucket_seconds=10.0)
+        for meme_id, before, after in [("steady", 0, 0), ("flipped", 0, 1), ("mixed", 0, None)]:
+            trends.add(meme_id, before, 5.0)
+            trends.add(meme_id, after if after is not None else 0, 15.0)
+            if after is None:
+                trends.add(meme_id, 1, 15.0)
+        trends.add("new", 1, 15.0)
+        self.assertEqual(trends.top_shifts(2, 10.0, now=15.0), [("flipped", 1.0), ("mixed", 0.5)])
+        self.assertEqual(trends.top_shifts(5, 10.0, now=15.0, code=0)[-1], ("flipped", -1.0))
+
+
+class TestStanceAnalyzerTrends(unittest.TestCase):
+
+    def test_add_stance_feeds_trends(self):
+        analyzer = StanceAnalyzer(rollup=StanceTrends(len(MemeStance), bucket_seconds=60.0, clock=lambda: 7200.0))
+        analyzer.add_stance("a", MemeStance.IRONIC, timestamp=100.0)
+        analyzer.add_stance("a", MemeStance.PARODIC)
+        analyzer.add_stance("b", MemeStance.PARODIC, timestamp=7100.0)
+        self.assertEqual(analyzer.get_recent_stance_distribution(3600.0, "a"), {"parodic": 1})
+        self.assertEqual(analyzer.get_recent_stance_distribution(3600.0, now=7300.0), {"parodic": 2})
+        self.assertEqual(analyzer.get_top_stance_shifts(1, 7100.0, now=7300.0), [("a", 1.0)])
+        # The same store answers the windowed overall trend
+        self.assertEqual(analyzer.get_overall_stance_trend(0.0, 3600.0), {"ironic": 1})
+        with self.assertRaises(ValueError):
+            StanceAnalyzer().get_recent_stance_distribution(60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
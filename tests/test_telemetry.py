@@ -0,0 +1,87 @@
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+from memetics import Meme, MemePool, MemeStance
+from array_pool import ArrayMemePool
+from telemetry import GenerationEvent, GenerationTelemetry
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def make_memes(count=20):
+    return [Meme(f"meme_{i:03d}", "The world is a simulation", 0.5, 0.5, MemeStance.NEUTRAL)
+            for i in range(count)]
+
+
+class TestGenerationTelemetry(unittest.TestCase):
+
+    def test_import_does_not_configure_logging(self):
+        code = "import logging, memetics, array_pool; print(len(logging.getLogger().handlers))"
+        env = dict(os.environ, PYTHONPATH=SRC)
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "0")
+
+    def test_one_event_per_generation(self):
+        pool = MemePool(seed=0)
+        for meme in make_memes():
+            pool.add_meme(meme)
+        with self.assertLogs("memetics", level="INFO") as logs:
+            pool.evolve()
+        self.assertEqual(len(logs.records), 1)
+        event = logs.records[0].telemetry
+        self.assertEqual(event["generation"], 1)
+        self.assertEqual(event["population"], 20)
+        self.assertEqual(event["survivors"], 10)
+        self.assertEqual(event["offspring"], 20)
+        self.assertEqual(event["mutated"], sum(event["mutations"].values()))
+        self.assertEqual(pool.telemetry.last_event.generation, 1)
+
+    def test_interval_limits_info_lines(self):
+        pool = ArrayMemePool.from_memes(make_memes(), seed=0)
+        pool.telemetry.interval = 3
+        with self.assertLogs("array_pool", level="INFO") as logs:
+            for _ in range(6):
+                pool.evolve(1.0)
+        self.assertEqual([r.telemetry["generation"] for r in logs.records], [3, 6])
+        self.assertEqual(pool.telemetry.last_event.generation, 6)
+
+    def test_debug_detail_is_sampled(self):
+        pool = MemePool(seed=0)
+        pool.telemetry.debug_samples = 2
+        for meme in make_memes():
+            meme.mutation_rate = 1.0
+            pool.add_meme(meme)
+        with self.assertLogs("memetics", level="DEBUG") as logs:
+            pool.evolve()
+        mutated = [r for r in logs.records if r.getMessage().startswith("Meme ")]
+        self.assertEqual(len(mutated), 2)
+
+    def test_debug_sample_is_uniform(self):
+        logger = logging.getLogger("telemetry-sample-test")
+        logger.setLevel(logging.DEBUG)
+        telemetry = GenerationTelemetry(logger, debug_samples=2, debug_seed=0)
+        self.assertEqual(telemetry.debug_sample(2), [0, 1])
+        seen = [0] * 10
+        for _ in range(2000):
+            sample = telemetry.debug_sample(10)
+            self.assertEqual(len(sample), 2)
+            self.assertEqual(sample, sorted(set(sample)))
+            for position in sample:
+                seen[position] += 1
+        # Each position is picked 2 / 10 of the time, late ones included
+        self.assertTrue(all(300 < count < 500 for count in seen))
+
+    def test_debug_sample_when_disabled(self):
+        logger = logging.getLogger("telemetry-test")
+        logger.setLevel(logging.INFO)
+        telemetry = GenerationTelemetry(logger, debug_samples=5)
+        self.assertEqual(telemetry.debug_sample(10), [])
+        telemetry.emit(GenerationEvent(1, 10, 5, 10, 0))
+        self.assertEqual(telemetry.last_event.as_dict()["mutations"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()